@@ -0,0 +1,350 @@
+import os
+import time
+import psutil
+import numpy as np
+
+from process_sampler import ProcessSampler
+from telemetry import SYSFS_ROOT
+
+# --- AYARLAR ---
+HOLD_TICKS = 3            # bir karar uygulanmadan önce kaç tick sabit kalmalı
+MIN_INTERVAL_S = 2.0      # aynı hedefe iki değişiklik arasındaki en kısa süre
+MAX_ACTIONS_PER_TICK = 16 # tick başına en fazla sysfs / affinity yazımı
+HOT_PROCESSES = 8         # per-CPU modunda yerleştirilecek en sıcak süreç sayısı
+HOT_THRESHOLD = 20.0      # süreç 'sıcak' sayılması için CPU yüzdesi
+SCAN_BUDGET_MS = 2.0      # per-CPU modunda sıcak süreç aramasının tick başına bütçesi (ProcessSampler)
+KTHREADD_PID = 2          # Linux çekirdek iş parçacıklarının üst süreci
+
+
+def parse_cpu_list(text):
+    """'0-3,8,10-11' -> {0, 1, 2, 3, 8, 10, 11} (sysfs cpulist biçimi)."""
+    cpus = set()
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            lo, hi = part.split('-')
+            cpus.update(range(int(lo), int(hi) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def read_text(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def detect_core_sets(sysfs_root=SYSFS_ROOT):
+    """
+    P/E mantıksal CPU kümelerini bulur.
+
+    Intel hibrit: /sys/devices/cpu_core/cpus ve /sys/devices/cpu_atom/cpus.
+    Diğerleri: cpuinfo_max_freq en yüksek olan CPU'lar P, geri kalanı E.
+    Ayrım yapılamazsa (homojen CPU) tüm CPU'lar her iki kümede yer alır.
+    """
+    p_list = read_text(os.path.join(sysfs_root, 'devices/cpu_core/cpus'))
+    e_list = read_text(os.path.join(sysfs_root, 'devices/cpu_atom/cpus'))
+    if p_list and e_list:
+        return parse_cpu_list(p_list), parse_cpu_list(e_list)
+
+    n_cpus = psutil.cpu_count(logical=True)
+    max_freq = {}
+    for cpu in range(n_cpus):
+        value = read_text(os.path.join(sysfs_root, f'devices/system/cpu/cpu{cpu}/cpufreq/cpuinfo_max_freq'))
+        if value is not None:
+            max_freq[cpu] = int(value)
+    if max_freq and len(set(max_freq.values())) > 1:
+        top = max(max_freq.values())
+        p_cpus = {cpu for cpu, f in max_freq.items() if f == top}
+        return p_cpus, set(max_freq) - p_cpus
+    all_cpus = set(range(n_cpus))
+    return all_cpus, all_cpus
+
+
+class Hysteresis:
+    """
+    Hedef başına kararları süzer: bir değer HOLD_TICKS tick boyunca aynı kalmadıkça
+    ve son değişiklikten bu yana MIN_INTERVAL_S geçmedikçe uygulanmaz.
+    """
+
+    def __init__(self, hold_ticks=HOLD_TICKS, min_interval_s=MIN_INTERVAL_S):
+        self.hold_ticks = hold_ticks
+        self.min_interval_s = min_interval_s
+        self.candidate = {}  # key -> (değer, ardışık tick sayısı)
+        self.applied = {}    # key -> (değer, uygulama zamanı)
+
+    def propose(self, key, value, now):
+        """Uygulanması gerekiyorsa True döndürür."""
+        prev, count = self.candidate.get(key, (None, 0))
+        count = count + 1 if prev == value else 1
+        self.candidate[key] = (value, count)
+
+        applied = self.applied.get(key)
+        if applied is not None and applied[0] == value:
+            return False
+        if count < self.hold_ticks:
+            return False
+        if applied is not None and now - applied[1] < self.min_interval_s:
+            return False
+        return True
+
+    def commit(self, key, value, now):
+        self.applied[key] = (value, now)
+
+    def forget(self, keys):
+        for key in keys:
+            self.candidate.pop(key, None)
+            self.applied.pop(key, None)
+
+
+class SysfsBackend:
+    """
+    cpufreq denetimleri: scaling_governor ve scaling_max_freq yazımı.
+
+    sysfs_root sahte bir dizin ağacı olabilir (root gerekmeden test);
+    dry_run=True iken hiçbir şey yazılmaz, yalnızca eylemler kaydedilir.
+    """
+
+    def __init__(self, sysfs_root=SYSFS_ROOT, dry_run=False):
+        self.sysfs_root = sysfs_root
+        self.dry_run = dry_run
+        self.actions = []
+        self.original = {}  # (cpu, name) -> ilk yazımdan önceki değer (restore için)
+
+    def cpufreq_path(self, cpu, name):
+        return os.path.join(self.sysfs_root, f'devices/system/cpu/cpu{cpu}/cpufreq/{name}')
+
+    def freq_range(self, cpu):
+        lo = read_text(self.cpufreq_path(cpu, 'cpuinfo_min_freq'))
+        hi = read_text(self.cpufreq_path(cpu, 'cpuinfo_max_freq'))
+        if lo is None or hi is None:
+            return None
+        return int(lo), int(hi)
+
+    def save(self, cpu, name):
+        """Dosyanın ilk değerini bir kez saklar; sonraki çağrılar dokunmaz."""
+        if (cpu, name) not in self.original:
+            self.original[(cpu, name)] = read_text(self.cpufreq_path(cpu, name))
+
+    def write(self, cpu, name, value):
+        self.save(cpu, name)
+        self.actions.append(('cpufreq', cpu, name, value))
+        if self.dry_run:
+            return True
+        try:
+            with open(self.cpufreq_path(cpu, name), 'w') as f:
+                f.write(f"{value}\n")
+            return True
+        except OSError:
+            return False
+
+    def restore(self):
+        """Saklanan değerleri geri yazar; governor önce (değişimi scaling_max_freq'i sıfırlayabilir)."""
+        restored = 0
+        for (cpu, name), value in sorted(self.original.items(), key=lambda item: item[0][1] != 'scaling_governor'):
+            if value is not None and self.write(cpu, name, value):
+                restored += 1
+        self.original.clear()
+        return restored
+
+
+class AffinityBackend:
+    """os.sched_setaffinity sarmalayıcısı; dry_run=True iken yalnızca kaydeder."""
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.actions = []
+        self.original = {}  # pid -> ilk sabitlemeden önceki CPU maskesi
+
+    def set_affinity(self, pid, cpus):
+        if pid not in self.original:
+            try:
+                self.original[pid] = os.sched_getaffinity(pid)
+            except OSError:
+                return False
+        self.actions.append(('affinity', pid, sorted(cpus)))
+        if self.dry_run:
+            return True
+        try:
+            os.sched_setaffinity(pid, cpus)
+            return True
+        except (OSError, ProcessLookupError):
+            return False
+
+    def restore(self):
+        """Sabitlenen süreçlerin özgün maskelerini geri yükler; sonlanmış süreçler atlanır."""
+        restored = 0
+        for pid, cpus in self.original.items():
+            self.actions.append(('affinity', pid, sorted(cpus)))
+            if self.dry_run:
+                restored += 1
+                continue
+            try:
+                os.sched_setaffinity(pid, cpus)
+                restored += 1
+            except (OSError, ProcessLookupError):
+                pass
+        self.original.clear()
+        return restored
+
+
+class Actuator:
+    """
+    Model kararlarını gerçek denetimlere dönüştürür.
+
+    - freq_idx (0/1/2) -> CPU'nun cpuinfo aralığında düşük / orta / yüksek
+      scaling_max_freq değeri
+    - is_p -> sıcak süreçlerin P ya da E CPU kümesine sabitlenmesi
+
+    Her hedef Hysteresis'ten geçer ve tick başına yazım sayısı sınırlıdır.
+    Karardan uygulamaya gecikme (ms) tick başına ölçülür. Dokunulan her
+    cpufreq dosyasının ve süreç maskesinin ilk değeri saklanır; restore()
+    çıkışta hepsini geri yükler.
+    """
+
+    def __init__(self, p_cpus=None, e_cpus=None, sysfs_root=SYSFS_ROOT, dry_run=False,
+                 governor=None, hysteresis=None, max_actions_per_tick=MAX_ACTIONS_PER_TICK):
+        detected_p, detected_e = detect_core_sets(sysfs_root)
+        self.p_cpus = set(p_cpus) if p_cpus else detected_p
+        self.e_cpus = set(e_cpus) if e_cpus else detected_e
+        self.sysfs = SysfsBackend(sysfs_root, dry_run)
+        self.affinity = AffinityBackend(dry_run)
+        self.hysteresis = hysteresis or Hysteresis()
+        self.max_actions_per_tick = max_actions_per_tick
+
+        n_cpus = psutil.cpu_count(logical=True)
+        self.freq_levels = {}
+        for cpu in range(n_cpus):
+            rng = self.sysfs.freq_range(cpu)
+            if rng is not None:
+                self.freq_levels[cpu] = np.linspace(rng[0], rng[1], 3).astype(int)
+                self.sysfs.save(cpu, 'scaling_governor')
+                self.sysfs.save(cpu, 'scaling_max_freq')
+                if governor:
+                    self.sysfs.write(cpu, 'scaling_governor', governor)
+
+        self.applied = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.restored = 0
+        self.skipped = 0
+        self.latency_ms = []
+        self.sampler = None  # per-CPU modunda ilk ihtiyaçta oluşturulur (--tasks modunda paket kayıtları kullanılır)
+        self.eligible_cache = {}  # pid -> (create_time, sabitlenebilir mi)
+
+    def frequency_actions(self, freq_idx, now):
+        for cpu, idx in enumerate(freq_idx):
+            levels = self.freq_levels.get(cpu)
+            if levels is None:
+                continue
+            target = int(levels[int(idx)])
+            if self.hysteresis.propose(('freq', cpu), target, now):
+                yield ('freq', cpu), target, lambda cpu=cpu, target=target: self.sysfs.write(cpu, 'scaling_max_freq', target)
+
+    def eligible(self, pid):
+        """
+        Sabitlenebilir süreç mi: daemon'un kendisi, PID 1, kthreadd ve çekirdek
+        iş parçacıkları (üst süreci kthreadd) hiçbir zaman taşınmaz. Sonuç
+        create_time ile önbelleklenir (PID yeniden kullanılırsa yeniden bakılır).
+        """
+        if pid == os.getpid() or pid <= KTHREADD_PID:
+            return False
+        try:
+            proc = psutil.Process(pid)
+            create_time = proc.create_time()
+            cached = self.eligible_cache.get(pid)
+            if cached is not None and cached[0] == create_time:
+                return cached[1]
+            ok = proc.ppid() not in (0, KTHREADD_PID)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+        self.eligible_cache[pid] = (create_time, ok)
+        return ok
+
+    def affinity_actions(self, placements, now):
+        """placements: {pid: is_p}"""
+        for pid, is_p in placements.items():
+            if not self.eligible(pid):
+                self.skipped += 1
+                continue
+            cpus = self.p_cpus if is_p else self.e_cpus
+            key = ('pid', pid)
+            value = 'P' if is_p else 'E'
+            if self.hysteresis.propose(key, value, now):
+                yield key, value, lambda pid=pid, cpus=cpus: self.affinity.set_affinity(pid, cpus)
+
+    def hot_process_placements(self, is_p):
+        """
+        Per-CPU modu: en sıcak süreçleri, en son çalıştıkları CPU'nun sınıfına göre
+        yerleştirir. Süreçler her tick process_iter ile taranmaz; bütçeli
+        ProcessSampler (--tasks ile aynı) tick başına en fazla SCAN_BUDGET_MS harcar.
+        """
+        if self.sampler is None:
+            self.sampler = ProcessSampler(HOT_PROCESSES, SCAN_BUDGET_MS)
+        return {
+            r['pid']: bool(is_p[r['cpu']])
+            for r in self.sampler.sample()
+            if r['load'] >= HOT_THRESHOLD and r['cpu'] < len(is_p)
+        }
+
+    def apply(self, is_p, freq_idx, decided_at, placements=None):
+        """
+        Bir tick'in kararlarını uygular. decided_at: kararın üretildiği time.time().
+        placements ({pid: is_p}) verilmezse sıcak süreçler CPU sınıfına göre yerleştirilir.
+        """
+        now = time.monotonic()
+        if placements is None:
+            placements = self.hot_process_placements(is_p)
+
+        actions = list(self.frequency_actions(freq_idx, now)) + list(self.affinity_actions(placements, now))
+        for key, value, action in actions[:self.max_actions_per_tick]:
+            if action():
+                self.hysteresis.commit(key, value, now)
+                self.applied += 1
+            else:
+                self.failed += 1
+        self.rate_limited += max(0, len(actions) - self.max_actions_per_tick)
+
+        if actions:
+            self.latency_ms.append((time.time() - decided_at) * 1000)
+            del self.latency_ms[:-1024]
+        return len(actions)
+
+    def on_packet(self, packet):
+        """SchedulerPipeline abonesi olarak kullanım."""
+        cores = packet['cores']
+        is_p = np.array([c['is_p'] for c in cores])
+        freq_idx = np.array([c['freq_idx'] for c in cores])
+        placements = None
+        if 'tasks' in packet:
+            # Süreç başına mod: modelin süreç kararları doğrudan kullanılır
+            placements = {t['pid']: t['is_p'] for t in packet['tasks'] if t['load'] >= HOT_THRESHOLD}
+        self.apply(is_p, freq_idx, packet['timestamp'], placements)
+
+    def restore(self):
+        """Governor, scaling_max_freq ve süreç maskelerini başlangıç değerlerine döndürür (tekrar çağrılabilir)."""
+        self.restored += self.sysfs.restore() + self.affinity.restore()
+        self.hysteresis.forget(list(self.hysteresis.applied))
+        return self.restored
+
+    def stats(self):
+        latency = np.array(self.latency_ms) if self.latency_ms else np.zeros(1)
+        return {
+            'applied': self.applied,
+            'failed': self.failed,
+            'rate_limited': self.rate_limited,
+            'restored': self.restored,
+            'skipped_pids': self.skipped,
+            'dry_run': self.sysfs.dry_run,
+            'p_cpus': sorted(self.p_cpus),
+            'e_cpus': sorted(self.e_cpus),
+            'decision_to_applied_ms': {
+                'mean': float(latency.mean()),
+                'p99': float(np.percentile(latency, 99)),
+                'max': float(latency.max()),
+            },
+        }
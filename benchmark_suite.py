@@ -0,0 +1,316 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import psutil
+
+from scheduler_core import SCALER_PATH, SchedulerEngine, estimate_power, load_policy_model
+from telemetry import ProcStatSampler, Telemetry
+
+# --- AYARLAR ---
+CORE_COUNTS = [4, 8, 16, 32, 64, 128, 256]
+BATCH_SIZES = [2 ** i for i in range(13)]  # 1 ... 4096
+REPEATS = 7
+MIN_REPEAT_S = 0.05       # her tekrar en az bu kadar sürecek şekilde döngü sayısı ayarlanır
+REGRESSION_THRESHOLD = 0.15
+N_PACKETS = 16            # GUI için dönüşümlü paketler (diff'li güncelleme boşa dönmesin)
+STARTUP_RUNS = 5          # main_dashboard.py --startup-report tekrarı
+OUTPUT_PATH = 'bench_results.json'
+
+
+# --- ÖLÇÜM ---
+def measure(fn, repeats=REPEATS, min_time=MIN_REPEAT_S):
+    """
+    fn() çağrısı başına süre (µs): median / p90 / min.
+
+    Döngü sayısı, tek tekrar min_time'ı geçecek şekilde ikiye katlanarak
+    bulunur; böylece mikro saniyelik aşamalar da saat çözünürlüğünün
+    üzerinde ölçülür.
+    """
+    fn()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+    samples = [elapsed / loops]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    samples = np.array(samples) * 1e6
+    return {
+        'median_us': float(np.median(samples)),
+        'p90_us': float(np.percentile(samples, 90)),
+        'min_us': float(samples.min()),
+        'loops': loops,
+        'repeats': repeats,
+    }
+
+
+class Cycle:
+    """Önceden üretilmiş girdiler arasında döner (her çağrıda farklı değer)."""
+
+    def __init__(self, items):
+        self.items = items
+        self.i = 0
+
+    def next(self):
+        item = self.items[self.i]
+        self.i = (self.i + 1) % len(self.items)
+        return item
+
+
+def fake_proc_stat(path, n_cpus, rng):
+    """n_cpus satırlı /proc/stat benzeri dosya (ProcStatSampler'ı simüle çekirdek sayısında ölçmek için)."""
+    lines = ['cpu  ' + ' '.join(['1000'] * 10)]
+    for i in range(n_cpus):
+        fields = rng.integers(1000, 10 ** 8, size=10)
+        lines.append(f"cpu{i} " + ' '.join(map(str, fields)))
+    lines.append('intr ' + ' '.join(['0'] * 512))
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def load_scaler():
+    try:
+        import joblib
+        return joblib.load(SCALER_PATH)
+    except Exception:
+        return None
+
+
+# --- AŞAMALAR ---
+def bench_pipeline(model, scaler, core_counts, results):
+    """
+    DataWorker.run hattının aşamaları, simüle çekirdek sayısı başına:
+    /proc/stat okuma + fark, özellik, scaler, çıkarım, güç, tam engine.step.
+    """
+    rng = np.random.default_rng(0)
+    engine = SchedulerEngine(model, None, telemetry=Telemetry())
+    ram = psutil.virtual_memory()
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in core_counts:
+            path = os.path.join(tmp, f'stat{n}')
+            fake_proc_stat(path, n, rng)
+            procstat = ProcStatSampler(path)
+            procstat.read_size = os.path.getsize(path)
+            prev, cur = procstat.read(), procstat.read()
+            loads = Cycle([rng.uniform(0, 100, n) for _ in range(N_PACKETS)])
+            features = engine.telemetry.features(loads.next(), ram.percent)
+            is_p, freq_idx = engine.predict_exact(features)
+
+            stages = {
+                'sample.procstat_read': procstat.read,
+                'sample.cpu_percents': lambda: ProcStatSampler.percent(prev, cur),
+                'features': lambda: engine.telemetry.features(loads.next(), ram.percent),
+                'predict': lambda: engine.predict_exact(features),
+                'power': lambda: estimate_power(features[:, 0], is_p, freq_idx),
+                'step': lambda: engine.step(loads.next(), ram),
+            }
+            if scaler is not None:
+                stages['scaler.transform'] = lambda: scaler.transform(features)
+            for name, fn in stages.items():
+                results[f'pipeline/{name}/n={n}'] = measure(fn)
+            procstat.close()
+            print(f"  pipeline n={n:<4d} step {results[f'pipeline/step/n={n}']['median_us']:9.1f} µs")
+
+
+def bench_inference(model, batch_sizes, results, keras=False):
+    """Model ileri geçişi, batch boyutu başına (NumPy motoru; istenirse Keras)."""
+    rng = np.random.default_rng(1)
+    models = {'numpy': (model, None)}
+    if keras:
+        import tensorflow as tf
+        import joblib
+        from scheduler_core import MODEL_PATH
+        models['keras'] = (tf.keras.models.load_model(MODEL_PATH), joblib.load(SCALER_PATH))
+    for name, (m, scaler) in models.items():
+        for b in batch_sizes:
+            # generating-cpu-data.py ile aynı aralıklar (cache_miss %0-100): model eğitim dağılımında çalışır
+            X = np.column_stack([
+                rng.uniform(0, 100, b), rng.uniform(0.2, 3.0, b), rng.uniform(0, 100, b), rng.uniform(30, 95, b),
+            ])
+            if scaler is not None:
+                X = scaler.transform(X)
+            r = measure(lambda: m.predict_on_batch(X))
+            r['per_row_us'] = r['median_us'] / b
+            results[f'inference/{name}/batch={b}'] = r
+        print(f"  inference {name:6s} batch=1 {results[f'inference/{name}/batch=1']['median_us']:8.1f} µs, "
+            f"batch={batch_sizes[-1]} {results[f'inference/{name}/batch={batch_sizes[-1]}']['per_row_us']:.3f} µs/row")
+
+
+def bench_gui(model, core_counts, results):
+    """update_dashboard / update_graphs maliyeti, offscreen Qt platformunda."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication, QMainWindow
+    import main_dashboard
+
+    class BenchDashboard(main_dashboard.UltimateDashboard):
+        """Model yüklemeyen ve worker başlatmayan pano; yalnızca UI yolları."""
+
+        def __init__(self, n_cpus):
+            QMainWindow.__init__(self)
+            self.attach = None
+            self.record_trace = None
+            self.history_len = main_dashboard.HISTORY_LEN
+            self.cpu_count = n_cpus
+            self.awaiting_decision = False
+            self.init_ui()
+            self.build_graphs()
+
+        def closeEvent(self, event):
+            event.accept()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    rng = np.random.default_rng(2)
+    engine = SchedulerEngine(model, None, telemetry=Telemetry())
+    ram = psutil.virtual_memory()
+    for n in core_counts:
+        window = BenchDashboard(n)
+        window.show()
+        app.processEvents()  # ilk tam çizim: blit arka planları yakalanır
+        packets = Cycle([engine.step(rng.uniform(0, 100, n), ram) for _ in range(N_PACKETS)])
+
+        def frame():
+            window.update_dashboard(packets.next())
+            app.processEvents()
+
+        results[f'gui/update_dashboard/n={n}'] = measure(lambda: window.update_dashboard(packets.next()))
+        results[f'gui/update_graphs/n={n}'] = measure(lambda: window.update_graphs(*rng.uniform(10, 100, 2)))
+        results[f'gui/frame/n={n}'] = measure(frame)
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+        print(f"  gui      n={n:<4d} frame {results[f'gui/frame/n={n}']['median_us']:9.1f} µs")
+
+
+def bench_startup(results, runs=STARTUP_RUNS):
+    """
+    Pano açılışı: ilk kare, model hazır ve ilk AI kararı (ms), her biri ayrı
+    bir süreçte ölçülür.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    samples = {}
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, 'main_dashboard.py', '--startup-report'],
+                             capture_output=True, text=True, env=env, timeout=120).stdout
+        report = json.loads(out.strip().splitlines()[-1])
+        for key, ms in report.items():
+            samples.setdefault(key[:-len('_ms')], []).append(ms * 1000)
+    for name, values in samples.items():
+        values = np.array(values)
+        results[f'startup/{name}'] = {
+            'median_us': float(np.median(values)),
+            'p90_us': float(np.percentile(values, 90)),
+            'min_us': float(values.min()),
+            'loops': 1,
+            'repeats': runs,
+        }
+    print(f"  startup  first frame {results['startup/first_frame']['median_us'] / 1000:6.0f} ms, "
+          f"first decision {results['startup/first_decision']['median_us'] / 1000:6.0f} ms")
+
+
+# --- SONUÇ / KARŞILAŞTIRMA ---
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Ortak ölçümlerde median oranı; eşik üstü yavaşlamaların listesini döndürür."""
+    regressions = []
+    print(f"{'benchmark':44s} {'base µs':>10s} {'now µs':>10s} {'ratio':>7s}")
+    for name, cur in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        ratio = cur['median_us'] / base['median_us'] if base['median_us'] > 0 else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        print(f"{name:44s} {base['median_us']:10.1f} {cur['median_us']:10.1f} {ratio:7.2f}{flag}")
+    return regressions
+
+
+def parse_sizes(text):
+    return [int(x) for x in text.split(',') if x]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the sampling, inference and GUI update paths.")
+    parser.add_argument('--suites', default='pipeline,inference,gui,startup',
+                        help="comma-separated: pipeline, inference, gui, startup")
+    parser.add_argument('--cores', type=parse_sizes, default=CORE_COUNTS, help="simulated core counts, e.g. 4,64,256")
+    parser.add_argument('--batches', type=parse_sizes, default=BATCH_SIZES, help="inference batch sizes")
+    parser.add_argument('--keras', action='store_true', help="also benchmark the Keras model (needs TensorFlow)")
+    parser.add_argument('--out', default=OUTPUT_PATH, help="JSON results file")
+    parser.add_argument('--compare', default=None, metavar='BASELINE.json',
+                        help="compare medians with an earlier run; exit 1 on regressions")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    suites = set(args.suites.split(','))
+    model, scaler = load_policy_model()
+    if scaler is None:
+        # NumPy motoru scaler'ı ağırlıklara katlar; transform maliyeti yine ayrıca ölçülür
+        scaler = load_scaler()
+    results = {}
+    if 'pipeline' in suites:
+        print("Pipeline stages:")
+        bench_pipeline(model, scaler, args.cores, results)
+    if 'inference' in suites:
+        print("Inference:")
+        bench_inference(model, args.batches, results, keras=args.keras)
+    if 'gui' in suites:
+        print("GUI (offscreen):")
+        try:
+            bench_gui(model, args.cores, results)
+        except ImportError as e:
+            print(f"  skipped: {e}")
+    if 'startup' in suites:
+        print("Dashboard startup (offscreen):")
+        bench_startup(results)
+
+    report = {'meta': metadata(), 'results': results}
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f"Wrote {len(results)} results to '{args.out}'.")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
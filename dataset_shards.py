@@ -0,0 +1,75 @@
+import glob
+import json
+import os
+import numpy as np
+
+from temporal import TEMPORAL_FEATURES
+
+# --- AYARLAR ---
+COLUMNS = ['cpu_load', 'ipc', 'cache_miss', 'temp', 'target_core', 'target_freq']
+FEATURES = COLUMNS[:4]
+TARGETS = COLUMNS[4:]
+# Dizi (temporal) veri seti: anlık özellikler + pencere özellikleri + hedefler
+TEMPORAL_COLUMNS = FEATURES + TEMPORAL_FEATURES + TARGETS
+META_FILE = 'meta.json'
+
+
+class ShardWriter:
+    """
+    Veri setini sabit boyutlu sütunsal parçalar (shard) halinde diske yazar.
+
+    'npy'    : her parça float32 (rows, len(columns)) dizi; np.load(mmap_mode='r') ile okunur
+    'parquet': her parça bir Parquet dosyası (pyarrow gerekir)
+    """
+
+    def __init__(self, out_dir, fmt='npy', columns=COLUMNS):
+        if fmt not in ('npy', 'parquet'):
+            raise ValueError(f"Unknown shard format: {fmt}")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.columns = list(columns)
+        self.shards = []
+        self.rows = 0
+
+    def write(self, block):
+        block = np.asarray(block, dtype=np.float32)
+        path = os.path.join(self.out_dir, f"shard-{len(self.shards):05d}.{self.fmt}")
+        if self.fmt == 'npy':
+            np.save(path, block)
+        else:
+            import pandas as pd
+            pd.DataFrame(block, columns=self.columns).to_parquet(path, index=False)
+        self.shards.append(os.path.basename(path))
+        self.rows += len(block)
+
+    def close(self, **extra):
+        meta = {'format': self.fmt, 'columns': self.columns, 'rows': self.rows, 'shards': self.shards}
+        meta.update(extra)
+        with open(os.path.join(self.out_dir, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+
+def read_meta(shard_dir):
+    with open(os.path.join(shard_dir, META_FILE)) as f:
+        return json.load(f)
+
+
+def shard_paths(shard_dir):
+    if os.path.exists(os.path.join(shard_dir, META_FILE)):
+        return [os.path.join(shard_dir, name) for name in read_meta(shard_dir)['shards']]
+    return sorted(glob.glob(os.path.join(shard_dir, 'shard-*.npy')) +
+                  glob.glob(os.path.join(shard_dir, 'shard-*.parquet')))
+
+
+def load_shard(path):
+    """Tek bir parçayı (rows, n_columns) float32 dizi olarak döndürür; npy parçaları bellek eşlemlidir."""
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    import pandas as pd
+    return pd.read_parquet(path).to_numpy(dtype=np.float32)
+
+
+def iter_shards(shard_dir):
+    for path in shard_paths(shard_dir):
+        yield load_shard(path)
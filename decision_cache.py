@@ -0,0 +1,169 @@
+import argparse
+from collections import OrderedDict
+import numpy as np
+
+from numpy_model import WEIGHTS_PATH, load_numpy_model
+
+# --- AYARLAR ---
+TABLE_PATH = 'advanced_decision_table.npz'
+DATA_PATH = 'advanced_os_data.csv'
+FEATURES = ['cpu_load', 'ipc', 'cache_miss', 'temp']
+
+# Özellik aralıkları (generating-cpu-data.py ile aynı); dışındaki değerler kırpılır
+FEATURE_LO = np.array([0.0, 0.2, 0.0, 30.0])
+FEATURE_HI = np.array([100.0, 3.0, 100.0, 95.0])
+
+# LRU anahtarı için varsayılan çözünürlük (özellik birimi cinsinden adım)
+DEFAULT_RESOLUTION = (1.0, 0.05, 1.0, 0.5)
+
+
+def model_decider(model, scaler=None):
+    """Model -> (is_p_core, freq_idx) karar fonksiyonu."""
+    def decide(features):
+        x = scaler.transform(features) if scaler is not None else features
+        p_core, p_freq = model.predict_on_batch(x)
+        return np.asarray(p_core)[:, 0] > 0.5, np.argmax(np.asarray(p_freq), axis=1)
+    return decide
+
+
+class DecisionTable:
+    """
+    Nicemlenmiş 4-B özellik ızgarası üzerinde önceden hesaplanmış karar tablosu.
+
+    Her hücre, hücre merkezinde modelin verdiği kararı tutar; çalışma anında
+    tahmin tek bir vektörel indeksleme işlemidir.
+    """
+
+    def __init__(self, core, freq, lo=FEATURE_LO, hi=FEATURE_HI):
+        self.core = core
+        self.freq = freq
+        self.lo = np.asarray(lo, dtype=np.float64)
+        self.hi = np.asarray(hi, dtype=np.float64)
+        self.bins = np.array(core.shape)
+
+    @classmethod
+    def build(cls, decide, bins=32, lo=FEATURE_LO, hi=FEATURE_HI):
+        bins = np.broadcast_to(np.asarray(bins), (4,))
+        lo = np.asarray(lo, dtype=np.float64)
+        hi = np.asarray(hi, dtype=np.float64)
+        axes = [lo[d] + (np.arange(bins[d]) + 0.5) * (hi[d] - lo[d]) / bins[d] for d in range(4)]
+        grid = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, 4)
+        is_p, freq_idx = decide(grid)
+        shape = tuple(int(b) for b in bins)
+        return cls(is_p.reshape(shape).astype(np.uint8), freq_idx.reshape(shape).astype(np.uint8), lo, hi)
+
+    def cell_index(self, features):
+        x = np.asarray(features, dtype=np.float64)
+        idx = ((x - self.lo) / (self.hi - self.lo) * self.bins).astype(np.int64)
+        return np.clip(idx, 0, self.bins - 1)
+
+    def decide(self, features):
+        i = self.cell_index(features)
+        cell = (i[:, 0], i[:, 1], i[:, 2], i[:, 3])
+        return self.core[cell].astype(bool), self.freq[cell].astype(np.int64)
+
+    def save(self, path=TABLE_PATH):
+        np.savez_compressed(path, core=self.core, freq=self.freq, lo=self.lo, hi=self.hi)
+
+    @classmethod
+    def load(cls, path=TABLE_PATH):
+        with np.load(path) as t:
+            return cls(t['core'], t['freq'], t['lo'], t['hi'])
+
+
+class LRUDecisionCache:
+    """
+    Nicemlenmiş özellik anahtarlı, boyutu sınırlı LRU karar önbelleği.
+
+    Iskalanan satırlar tek bir toplu çağrıyla modele gönderilir; model
+    hücre merkezinde değerlendirildiği için sonuç geliş sırasından bağımsızdır.
+    """
+
+    def __init__(self, decide, maxsize=4096, resolution=DEFAULT_RESOLUTION):
+        self.decide_fn = decide
+        self.maxsize = maxsize
+        self.resolution = np.asarray(resolution, dtype=np.float64)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def decide(self, features):
+        keys = np.floor(np.asarray(features, dtype=np.float64) / self.resolution).astype(np.int64)
+        n = len(keys)
+        is_p = np.empty(n, dtype=bool)
+        freq_idx = np.empty(n, dtype=np.int64)
+
+        missing = {}
+        for i, key in enumerate(map(tuple, keys.tolist())):
+            hit = self.entries.get(key)
+            if hit is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                self.entries.move_to_end(key)
+                is_p[i], freq_idx[i] = hit
+        # Satır başına: aynı ıskalanan anahtarı paylaşan satırların hepsi ıskalamadır
+        missed_rows = sum(len(rows) for rows in missing.values())
+        self.hits += n - missed_rows
+        self.misses += missed_rows
+
+        if missing:
+            centers = (np.array(list(missing), dtype=np.float64) + 0.5) * self.resolution
+            new_p, new_f = self.decide_fn(centers)
+            for (key, rows), p, f in zip(missing.items(), new_p.tolist(), new_f.tolist()):
+                is_p[rows] = p
+                freq_idx[rows] = f
+                self.entries[key] = (p, f)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return is_p, freq_idx
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+def disagreement_report(exact, approx, X, name):
+    e_core, e_freq = exact(X)
+    a_core, a_freq = approx(X)
+    core_diff = np.mean(e_core != a_core) * 100
+    freq_diff = np.mean(e_freq != a_freq) * 100
+    any_diff = np.mean((e_core != a_core) | (e_freq != a_freq)) * 100
+    print(f"  {name:28s} core: {core_diff:6.3f}%   freq: {freq_diff:6.3f}%   any: {any_diff:6.3f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a quantized decision table and report disagreement with the exact model.")
+    parser.add_argument('--weights', default=WEIGHTS_PATH)
+    parser.add_argument('--bins', type=int, default=32, help="grid cells per feature")
+    parser.add_argument('--out', default=TABLE_PATH)
+    parser.add_argument('--cache-size', type=int, default=4096)
+    parser.add_argument('--resolution', type=float, nargs=4, default=DEFAULT_RESOLUTION,
+                        metavar=('LOAD', 'IPC', 'MISS', 'TEMP'), help="LRU key step per feature")
+    parser.add_argument('--data', default=DATA_PATH)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    exact = model_decider(load_numpy_model(args.weights))
+    table = DecisionTable.build(exact, bins=args.bins)
+    table.save(args.out)
+    print(f"Decision table {tuple(int(b) for b in table.bins)} saved to '{args.out}'.")
+
+    X = pd.read_csv(args.data)[FEATURES].values
+    cache = LRUDecisionCache(exact, maxsize=args.cache_size, resolution=args.resolution)
+    print(f"Disagreement with exact model on {len(X)} rows of '{args.data}':")
+    disagreement_report(exact, table.decide, X, f"table ({args.bins} bins)")
+    disagreement_report(exact, cache.decide, X, f"LRU cache ({args.cache_size})")
+    print(f"  LRU stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
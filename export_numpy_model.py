@@ -0,0 +1,147 @@
+import argparse
+import subprocess
+import sys
+import numpy as np
+
+from numpy_model import WEIGHTS_PATH, load_numpy_model
+from temporal import TEMPORAL_MODEL_PATH, TEMPORAL_SCALER_PATH, TEMPORAL_WEIGHTS_PATH
+
+# --- AYARLAR ---
+MODEL_PATH = 'advanced_scheduler_model.h5'
+SCALER_PATH = 'advanced_scaler.pkl'
+DATA_PATH = 'advanced_os_data.csv'
+TARGETS = ['target_core', 'target_freq']
+
+
+def fold_weights(model, scaler):
+    """
+    Scaler + Dense(64) + BatchNorm + Dense(32) + iki baş yapısını
+    iki Dense katmanı ve birleşik çıkış başına indirger.
+
+    Dense(64) -> ReLU -> BN sırası nedeniyle BN, ikinci Dense katmanına katlanır.
+    """
+    dense1 = model.get_layer('dense')
+    bn = model.get_layer('batch_normalization')
+    dense2 = model.get_layer('dense_1')
+    core = model.get_layer('core_output')
+    freq = model.get_layer('freq_output')
+
+    mean = scaler.mean_.astype(np.float64)
+    scale = scaler.scale_.astype(np.float64)
+
+    # (x - mean) / scale @ W1 + b1  ==  x @ (W1 / scale) + (b1 - (mean / scale) @ W1)
+    w1, b1 = [a.astype(np.float64) for a in dense1.get_weights()]
+    w1_f = w1 / scale[:, None]
+    b1_f = b1 - (mean / scale) @ w1
+
+    # BN(h) = h * a + c  ->  (h * a + c) @ W2 + b2  ==  h @ (a * W2) + (c @ W2 + b2)
+    gamma, beta, moving_mean, moving_var = [a.astype(np.float64) for a in bn.get_weights()]
+    a = gamma / np.sqrt(moving_var + bn.epsilon)
+    c = beta - moving_mean * a
+    w2, b2 = [x.astype(np.float64) for x in dense2.get_weights()]
+    w2_f = a[:, None] * w2
+    b2_f = c @ w2 + b2
+
+    w_core, b_core = core.get_weights()
+    w_freq, b_freq = freq.get_weights()
+
+    return {
+        'w1': w1_f.astype(np.float32), 'b1': b1_f.astype(np.float32),
+        'w2': w2_f.astype(np.float32), 'b2': b2_f.astype(np.float32),
+        'w_core': w_core, 'b_core': b_core,
+        'w_freq': w_freq, 'b_freq': b_freq,
+    }
+
+
+def check_parity(model, scaler, weights_path, data_path=DATA_PATH):
+    """Keras modeli ile NumPy motorunu veri seti üzerinde karşılaştırır."""
+    import pandas as pd
+
+    df = pd.read_csv(data_path)
+    X = df[[c for c in df.columns if c not in TARGETS]].values
+    k_core, k_freq = model.predict(scaler.transform(X), verbose=0, batch_size=4096)
+    n_core, n_freq = load_numpy_model(weights_path).predict_on_batch(X)
+
+    core_agree = np.mean((k_core[:, 0] > 0.5) == (n_core[:, 0] > 0.5))
+    freq_agree = np.mean(np.argmax(k_freq, axis=1) == np.argmax(n_freq, axis=1))
+    max_err = max(np.abs(k_core - n_core).max(), np.abs(k_freq - n_freq).max())
+
+    print(f"Parity on {len(X)} rows of '{data_path}':")
+    print(f"  max |p_keras - p_numpy| : {max_err:.2e}")
+    print(f"  core decision agreement : {core_agree * 100:.3f}%")
+    print(f"  freq decision agreement : {freq_agree * 100:.3f}%")
+    return max_err < 1e-4 and core_agree == 1.0 and freq_agree == 1.0
+
+
+# Her satır ayrı bir Python sürecinde çalışır: import + yükleme + tek tahmin
+_STARTUP_SNIPPETS = {
+    'keras': (
+        "import tensorflow as tf, joblib, numpy as np;"
+        f"m = tf.keras.models.load_model('{MODEL_PATH}'); s = joblib.load('{SCALER_PATH}');"
+        "m.predict_on_batch(s.transform(np.zeros((8, 4))))"
+    ),
+    'numpy': (
+        "import numpy as np; from numpy_model import load_numpy_model;"
+        f"m = load_numpy_model('{WEIGHTS_PATH}'); m.predict_on_batch(np.zeros((8, 4)))"
+    ),
+}
+
+
+_STARTUP_PROBE = """
+import os, resource, time
+t = time.perf_counter()
+exec({code!r})
+elapsed = time.perf_counter() - t
+# ru_maxrss exec boyunca ebeveyn sürecinden miras kalır; Linux'ta VmHWM tercih edilir
+if os.path.exists('/proc/self/status'):
+    rss_kb = next(int(l.split()[1]) for l in open('/proc/self/status') if l.startswith('VmHWM'))
+else:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, rss_kb)
+"""
+
+
+def compare_startup():
+    """Keras ve NumPy yollarının başlangıç süresi ve tepe bellek (RSS) karşılaştırması."""
+    for name, code in _STARTUP_SNIPPETS.items():
+        out = subprocess.run(
+            [sys.executable, '-c', _STARTUP_PROBE.format(code=code)],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        seconds, rss_kb = float(out[-2]), int(out[-1])
+        print(f"  {name:6s} startup: {seconds:6.2f} s   peak RSS: {rss_kb / 1024:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the Keras scheduler model to a NumPy-only weights file.")
+    parser.add_argument('--temporal', action='store_true', help="export the window-feature model (train-modal.py --temporal)")
+    parser.add_argument('--model', default=None)
+    parser.add_argument('--scaler', default=None)
+    parser.add_argument('--out', default=None)
+    parser.add_argument('--data', default=DATA_PATH, help="CSV for --check (its non-target columns are the inputs)")
+    parser.add_argument('--check', action='store_true', help="verify parity against the Keras model on --data")
+    parser.add_argument('--compare', action='store_true', help="compare startup time and memory of both runtimes")
+    args = parser.parse_args()
+    args.model = args.model or (TEMPORAL_MODEL_PATH if args.temporal else MODEL_PATH)
+    args.scaler = args.scaler or (TEMPORAL_SCALER_PATH if args.temporal else SCALER_PATH)
+    args.out = args.out or (TEMPORAL_WEIGHTS_PATH if args.temporal else WEIGHTS_PATH)
+
+    import joblib
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(args.model)
+    scaler = joblib.load(args.scaler)
+
+    np.savez(args.out, **fold_weights(model, scaler))
+    print(f"Folded weights saved to '{args.out}'.")
+
+    ok = True
+    if args.check:
+        ok = check_parity(model, scaler, args.out, args.data)
+    if args.compare:
+        compare_startup()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
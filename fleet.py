@@ -0,0 +1,603 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import struct
+import threading
+import time
+import numpy as np
+
+from scheduler_core import estimate_power
+
+# --- AYARLAR ---
+DEFAULT_PORT = 47100
+BATCH_SIZE = 10            # çerçeve başına örnek (tick)
+MAX_BATCH_DELAY_S = 1.0    # dolmamış parti en geç bu sürede gönderilir
+RECONNECT_S = 2.0
+SEND_TIMEOUT_S = 0.05
+MAX_DATAGRAM = 60000
+PUBLISH_HZ = 5.0           # aggregator -> dashboard yayın hızı
+STALE_S = 5.0              # bu süredir örnek gelmeyen host filo görünümünden çıkar
+MAX_GAP_S = 2.0            # enerji integralinde tek aralığın üst sınırı (kopmalar sayılmaz)
+MAX_SUBSCRIBER_BUFFER = 1 << 20
+
+# --- TEL PROTOKOLÜ ---
+# Çerçeve: başlık | host adı (utf-8) | örnekler
+#   başlık : magic 'AF', sürüm, host adı uzunluğu, örnek sayısı, yük uzunluğu
+#   örnek  : timestamp, ram %, ram kullanılan / toplam (GB), power_ai, power_std, çekirdek sayısı
+#            + çekirdek başına CORE_DTYPE (6 bayt)
+MAGIC = b'AF'
+VERSION = 1
+FRAME = struct.Struct('<2sBBHI')
+SAMPLE = struct.Struct('<dfffffH')
+CORE_DTYPE = np.dtype([('load', '<u2'), ('ipc', '<u2'), ('temp', 'u1'), ('flags', 'u1')])
+LOAD_SCALE = 100.0   # load: 0.01 % çözünürlük
+IPC_SCALE = 1000.0   # ipc: 0.001 çözünürlük
+
+
+def encode_sample(packet):
+    """data_packet -> tek örneğin baytları (çekirdekler NumPy ile tek seferde paketlenir)."""
+    cores = packet['cores']
+    arr = np.empty(len(cores), dtype=CORE_DTYPE)
+    arr['load'] = np.clip(np.array([c['load'] for c in cores]) * LOAD_SCALE, 0, 65535)
+    arr['ipc'] = np.clip(np.array([c['ipc'] for c in cores]) * IPC_SCALE, 0, 65535)
+    arr['temp'] = np.clip(np.array([c['temp'] for c in cores]), 0, 255)
+    arr['flags'] = (np.array([c['is_p'] for c in cores], dtype=np.uint8)
+                    | (np.array([c['freq_idx'] for c in cores], dtype=np.uint8) << 1))
+    head = SAMPLE.pack(packet['timestamp'], packet['ram_percent'], packet['ram_used'], packet['ram_total'],
+                       packet['power_ai'], packet['power_std'], len(cores))
+    return head + arr.tobytes()
+
+
+def encode_frame(host, samples):
+    name = host.encode()[:255]
+    payload = b''.join(samples)
+    return FRAME.pack(MAGIC, VERSION, len(name), len(samples), len(payload)) + name + payload
+
+
+def parse_header(data):
+    magic, version, name_len, count, payload_len = FRAME.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"bad frame header {magic!r} v{version}")
+    return name_len, count, payload_len
+
+
+def decode_body(body, name_len, count):
+    """Başlıktan sonraki baytlar -> (host, [(örnek başlığı, çekirdek dizisi), ...]); kopyalama yok."""
+    host = bytes(body[:name_len]).decode(errors='replace')
+    samples, offset = [], name_len
+    for _ in range(count):
+        head = SAMPLE.unpack_from(body, offset)
+        offset += SAMPLE.size
+        cores = np.frombuffer(body, CORE_DTYPE, count=head[6], offset=offset)
+        offset += cores.nbytes
+        samples.append((head, cores))
+    return host, samples
+
+
+def decode_frame(data):
+    name_len, count, _ = parse_header(data)
+    return decode_body(memoryview(data)[FRAME.size:], name_len, count)
+
+
+def core_columns(cores):
+    """CORE_DTYPE dizisi -> (load, ipc, temp, is_p, freq_idx) float/bool/int sütunları."""
+    flags = cores['flags']
+    return (cores['load'] / LOAD_SCALE, cores['ipc'] / IPC_SCALE, cores['temp'].astype(np.float64),
+            (flags & 1).astype(bool), (flags >> 1) & 3)
+
+
+def parse_address(address):
+    """'HOST:PORT' (TCP) ya da 'udp:HOST:PORT' -> (transport, host, port)."""
+    transport = 'tcp'
+    if address.startswith('udp:'):
+        transport, address = 'udp', address[len('udp:'):]
+    host, port = address.rsplit(':', 1)
+    return transport, host, int(port)
+
+
+# --- AJAN (HOST TARAFI) ---
+class FleetAgent:
+    """
+    Pipeline abonesi: her data_packet'i kodlar, BATCH_SIZE örnekte ya da
+    MAX_BATCH_DELAY_S sonunda tek çerçeve olarak aggregator'a gönderir.
+
+    Gönderim yayın iş parçacığında yapılır; bağlantı yoksa ya da yavaşsa
+    parti düşürülür (dropped) ve en geç RECONNECT_S sonra yeniden denenir.
+    Zamanlayıcı döngüsü hiçbir zaman aggregator'ı beklemez.
+    """
+
+    def __init__(self, address, host=None, batch=BATCH_SIZE, max_delay=MAX_BATCH_DELAY_S):
+        self.transport, self.peer_host, self.peer_port = parse_address(address)
+        self.host = host or socket.gethostname()
+        self.batch = batch
+        self.max_delay = max_delay
+        self.pending = []
+        self.first_at = 0.0
+        self.sock = None
+        self.next_connect = 0.0
+        self.frames_sent = 0
+        self.samples_sent = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+
+    def on_packet(self, packet):
+        if not self.pending:
+            self.first_at = time.monotonic()
+        self.pending.append(encode_sample(packet))
+        if len(self.pending) >= self.batch or time.monotonic() - self.first_at >= self.max_delay:
+            self.flush()
+
+    def flush(self):
+        samples, self.pending = self.pending, []
+        if not samples:
+            return
+        if self.transport == 'udp':
+            # Her datagram kendi başına çözülebilir bir çerçevedir
+            per = max(1, MAX_DATAGRAM // max(len(samples[0]), 1))
+            for i in range(0, len(samples), per):
+                self.send(encode_frame(self.host, samples[i:i + per]), len(samples[i:i + per]))
+        else:
+            self.send(encode_frame(self.host, samples), len(samples))
+
+    def connect(self):
+        if time.monotonic() < self.next_connect:
+            return None
+        self.next_connect = time.monotonic() + RECONNECT_S
+        try:
+            if self.transport == 'udp':
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sock.connect((self.peer_host, self.peer_port))
+            else:
+                sock = socket.create_connection((self.peer_host, self.peer_port), timeout=SEND_TIMEOUT_S)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(SEND_TIMEOUT_S)
+        except OSError:
+            return None
+        return sock
+
+    def send(self, frame, n_samples):
+        if self.sock is None:
+            self.sock = self.connect()
+        if self.sock is None:
+            self.dropped += n_samples
+            return
+        try:
+            self.sock.sendall(frame)
+        except OSError:
+            # Yarım gönderilmiş TCP çerçevesi akışı bozar; bağlantı yeniden kurulur
+            self.sock.close()
+            self.sock = None
+            self.dropped += n_samples
+            return
+        self.frames_sent += 1
+        self.samples_sent += n_samples
+        self.bytes_sent += len(frame)
+
+    def close(self):
+        self.flush()
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def stats(self):
+        return {
+            'frames_sent': self.frames_sent,
+            'samples_sent': self.samples_sent,
+            'bytes_sent': self.bytes_sent,
+            'dropped_samples': self.dropped,
+        }
+
+
+# --- AGGREGATOR ---
+class HostState:
+    def __init__(self, name):
+        self.name = name
+        self.head = None
+        self.cores = None
+        self.last_seen = 0.0
+        self.last_ts = None
+        self.energy_ai = 0.0
+        self.energy_std = 0.0
+        self.samples = 0
+
+    def ingest(self, samples, now):
+        for head, cores in samples:
+            ts, power_ai, power_std = head[0], head[4], head[5]
+            if self.last_ts is not None and ts > self.last_ts:
+                dt = min(ts - self.last_ts, MAX_GAP_S)
+                self.energy_ai += power_ai * dt
+                self.energy_std += power_std * dt
+            self.last_ts = ts if self.last_ts is None else max(ts, self.last_ts)
+        self.head, self.cores = samples[-1]
+        self.samples += len(samples)
+        self.last_seen = now
+
+
+class FleetAggregator:
+    """
+    asyncio toplayıcı: yüzlerce ajanın TCP / UDP çerçevelerini tek döngüde
+    birleştirir, host başına son örneği ve enerji integralini tutar.
+
+    listen adresine bağlanan aboneler (main_dashboard.py --attach) PUBLISH_HZ
+    hızında JSONL filo paketleri alır: her host bir 'çekirdek' kartı, güç ve
+    RAM filo toplamı, 'fleet' altında enerji tasarrufu ve host özetleri.
+    """
+
+    def __init__(self, bind='0.0.0.0', port=DEFAULT_PORT, listen=None, publish_hz=PUBLISH_HZ):
+        self.bind = bind
+        self.port = port
+        self.listen = listen
+        self.publish_hz = publish_hz
+        self.hosts = {}
+        self.subscribers = []
+        self.frames = 0
+        self.samples = 0
+        self.core_samples = 0
+        self.bytes = 0
+        self.errors = 0
+        self.agent_writers = set()
+        self.agent_tasks = set()
+        self.started = time.monotonic()
+
+    def ingest(self, body, name_len, count, nbytes):
+        host, samples = decode_body(body, name_len, count)
+        if not samples:
+            return
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(host)
+        state.ingest(samples, time.monotonic())
+        self.frames += 1
+        self.samples += len(samples)
+        self.core_samples += sum(head[6] for head, _ in samples)
+        self.bytes += nbytes
+
+    async def handle_agent(self, reader, writer):
+        self.agent_writers.add(writer)
+        self.agent_tasks.add(asyncio.current_task())
+        try:
+            while True:
+                header = await reader.readexactly(FRAME.size)
+                name_len, count, payload_len = parse_header(header)
+                body = await reader.readexactly(name_len + payload_len)
+                self.ingest(body, name_len, count, FRAME.size + len(body))
+        except asyncio.IncompleteReadError:
+            pass
+        except (ValueError, struct.error, OSError) as e:
+            self.errors += 1
+            print(f"Agent Error: {e}")
+        finally:
+            self.agent_writers.discard(writer)
+            self.agent_tasks.discard(asyncio.current_task())
+            writer.close()
+
+    def datagram_received(self, data, addr):
+        try:
+            name_len, count, _ = parse_header(data)
+            self.ingest(memoryview(data)[FRAME.size:], name_len, count, len(data))
+        except (ValueError, struct.error):
+            self.errors += 1
+
+    async def handle_subscriber(self, reader, writer):
+        self.subscribers.append(writer)
+        try:
+            await reader.read()  # abone kapanana kadar bekle
+        finally:
+            if writer in self.subscribers:
+                self.subscribers.remove(writer)
+            writer.close()
+
+    def live_hosts(self):
+        now = time.monotonic()
+        return [s for s in self.hosts.values() if s.cores is not None and now - s.last_seen < STALE_S]
+
+    def fleet_packet(self):
+        """Dashboard'un data_packet biçiminde filo görünümü (host başına bir kart)."""
+        cards, summary = [], []
+        power_ai = power_std = ram_used = ram_total = 0.0
+        for state in sorted(self.live_hosts(), key=lambda s: s.name):
+            ts, ram_percent, used, total, p_ai, p_std, n = state.head
+            load, ipc, temp, is_p, freq_idx = core_columns(state.cores)
+            frequency = estimate_power(load, is_p, freq_idx)[2]
+            p_share = float(is_p.mean()) if n else 0.0
+            cards.append({
+                'label': state.name,
+                'load': float(load.mean()) if n else 0.0,
+                'temp': float(temp.max()) if n else 0.0,
+                'is_p': p_share >= 0.5,
+                'freq_val': float(frequency.mean()) if n else 0.0,
+                'freq_idx': int(round(freq_idx.mean())) if n else 0,
+                'ipc': float(ipc.mean()) if n else 0.0,
+            })
+            summary.append({
+                'host': state.name, 'cores': n, 'p_share': p_share,
+                'power_ai': p_ai, 'power_std': p_std,
+                'energy_ai_j': state.energy_ai, 'energy_std_j': state.energy_std,
+            })
+            power_ai += p_ai
+            power_std += p_std
+            ram_used += used
+            ram_total += total
+        energy_ai = sum(s.energy_ai for s in self.hosts.values())
+        energy_std = sum(s.energy_std for s in self.hosts.values())
+        return {
+            'timestamp': time.time(),
+            'cores': cards,
+            'ram_percent': ram_used / ram_total * 100 if ram_total else 0.0,
+            'ram_used': ram_used,
+            'ram_total': ram_total,
+            'power_ai': power_ai,
+            'power_std': power_std,
+            'energy_ai_j': energy_ai,
+            'energy_std_j': energy_std,
+            'fleet': {
+                'hosts': len(cards),
+                'energy_ai_j': energy_ai,
+                'energy_std_j': energy_std,
+                'savings_pct': (1 - energy_ai / energy_std) * 100 if energy_std > 0 else 0.0,
+                'per_host': summary,
+            },
+        }
+
+    def stats(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            'hosts': len(self.hosts),
+            'frames': self.frames,
+            'samples': self.samples,
+            'samples_per_s': self.samples / elapsed,
+            'bytes': self.bytes,
+            'bytes_per_core_sample': self.bytes / self.core_samples if self.core_samples else 0.0,
+            'errors': self.errors,
+        }
+
+    async def publish_loop(self):
+        while True:
+            await asyncio.sleep(1.0 / self.publish_hz)
+            if not self.subscribers:
+                continue
+            line = (json.dumps(self.fleet_packet()) + '\n').encode()
+            for writer in list(self.subscribers):
+                # Yavaş abone döngüyü bekletmez; tamponu dolarsa düşürülür
+                if writer.transport.get_write_buffer_size() > MAX_SUBSCRIBER_BUFFER:
+                    self.subscribers.remove(writer)
+                    writer.close()
+                    continue
+                writer.write(line)
+
+    async def serve(self, stop=None):
+        loop = asyncio.get_running_loop()
+        servers = [await asyncio.start_server(self.handle_agent, self.bind, self.port)]
+        aggregator = self
+
+        class Datagrams(asyncio.DatagramProtocol):
+            def datagram_received(self, data, addr):
+                aggregator.datagram_received(data, addr)
+
+        udp, _ = await loop.create_datagram_endpoint(Datagrams, local_addr=(self.bind, self.port))
+        tasks = [asyncio.ensure_future(self.publish_loop())]
+        if self.listen:
+            if self.listen.startswith('unix:'):
+                servers.append(await asyncio.start_unix_server(self.handle_subscriber, self.listen[len('unix:'):]))
+            else:
+                host, port = self.listen.rsplit(':', 1)
+                servers.append(await asyncio.start_server(self.handle_subscriber, host, int(port)))
+        try:
+            await (stop.wait() if stop is not None else asyncio.Future())
+        finally:
+            for task in tasks:
+                task.cancel()
+            udp.close()
+            for server in servers:
+                server.close()
+            # Ajan bağlantıları kapatılır; işleyiciler EOF ile kendiliğinden biter
+            for writer in list(self.agent_writers):
+                writer.close()
+            if self.agent_tasks:
+                await asyncio.wait(list(self.agent_tasks), timeout=1.0)
+
+
+def run_in_thread(aggregator):
+    """Aggregator'ı arka plan iş parçacığında çalıştırır; durdurmak için çağrılacak fonksiyonu döndürür."""
+    ready = threading.Event()
+    holder = {}
+
+    async def main():
+        holder['loop'] = asyncio.get_running_loop()
+        holder['stop'] = asyncio.Event()
+        serve = asyncio.ensure_future(aggregator.serve(holder['stop']))
+        await asyncio.sleep(0.1)
+        ready.set()
+        await serve
+
+    thread = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        holder['loop'].call_soon_threadsafe(holder['stop'].set)
+        thread.join()
+    return stop
+
+
+# --- YEREL TEST / BENCHMARK ---
+def synthetic_packets(n_cores, count, seed=0):
+    """Sentetik telemetriyle SchedulerEngine'den üretilmiş data_packet'ler."""
+    import psutil
+    from scheduler_core import SchedulerEngine, load_policy_model
+    from telemetry import Telemetry
+    model, scaler = load_policy_model()
+    engine = SchedulerEngine(model, scaler, telemetry=Telemetry())
+    rng = np.random.default_rng(seed)
+    ram = psutil.virtual_memory()
+    return [engine.step(rng.uniform(0, 100, n_cores), ram) for _ in range(count)]
+
+
+def simulate(address, agents, cores, rate, duration, batch):
+    """Tek süreçte N sahte host: her tick her ajan için engine.step + FleetAgent."""
+    packets = synthetic_packets(cores, 64)
+    fleet = [FleetAgent(address, host=f'sim-{i:03d}', batch=batch) for i in range(agents)]
+    period = 1.0 / rate
+    deadline = time.monotonic() + duration if duration else None
+    tick = 0
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            start = time.monotonic()
+            for i, agent in enumerate(fleet):
+                packet = dict(packets[(tick + i) % len(packets)], timestamp=time.time())
+                agent.on_packet(packet)
+            tick += 1
+            time.sleep(max(0.0, period - (time.monotonic() - start)))
+    except KeyboardInterrupt:
+        pass
+    for agent in fleet:
+        agent.close()
+    sent = sum(a.samples_sent for a in fleet)
+    dropped = sum(a.dropped for a in fleet)
+    print(f"{agents} agents x {tick} ticks: {sent} samples sent, {dropped} dropped.")
+
+
+def flood(address, hosts, frame_by_host, duration, counter):
+    """Benchmark göndericisi: önceden kodlanmış çerçeveleri süre dolana kadar basar."""
+    transport, host, port = parse_address(address)
+    socks = []
+    for name in hosts:
+        if transport == 'udp':
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.connect((host, port))
+        else:
+            sock = socket.create_connection((host, port))
+        socks.append((sock, frame_by_host[name]))
+    deadline = time.monotonic() + duration
+    frames = 0
+    while time.monotonic() < deadline:
+        for sock, frame in socks:
+            try:
+                sock.sendall(frame)
+                frames += 1
+            except OSError:
+                pass
+    for sock, _ in socks:
+        sock.close()
+    counter.value = frames
+
+
+def benchmark(agents, cores, batch, duration, senders, transport, port=DEFAULT_PORT + 10, out=None):
+    packets = synthetic_packets(cores, batch)
+    samples = [encode_sample(p) for p in packets]
+
+    start = time.perf_counter()
+    for _ in range(200):
+        for p in packets:
+            encode_sample(p)
+    encode_us = (time.perf_counter() - start) / (200 * batch) * 1e6
+    frame = encode_frame('bench-000', samples)
+    start = time.perf_counter()
+    for _ in range(2000):
+        decode_frame(frame)
+    decode_us = (time.perf_counter() - start) / (2000 * batch) * 1e6
+
+    json_bytes = sum(len(json.dumps(p)) + 1 for p in packets) / (batch * cores)
+    wire_bytes = len(frame) / (batch * cores)
+
+    aggregator = FleetAggregator('127.0.0.1', port)
+    stop = run_in_thread(aggregator)
+    address = f"{'udp:' if transport == 'udp' else ''}127.0.0.1:{aggregator.port}"
+    names = [f'bench-{i:03d}' for i in range(agents)]
+    frames = {name: encode_frame(name, samples) for name in names}
+    counters, procs = [], []
+    for k in range(senders):
+        counter = multiprocessing.Value('q', 0)
+        p = multiprocessing.Process(target=flood, args=(address, names[k::senders], frames, duration, counter))
+        counters.append(counter)
+        procs.append(p)
+    aggregator.started = time.monotonic()
+    base = aggregator.samples
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    # Çekirdek tamponlarında bekleyen çerçeveler de sayılsın: alım durana kadar bekle
+    last, elapsed = -1, 0.0
+    while aggregator.samples != last:
+        last = aggregator.samples
+        elapsed = time.monotonic() - aggregator.started
+        time.sleep(0.25)
+    received = aggregator.samples - base
+    stop()
+
+    sent = sum(c.value for c in counters) * batch
+    result = {
+        'transport': transport, 'agents': agents, 'cores': cores, 'batch': batch, 'senders': senders,
+        'samples_sent': sent,
+        'samples_received': received,
+        'packets_per_s': received / elapsed,
+        'core_samples_per_s': received * cores / elapsed,
+        'wire_mb_per_s': received * len(frame) / batch / elapsed / 1e6,
+        'bytes_per_core_sample': wire_bytes,
+        'json_bytes_per_core_sample': json_bytes,
+        'encode_us_per_packet': encode_us,
+        'decode_us_per_packet': decode_us,
+        'hosts_seen': len(aggregator.hosts),
+    }
+    print(f"{transport.upper()} loopback, {agents} agents x {cores} cores, batch {batch}, {senders} sender process(es):")
+    print(f"  received        {received} packets in {elapsed:.1f} s ({result['packets_per_s']:,.0f} packets/s, "
+          f"{result['core_samples_per_s']:,.0f} core-samples/s, {result['wire_mb_per_s']:.1f} MB/s)")
+    if sent:
+        print(f"  delivered       {received / sent:.1%} of {sent} sent")
+    print(f"  wire size       {wire_bytes:.2f} B / core-sample (JSONL: {json_bytes:.1f} B)")
+    print(f"  encode / decode {encode_us:.1f} / {decode_us:.2f} µs per packet")
+    if out:
+        with open(out, 'w') as f:
+            json.dump(result, f, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet telemetry: aggregator, simulated agents and throughput benchmark.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('aggregate', help="run the asyncio aggregator")
+    p.add_argument('--bind', default='0.0.0.0')
+    p.add_argument('--port', type=int, default=DEFAULT_PORT, help="TCP and UDP port for agents")
+    p.add_argument('--listen', default='127.0.0.1:47101', metavar='HOST:PORT|unix:PATH',
+                   help="serve fleet packets to subscribers (main_dashboard.py --attach)")
+    p.add_argument('--publish-hz', type=float, default=PUBLISH_HZ)
+
+    p = sub.add_parser('simulate', help="run N synthetic agents in one process")
+    p.add_argument('--connect', default=f'127.0.0.1:{DEFAULT_PORT}', metavar='HOST:PORT|udp:HOST:PORT')
+    p.add_argument('--agents', type=int, default=8)
+    p.add_argument('--cores', type=int, default=16)
+    p.add_argument('--rate', type=float, default=10.0)
+    p.add_argument('--duration', type=float, default=0.0, help="seconds (0: until Ctrl+C)")
+    p.add_argument('--batch', type=int, default=BATCH_SIZE)
+
+    p = sub.add_parser('bench', help="loopback throughput benchmark")
+    p.add_argument('--agents', type=int, default=200)
+    p.add_argument('--cores', type=int, default=16)
+    p.add_argument('--batch', type=int, default=BATCH_SIZE)
+    p.add_argument('--duration', type=float, default=5.0)
+    p.add_argument('--senders', type=int, default=2, help="sender processes")
+    p.add_argument('--transport', choices=['tcp', 'udp'], default='tcp')
+    p.add_argument('--port', type=int, default=DEFAULT_PORT + 10, help="loopback port for the benchmark aggregator")
+    p.add_argument('--out', default=None, metavar='PATH', help="write results as JSON")
+    args = parser.parse_args()
+
+    if args.command == 'aggregate':
+        aggregator = FleetAggregator(args.bind, args.port, args.listen, args.publish_hz)
+        print(f"Aggregating on tcp/udp {args.bind}:{args.port}, subscribers on {args.listen}. Ctrl+C to stop.")
+        try:
+            asyncio.run(aggregator.serve())
+        except KeyboardInterrupt:
+            pass
+        print(json.dumps(aggregator.stats()))
+    elif args.command == 'simulate':
+        simulate(args.connect, args.agents, args.cores, args.rate, args.duration, args.batch)
+    else:
+        benchmark(args.agents, args.cores, args.batch, args.duration, args.senders, args.transport, args.port, args.out)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
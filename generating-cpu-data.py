@@ -1,6 +1,10 @@
+import argparse
 import pandas as pd
 import numpy as np
 
+from dataset_shards import COLUMNS, TEMPORAL_COLUMNS, ShardWriter
+from temporal import WINDOW_TICKS, TemporalState
+
 def calculate_optimal_configuration(cpu_load, ipc, cache_miss, temp):
     """
     Complex logic to determine ground truth for training.
@@ -36,8 +40,119 @@ def calculate_optimal_configuration(cpu_load, ipc, cache_miss, temp):
         
     return target_core, target_freq
 
-def generate_complex_dataset(n_samples=5000):
-    np.random.seed(42)
+def calculate_optimal_configuration_vec(cpu_load, ipc, cache_miss, temp):
+    """
+    Vectorized version of calculate_optimal_configuration.
+
+    Takes equally shaped arrays and returns (target_core, target_freq) int8
+    arrays. np.select picks the first matching condition, mirroring the
+    if/elif order of the scalar rule.
+    """
+    conditions = [
+        temp > 85,
+        cache_miss > 70,
+        (cpu_load > 70) & (ipc > 1.5),
+        cpu_load > 40,
+    ]
+    target_core = np.select(conditions, [0, 0, 1, 1], default=0).astype(np.int8)
+    target_freq = np.select(conditions, [0, 1, 2, 1], default=0).astype(np.int8)
+    return target_core, target_freq
+
+def sample_features(rng, n_samples):
+    """Draw (n_samples, 4) features: cpu_load, ipc, cache_miss, temp."""
+    return np.column_stack([
+        rng.uniform(0, 100, n_samples),    # CPU Load %
+        rng.uniform(0.2, 3.0, n_samples),  # Instructions Per Cycle
+        rng.uniform(0, 100, n_samples),    # Cache Miss Rate %
+        rng.uniform(30, 95, n_samples),    # CPU Temperature
+    ])
+
+def sample_sequences(rng, n_seq, seq_len, horizon=8, window=WINDOW_TICKS, warmup=32):
+    """
+    Simulate n_seq per-core load traces and label them for the temporal model.
+
+    Load follows regimes with ramps between random levels, plus one-tick
+    spikes and noise. ipc / cache_miss drift and are redrawn when the regime
+    changes. Temperature lags load (first-order thermal model). Window
+    features come from TemporalState, the same code the runtime uses.
+
+    Labels look ahead: the rule is applied to the mean load and temperature of
+    the next `horizon` ticks. A ramp therefore switches to a P-core before the
+    load arrives, and a single-tick spike does not. Current temp > 85 still
+    forces throttling. Returns (n_seq * seq_len, 9) rows in TEMPORAL_COLUMNS order.
+    """
+    total = warmup + seq_len + horizon
+    load = np.empty((total, n_seq))
+    temp = np.empty((total, n_seq))
+    ipc = np.empty((total, n_seq))
+    miss = np.empty((total, n_seq))
+
+    level = rng.uniform(0, 100, n_seq)
+    target = rng.uniform(0, 100, n_seq)
+    ramp = rng.uniform(1, 15, n_seq)
+    cur_ipc = rng.uniform(0.2, 3.0, n_seq)
+    cur_miss = rng.uniform(0, 100, n_seq)
+    ambient = rng.uniform(-5, 10, n_seq)
+    cur_temp = 35 + ambient + level * 0.55
+    for t in range(total):
+        switch = rng.random(n_seq) < 0.03
+        n_switch = int(switch.sum())
+        target[switch] = rng.uniform(0, 100, n_switch)
+        ramp[switch] = rng.uniform(1, 15, n_switch)
+        cur_ipc[switch] = rng.uniform(0.2, 3.0, n_switch)
+        cur_miss[switch] = rng.uniform(0, 100, n_switch)
+        level += np.clip(target - level, -ramp, ramp)
+        spike = np.where(rng.random(n_seq) < 0.03, rng.uniform(30, 80, n_seq), 0.0)
+        load[t] = np.clip(level + spike + rng.normal(0, 3, n_seq), 0, 100)
+        cur_ipc = np.clip(cur_ipc + rng.normal(0, 0.03, n_seq), 0.2, 3.0)
+        cur_miss = np.clip(cur_miss + rng.normal(0, 1.0, n_seq), 0, 100)
+        cur_temp += 0.1 * (35 + ambient + load[t] * 0.6 - cur_temp)
+        temp[t], ipc[t], miss[t] = np.clip(cur_temp, 30, 100), cur_ipc, cur_miss
+
+    state = TemporalState(window)
+    rows = []
+    csum_load = np.vstack([np.zeros(n_seq), np.cumsum(load, axis=0)])
+    csum_temp = np.vstack([np.zeros(n_seq), np.cumsum(temp, axis=0)])
+    for t in range(warmup + seq_len):
+        x = state.update(np.column_stack((load[t], ipc[t], miss[t], temp[t])))
+        if t < warmup:
+            continue
+        future_load = (csum_load[t + horizon] - csum_load[t]) / horizon
+        future_temp = np.maximum(temp[t], (csum_temp[t + horizon] - csum_temp[t]) / horizon)
+        cores, freqs = calculate_optimal_configuration_vec(future_load, ipc[t], miss[t], future_temp)
+        rows.append(np.column_stack((x, cores, freqs)))
+    # Sequence-major order: each sequence's ticks are contiguous
+    return np.stack(rows, axis=1).reshape(-1, len(TEMPORAL_COLUMNS))
+
+def generate_sequence_dataset(n_samples, seed=42, seq_len=256, horizon=8, window=WINDOW_TICKS,
+                              chunk_size=1_000_000, out=None, fmt='csv'):
+    """Temporal dataset of about n_samples rows (whole sequences): one CSV or streamed shards."""
+    seqs_per_chunk = max(1, chunk_size // seq_len)
+    n_seq = -(-n_samples // seq_len)
+    n_chunks = -(-n_seq // seqs_per_chunk)
+    writer = ShardWriter(out or 'advanced_os_seq_shards', fmt=fmt, columns=TEMPORAL_COLUMNS) if fmt != 'csv' else None
+    blocks = []
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        count = min(seqs_per_chunk, n_seq - i * seqs_per_chunk)
+        block = sample_sequences(np.random.default_rng(child), count, seq_len, horizon, window)
+        if writer is None:
+            blocks.append(block)
+        else:
+            writer.write(block)
+            print(f"  shard {i + 1}/{n_chunks}: {len(block)} rows")
+    if writer is None:
+        out = out or 'advanced_os_seq_data.csv'
+        df = pd.DataFrame(np.vstack(blocks), columns=TEMPORAL_COLUMNS)
+        df[TEMPORAL_COLUMNS[-2:]] = df[TEMPORAL_COLUMNS[-2:]].astype(np.int8)
+        df.to_csv(out, index=False)
+        print(f"Generated {len(df)} temporal samples ({n_seq} sequences x {seq_len} ticks). Saved to '{out}'.")
+        print(df.head())
+    else:
+        writer.close(seed=seed, seq_len=seq_len, horizon=horizon, window=window)
+        print(f"Generated {writer.rows} temporal samples in {n_chunks} {fmt} shards under '{writer.out_dir}'.")
+
+def generate_complex_dataset(n_samples=5000, seed=42, out_path='advanced_os_data.csv'):
+    np.random.seed(seed)
     
     # Feature Generation
     cpu_loads = np.random.uniform(0, 100, n_samples)
@@ -45,20 +160,76 @@ def generate_complex_dataset(n_samples=5000):
     cache_misses = np.random.uniform(0, 100, n_samples) # Cache Miss Rate %
     temps = np.random.uniform(30, 95, n_samples) # CPU Temperature
     
-    data = []
+    cores, freqs = calculate_optimal_configuration_vec(cpu_loads, ipcs, cache_misses, temps)
     
-    for i in range(n_samples):
-        core, freq = calculate_optimal_configuration(
-            cpu_loads[i], ipcs[i], cache_misses[i], temps[i]
-        )
-        data.append([cpu_loads[i], ipcs[i], cache_misses[i], temps[i], core, freq])
-        
-    columns = ['cpu_load', 'ipc', 'cache_miss', 'temp', 'target_core', 'target_freq']
-    df = pd.DataFrame(data, columns=columns)
+    df = pd.DataFrame({
+        'cpu_load': cpu_loads, 'ipc': ipcs, 'cache_miss': cache_misses, 'temp': temps,
+        'target_core': cores, 'target_freq': freqs
+    }, columns=COLUMNS)
     
-    df.to_csv('advanced_os_data.csv', index=False)
-    print(f"Generated {n_samples} complex samples. Saved to 'advanced_os_data.csv'.")
+    df.to_csv(out_path, index=False)
+    print(f"Generated {n_samples} complex samples. Saved to '{out_path}'.")
     print(df.head())
 
+def generate_sharded_dataset(n_samples, seed=42, chunk_size=1_000_000, out_dir='advanced_os_shards', fmt='npy'):
+    """
+    Stream n_samples rows to disk in chunks of chunk_size rows.
+
+    Peak memory is bounded by one chunk. Every chunk gets its own child seed
+    (SeedSequence.spawn), so output is reproducible for a given seed and chunk_size.
+    """
+    writer = ShardWriter(out_dir, fmt=fmt)
+    n_chunks = -(-n_samples // chunk_size)
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        rows = min(chunk_size, n_samples - i * chunk_size)
+        X = sample_features(np.random.default_rng(child), rows)
+        cores, freqs = calculate_optimal_configuration_vec(X[:, 0], X[:, 1], X[:, 2], X[:, 3])
+        writer.write(np.column_stack([X, cores, freqs]))
+        print(f"  shard {i + 1}/{n_chunks}: {rows} rows")
+    writer.close(seed=seed, chunk_size=chunk_size)
+    print(f"Generated {n_samples} samples in {n_chunks} {fmt} shards under '{out_dir}'.")
+
+def check_equivalence(n_samples=200_000, seed=0):
+    """Compare the vectorized labeler against the scalar rule, including threshold edges."""
+    X = sample_features(np.random.default_rng(seed), n_samples)
+    # Force exact threshold values (>, not >=) into the sample
+    edges = np.array([
+        [40, 1.5, 70, 85], [70, 1.5, 70, 85], [70.0001, 1.5001, 69.9, 84.9],
+        [40.0001, 0.2, 0, 30], [100, 3.0, 100, 95], [0, 0.2, 0, 30],
+    ])
+    X = np.vstack([X, edges])
+
+    vec_core, vec_freq = calculate_optimal_configuration_vec(X[:, 0], X[:, 1], X[:, 2], X[:, 3])
+    scalar = np.array([calculate_optimal_configuration(*row) for row in X])
+    mismatches = np.count_nonzero((scalar[:, 0] != vec_core) | (scalar[:, 1] != vec_freq))
+    print(f"Equivalence check on {len(X)} rows: {mismatches} mismatches.")
+    return mismatches == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate labeled scheduler training data.")
+    parser.add_argument('--samples', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000, help="rows per shard (npy/parquet)")
+    parser.add_argument('--format', choices=['csv', 'npy', 'parquet'], default='csv',
+                        help="csv: single in-memory file (original behaviour); npy/parquet: streamed shards")
+    parser.add_argument('--out', default=None, help="output file (csv) or shard directory")
+    parser.add_argument('--temporal', action='store_true',
+                        help="per-core load sequences with window features (ewma_load, load_slope, temp_trend)")
+    parser.add_argument('--seq-len', type=int, default=256, help="ticks per sequence (--temporal)")
+    parser.add_argument('--horizon', type=int, default=8, help="look-ahead ticks used for labels (--temporal)")
+    parser.add_argument('--window', type=int, default=WINDOW_TICKS, help="EWMA window in ticks (--temporal)")
+    parser.add_argument('--check', action='store_true', help="verify vectorized labels against the scalar rule and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(0 if check_equivalence() else 1)
+    if args.temporal:
+        generate_sequence_dataset(args.samples, args.seed, args.seq_len, args.horizon, args.window,
+                                  args.chunk_size, args.out, args.format)
+    elif args.format == 'csv':
+        generate_complex_dataset(args.samples, args.seed, args.out or 'advanced_os_data.csv')
+    else:
+        generate_sharded_dataset(args.samples, args.seed, args.chunk_size, args.out or 'advanced_os_shards', args.format)
+
 if __name__ == "__main__":
-    generate_complex_dataset()
\ No newline at end of file
+    main()
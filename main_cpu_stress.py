@@ -1,32 +1,22 @@
 import multiprocessing
 import time
-import os
+from workload_gen import WorkloadPool
 
-def worker():
-     
-    print(f"Core process {os.getpid()} ")
-    while True:
-        _ = 999999 * 999999
+# Diğer profiller ve seçenekler için: python workload_gen.py --help
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     # Çekirdek sayısı kadar işlem başlat
-    num_cores = multiprocessing.cpu_count()
-    print(f"WARNING: {num_cores} To stop CTRL+C yap.")
+    pool = WorkloadPool('compute')
+    print(f"WARNING: {pool.workers} To stop CTRL+C yap.")
     print("STARTING CPU STRESS TEST... for 30 seconds")
     time.sleep(3)
-    
-    processes = []
-    for _ in range(num_cores):
-        p = multiprocessing.Process(target=worker)
-        p.start()
-        processes.append(p)
-        
+
+    pool.start()
     try:
-         time.sleep(30) 
+        time.sleep(30)
     except KeyboardInterrupt:
         print("Stopping...")
     finally:
-        for p in processes:
-            p.terminate()
-            p.join()
-        print("Test over")
\ No newline at end of file
+        pool.stop()
+        print("Test over")
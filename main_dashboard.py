@@ -1,130 +1,260 @@
 import sys
 import time
+# Açılış ölçümlerinin sıfır noktası (--startup-report); ağır importlardan önce alınır
+STARTUP_T0 = time.perf_counter()
 import psutil
-import numpy as np
-import tensorflow as tf
-import joblib
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QGridLayout, QLabel, QProgressBar, QFrame, QPushButton, 
-                             QTabWidget, QScrollArea, QTextEdit, QLCDNumber)
+                             QTabWidget, QScrollArea, QTextEdit, QLCDNumber, QSlider)
 from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
 import multiprocessing
+import argparse
+import json
+import os
+import socket
+from decision_cache import TABLE_PATH, DecisionTable, LRUDecisionCache
+from power_model import POWER_MODEL_PATH, load_power_model
+from scheduler_core import SchedulerEngine, StandardOSPolicy, load_policy_model
+from telemetry import Telemetry
+from temporal import TemporalState
+from pipeline import SchedulerPipeline
+from workload_trace import TraceWriter
+from workload_gen import PROFILES, LoadSweep, WorkloadPool
 
 # --- AYARLAR ---
-MODEL_PATH = 'advanced_scheduler_model.h5'
-SCALER_PATH = 'advanced_scaler.pkl'
-
-# --- STRESS TEST İŞÇİSİ (GLOBAL FONKSİYON) ---
-def stress_worker():
-    while True:
-        _ = 999999 * 999999
+# Karar modu: 'exact' (her tick tam model), 'cache' (LRU önbellek), 'table' (ön hesaplı tablo)
+DECISION_MODE = 'exact'
+DECISION_CACHE_SIZE = 4096
+# Pencere özellikli (temporal) politika; yalnızca 'exact' karar moduyla
+TEMPORAL_POLICY = False
+# Ağırlık varyantı: 'fp32' ya da quantize_model.py çıktısı ('fp16', 'int8', 'distill-16x8', ...)
+MODEL_VARIANT = 'fp32'
+# Kalibre güç tabloları (power_model.py calibrate); dosya yoksa varsayılan tablolar
+POWER_MODEL = POWER_MODEL_PATH
+# ipc/cache_miss/temp kaynağı: 'auto' (sysfs/perf, yoksa sentetik), 'synthetic', 'replay:DOSYA'
+TELEMETRY_MODE = 'auto'
+# Örnekleme hızı (Hz); çıkarım yetişemezse örnekler birleştirilir, periyot uzamaz
+SAMPLE_RATE_HZ = 10
+# Grafik geçmişi (tick sayısı) ve grafik güncellemesi için kare süresi bütçesi
+HISTORY_LEN = 50
+FRAME_BUDGET_MS = 8.0
+# Worker GUI'nin çizebileceğinden hızlı yayın yaparsa paketler birleştirilir (en yenisi çizilir)
+MAX_UI_FPS = 20
+# Tick aşımı uyarıları için log panelinde en az bu kadar saniye ara
+OVERRUN_LOG_INTERVAL_S = 2.0
+# Kare bütçesi aşımı uyarıları için log panelinde en az bu kadar saniye ara
+FRAME_LOG_INTERVAL_S = 10.0
+# Stres testi yük profili (workload_gen.py): 'compute', 'memory', 'bursty', 'mixed'
+STRESS_PROFILE = 'compute'
+# Stres testi başlangıç yükü (görev oranı 0-1); kaydırıcı ile çalışırken değişir
+STRESS_LOAD = 1.0
+# Yük taraması (0 -> %100) sonuçları; adım süresi / seviyeler workload_gen.py'de
+SWEEP_RESULTS_PATH = 'sweep_results.json'
+
+# Çekirdek kartı stilleri: bir kez derlenir, P/E durumu 'coreType' özelliğiyle seçilir
+CORE_CARD_STYLE = """
+    #core_grid { background-color: transparent; }
+    QFrame#core_card, QFrame#core_card * { background-color: #1f2335; border-radius: 8px; border: 1px solid #2f354b; }
+    QFrame#core_card[coreType="P"], QFrame#core_card[coreType="P"] * { background-color: #2a1b1b; border: 1px solid #f7768e; border-radius: 8px; }
+    QFrame#core_card[coreType="P"] QLabel#type_lbl { color: #f7768e; padding: 2px; }
+    QFrame#core_card[coreType="P"] QProgressBar::chunk { background-color: #f7768e; }
+    QFrame#core_card[coreType="E"], QFrame#core_card[coreType="E"] * { background-color: #1b2a1b; border: 1px solid #9ece6a; border-radius: 8px; }
+    QFrame#core_card[coreType="E"] QLabel#type_lbl { color: #9ece6a; padding: 2px; }
+    QFrame#core_card[coreType="E"] QProgressBar::chunk { background-color: #9ece6a; }
+"""
+
+def format_joules(joules):
+    """Oturum enerjisi: 1 kJ altı J, üstü kJ."""
+    return f"{joules:.0f} J" if joules < 1000 else f"{joules / 1000:.2f} kJ"
+
+
+# --- HALKA TAMPON (GRAFİK GEÇMİŞİ) ---
+class RingBuffer:
+    """Sabit boyutlu NumPy halka tamponu; push O(1), list.pop(0) kaydırması yok."""
+
+    def __init__(self, size, fill=0.0):
+        self.data = np.full(size, fill, dtype=np.float64)
+        self.head = 0  # en eski öğenin indeksi
+
+    def push(self, value):
+        self.data[self.head] = value
+        self.head = (self.head + 1) % len(self.data)
+
+    def values(self):
+        """Eskiden yeniye sıralı kopya."""
+        return np.concatenate((self.data[self.head:], self.data[:self.head]))
+
+    def __len__(self):
+        return len(self.data)
 
 # --- ARKA PLAN VERİ İŞÇİSİ ---
 class DataWorker(QThread):
     data_signal = pyqtSignal(dict) 
 
-    def __init__(self, model, scaler):
+    def __init__(self, model, scaler, telemetry=None):
         super().__init__()
-        self.model = model
-        self.scaler = scaler
+        self.engine = SchedulerEngine(model, scaler, telemetry=telemetry)
         self.running = True
-        self.stress_processes = [] 
+        self.stress_pool = None
 
     def run(self):
+        # Örnekleme / çıkarım / yayın aşamaları kendi iş parçacıklarında çalışır
+        self.pipeline = SchedulerPipeline(self.engine, SAMPLE_RATE_HZ, [self.data_signal.emit])
+        self.pipeline.start()
         while self.running:
-            try:
-                cpu_percents = psutil.cpu_percent(interval=0.5, percpu=True)
-                ram = psutil.virtual_memory()
-                
-                core_data = []
-                total_power_ai = 0
-                total_power_std = 0
-                
-                for cpu_load in cpu_percents:
-                    # Simülasyon Verileri
-                    ipc = 0.5 + (cpu_load / 100.0) * 2.5
-                    cache_miss = (ram.percent * 0.5) + (cpu_load * 0.3)
-                    temp = 35 + (cpu_load * 0.55) 
-                    
-                    # AI Tahmini
-                    features = np.array([[cpu_load, ipc, cache_miss, temp]])
-                    scaled = self.scaler.transform(features)
-                    p_core, p_freq = self.model.predict(scaled, verbose=0)
-                    
-                    is_p_core = p_core[0][0] > 0.5
-                    freq_idx = np.argmax(p_freq[0]) 
-                    
-                    voltage = 0.8 + (freq_idx * 0.2)
-                    frequency = 1.8 + (freq_idx * 1.2) if is_p_core else 1.2 + (freq_idx * 0.6)
-                    
-                    # Enerji (Watt)
-                    p_ai = (cpu_load * 0.1) * (2.0 if is_p_core else 0.8) * voltage
-                    p_std = (cpu_load * 0.1) * (2.0 if cpu_load > 40 else 0.8) * 1.2
-                    
-                    total_power_ai += p_ai
-                    total_power_std += p_std
-                    
-                    core_data.append({
-                        'load': cpu_load,
-                        'temp': temp,
-                        'is_p': is_p_core,
-                        'freq_val': frequency,
-                        'ipc': ipc
-                    })
-
-                data_packet = {
-                    'cores': core_data,
-                    'ram_percent': ram.percent,
-                    'ram_used': ram.used / (1024**3),
-                    'ram_total': ram.total / (1024**3),
-                    'power_ai': total_power_ai,
-                    'power_std': total_power_std
-                }
-                
-                self.data_signal.emit(data_packet)
-                
-            except Exception as e:
-                print(f"Worker Error: {e}")
+            self.pipeline.wait(0.2)
+        self.pipeline.stop()
+        if self.engine.recorder is not None:
+            self.engine.recorder.close()
 
-    def start_stress(self):
-        if not self.stress_processes:
-            num_cores = multiprocessing.cpu_count()
-            for _ in range(num_cores):
-                p = multiprocessing.Process(target=stress_worker)
-                p.start()
-                self.stress_processes.append(p)
+    def start_stress(self, duty=STRESS_LOAD):
+        if self.stress_pool is None:
+            self.stress_pool = WorkloadPool(STRESS_PROFILE, duty=duty)
+            self.stress_pool.start()
+
+    def set_stress_duty(self, duty):
+        """Çalışan işçilerin yükü paylaşılan kontrol bloğundan değişir; yeniden başlatma yok."""
+        if self.stress_pool is not None:
+            self.stress_pool.set_duty(duty)
 
     def stop_stress(self):
-        if self.stress_processes:
-            for p in self.stress_processes:
-                p.terminate()
-                p.join()
-            self.stress_processes = []
+        if self.stress_pool is not None:
+            self.stress_pool.stop()
+            self.stress_pool = None
 
     def stop(self):
         self.running = False
         self.stop_stress()
         self.wait()
 
+# --- ARKA PLAN ISINMA (MODEL + GRAFİK İMPORTLARI) ---
+class WarmupLoader(QThread):
+    """
+    Açılışın yavaş kısımlarını GUI iş parçacığı dışında yapar; pencere ve
+    örnekleme beklemez:
+      1. load_policy_model (Keras'a düşülürse katlanmış .npz sonraki açılış için yazılır)
+      2. matplotlib importu (~0.5 s); grafik widget'ları sonra GUI iş parçacığında kurulur
+    Model önce yüklenir: ilk AI kararı grafiklerden önce gelir.
+    """
+    model_loaded = pyqtSignal(object, object, float)
+    model_failed = pyqtSignal(str)
+    plotting_ready = pyqtSignal()
+
+    def __init__(self, parent=None, load_model=True):
+        super().__init__(parent)
+        self.load_model = load_model
+
+    def run(self):
+        if self.load_model:
+            start = time.perf_counter()
+            try:
+                model, scaler = load_policy_model(TEMPORAL_POLICY, MODEL_VARIANT)
+            except Exception as e:
+                self.model_failed.emit(str(e))
+                return
+            self.model_loaded.emit(model, scaler, time.perf_counter() - start)
+        import matplotlib.figure
+        import matplotlib.patches
+        import matplotlib.backends.backend_qt5agg
+        self.plotting_ready.emit()
+
+# --- UZAK ZAMANLAYICI ABONESİ (scheduler_daemon.py --listen) ---
+class SubscriberWorker(DataWorker):
+    """Yerel model yerine headless daemon'un JSONL yayınını dinler."""
+
+    def __init__(self, address):
+        super().__init__(None, None)
+        self.address = address
+
+    def connect(self):
+        if self.address.startswith('unix:'):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.address[len('unix:'):])
+        else:
+            host, port = self.address.rsplit(':', 1)
+            sock = socket.create_connection((host, int(port)))
+        sock.settimeout(1.0)
+        return sock
+
+    def run(self):
+        while self.running:
+            try:
+                with self.connect() as sock, sock.makefile('r') as stream:
+                    while self.running:
+                        try:
+                            line = stream.readline()
+                        except socket.timeout:
+                            continue
+                        if not line:
+                            break
+                        self.data_signal.emit(json.loads(line))
+            except OSError as e:
+                print(f"Subscriber Error: {e}")
+                time.sleep(1.0)
+
 # --- ANA DASHBOARD ---
 class UltimateDashboard(QMainWindow):
-    def __init__(self):
+    def __init__(self, attach=None, history_len=HISTORY_LEN, record_trace=None, metrics_port=0, metrics_json=None,
+                 startup_report=False):
         super().__init__()
-        self.load_models()
+        self.startup = {}
+        self.startup_report = startup_report
+        self.awaiting_decision = True
+        self.attach = attach
+        self.record_trace = record_trace
+        self.metrics_port = metrics_port
+        self.metrics_json = metrics_json
+        self.exporters = []
+        self.history_len = history_len
+        self.cpu_count = psutil.cpu_count(logical=True)
+        # Pencere ve örnekleme modeli beklemez: model arka planda yüklenir,
+        # o sırada kararlar StandardOSPolicy'den gelir
         self.init_ui()
         self.start_worker()
+        self.warmup = WarmupLoader(self, load_model=attach is None)
+        self.warmup.model_loaded.connect(self.on_model_loaded)
+        self.warmup.model_failed.connect(self.on_model_failed)
+        self.warmup.plotting_ready.connect(self.build_graphs)
+        if attach is None:
+            self.model_lbl.setText("AI MODEL: WARMING UP (standard OS policy)")
+        else:
+            self.model_lbl.setText(f"AI MODEL: REMOTE ({attach})")
+        self.warmup.start()
         self.add_log("System initialized. Waiting for task scheduler...")
-
-    def load_models(self):
-        try:
-            self.model = tf.keras.models.load_model(MODEL_PATH)
-            self.scaler = joblib.load(SCALER_PATH)
-        except:
-            print("Model dosyaları eksik!")
-            sys.exit()
+        # İlk olay döngüsü turunda pencere çizilmiştir
+        QTimer.singleShot(0, self.on_first_frame)
+
+    def since_start(self):
+        """Modül yüklenmeye başladığından bu yana geçen süre (ms)."""
+        return (time.perf_counter() - STARTUP_T0) * 1000
+
+    def on_model_loaded(self, model, scaler, seconds):
+        self.install_policy(model, scaler)
+        self.startup['model_ready_ms'] = self.since_start()
+        runtime = 'keras' if scaler is not None else 'numpy'
+        self.model_lbl.setText(f"AI MODEL: READY ({runtime} {MODEL_VARIANT})")
+        self.add_log(f"AI model loaded in {seconds * 1000:.0f} ms; replacing standard OS policy.")
+
+    def on_model_failed(self, error):
+        print(f"Model dosyaları eksik! ({error})")
+        self.close()
+        QApplication.exit(1)
+
+    def on_first_frame(self):
+        self.startup.setdefault('first_frame_ms', self.since_start())
+
+    def on_first_decision(self):
+        self.awaiting_decision = False
+        self.startup['first_decision_ms'] = self.since_start()
+        # Karar çizildiyse pencere de çizilmiştir (abone modunda paket zamanlayıcıdan önce gelebilir)
+        self.startup.setdefault('first_frame_ms', self.startup['first_decision_ms'])
+        self.add_log("Startup: first frame {first_frame_ms:.0f} ms, first AI decision {first_decision_ms:.0f} ms"
+                     .format(**self.startup))
+        if self.startup_report:
+            print(json.dumps(self.startup))
+            self.close()
 
     def init_ui(self):
         self.setWindowTitle("AI-OS Scheduler | Advanced Control Center")
@@ -157,34 +287,24 @@ class UltimateDashboard(QMainWindow):
         scroll.setWidgetResizable(True)
         scroll.setStyleSheet("border: none; background-color: transparent;")
         grid_container = QWidget()
-        grid_container.setStyleSheet("background-color: transparent;")
+        grid_container.setObjectName("core_grid")
+        grid_container.setStyleSheet(CORE_CARD_STYLE)
         self.core_grid = QGridLayout(grid_container)
         self.core_widgets = []
         
-        self.cpu_count = psutil.cpu_count(logical=True)
         for i in range(self.cpu_count):
             widget = self.create_core_card(i)
             self.core_grid.addWidget(widget, i // 4, i % 4)
             self.core_widgets.append(widget)
+        self.visible_cards = self.cpu_count
             
         scroll.setWidget(grid_container)
         left_layout.addWidget(scroll)
         
-        # Grafikler
+        # Grafikler: sekmeler build_graphs() ile matplotlib yüklendikten sonra eklenir
         self.tabs = QTabWidget()
         self.tabs.setFixedHeight(250)
-        
-        self.fig_power, self.ax_power = plt.subplots(figsize=(5, 2))
-        self.fig_power.patch.set_facecolor('#1a1b26')
-        self.ax_power.set_facecolor('#24283b')
-        self.canvas_power = FigureCanvas(self.fig_power)
-        self.tabs.addTab(self.canvas_power, "⚡ Power Consumption (W)")
-        
-        self.fig_eff, self.ax_eff = plt.subplots(figsize=(5, 2))
-        self.fig_eff.patch.set_facecolor('#1a1b26')
-        self.ax_eff.set_facecolor('#24283b')
-        self.canvas_eff = FigureCanvas(self.fig_eff)
-        self.tabs.addTab(self.canvas_eff, "🌱 Energy Savings (%)")
+        self.graphs_ready = False
 
         left_layout.addWidget(self.tabs)
         main_layout.addLayout(left_layout, 7)
@@ -229,6 +349,16 @@ class UltimateDashboard(QMainWindow):
         lcd_layout.addWidget(self.lcd_power)
         lcd_layout.addWidget(lbl_unit)
         power_vbox.addLayout(lcd_layout)
+
+        self.energy_lbl = QLabel("ENERGY: -")
+        self.energy_lbl.setFont(QFont("Consolas", 9))
+        self.energy_lbl.setStyleSheet("color: #e0af68;")
+        power_vbox.addWidget(self.energy_lbl)
+
+        self.model_lbl = QLabel("AI MODEL: -")
+        self.model_lbl.setFont(QFont("Consolas", 9))
+        self.model_lbl.setStyleSheet("color: #7dcfff;")
+        power_vbox.addWidget(self.model_lbl)
         right_layout.addWidget(power_frame)
 
         # 3. BUTTONS (Sadece Stress Test Kaldı)
@@ -236,10 +366,26 @@ class UltimateDashboard(QMainWindow):
         ctrl_frame.setStyleSheet("background-color: #414868; border-radius: 10px; padding: 5px; margin-top: 10px;")
         ctrl_vbox = QVBoxLayout(ctrl_frame)
         
-        self.btn_stress = QPushButton(" START STRESS TEST")
+        self.btn_stress = QPushButton("🔥 START STRESS TEST")
         self.btn_stress.setFixedHeight(50)
         self.btn_stress.clicked.connect(self.toggle_stress)
         ctrl_vbox.addWidget(self.btn_stress)
+
+        load_row = QHBoxLayout()
+        self.load_lbl = QLabel(f"LOAD {STRESS_LOAD * 100:.0f}%")
+        self.load_lbl.setStyleSheet("color: white;")
+        self.load_slider = QSlider(Qt.Horizontal)
+        self.load_slider.setRange(0, 100)
+        self.load_slider.setValue(int(STRESS_LOAD * 100))
+        self.load_slider.valueChanged.connect(self.on_load_changed)
+        load_row.addWidget(self.load_lbl)
+        load_row.addWidget(self.load_slider)
+        ctrl_vbox.addLayout(load_row)
+
+        self.btn_sweep = QPushButton("📈 LOAD SWEEP 0→100%")
+        self.btn_sweep.clicked.connect(self.toggle_sweep)
+        ctrl_vbox.addWidget(self.btn_sweep)
+        self.sweep = None
         right_layout.addWidget(ctrl_frame)
 
         # 4. KERNEL LOGS (Embedded - Yeni Kısım)
@@ -261,13 +407,89 @@ class UltimateDashboard(QMainWindow):
 
         main_layout.addLayout(right_layout, 3)
 
-        self.history_ai = [0] * 50
-        self.history_std = [0] * 50
-        self.history_saving = [0] * 50
+        self.history_ai = RingBuffer(self.history_len)
+        self.history_std = RingBuffer(self.history_len)
+        self.history_saving = RingBuffer(self.history_len)
+        self.frame_times = RingBuffer(self.history_len)
+        self.last_frame_log = 0.0
+
+    def build_graphs(self):
+        """WarmupLoader matplotlib'i içe aktardıktan sonra çağrılır; o zamana kadar yalnızca geçmiş tutulur."""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+        self.fig_power = Figure(figsize=(5, 2))
+        self.ax_power = self.fig_power.add_subplot()
+        self.fig_power.patch.set_facecolor('#1a1b26')
+        self.ax_power.set_facecolor('#24283b')
+        self.canvas_power = FigureCanvas(self.fig_power)
+        self.tabs.addTab(self.canvas_power, "⚡ Power Consumption (W)")
+
+        self.fig_eff = Figure(figsize=(5, 2))
+        self.ax_eff = self.fig_eff.add_subplot()
+        self.fig_eff.patch.set_facecolor('#1a1b26')
+        self.ax_eff.set_facecolor('#24283b')
+        self.canvas_eff = FigureCanvas(self.fig_eff)
+        self.tabs.addTab(self.canvas_eff, "🌱 Cumulative Energy Savings (%)")
+
+        self.init_graphs()
+        self.graphs_ready = True
+
+    def init_graphs(self):
+        """
+        Eksenler, ızgara ve lejant bir kez çizilir; her tick yalnızca
+        kalıcı çizgi nesneleri set_ydata ile güncellenip blit edilir.
+        """
+        from matplotlib.patches import Polygon
+
+        x = np.arange(self.history_len)
+        zeros = np.zeros(self.history_len)
+
+        self.line_std, = self.ax_power.plot(x, zeros, color='#f7768e', linestyle='--', label='Standard OS', animated=True)
+        self.line_ai, = self.ax_power.plot(x, zeros, color='#9ece6a', label='AI-Driven', animated=True)
+        self.ax_power.legend(loc='upper left', fontsize=8)
+        self.ax_power.set_xlim(0, self.history_len - 1)
+        self.ax_power.set_ylim(0, 10)
+
+        self.line_saving, = self.ax_eff.plot(x, zeros, color='#7dcfff', label='Cumulative Energy Savings (%)', animated=True)
+        # fill_between yerine köşeleri yerinde güncellenen tek bir çokgen
+        self.fill_xy = np.zeros((self.history_len + 2, 2))
+        self.fill_xy[1:-1, 0] = x
+        self.fill_xy[-1, 0] = x[-1]
+        self.fill_saving = Polygon(self.fill_xy, closed=True, color='#7dcfff', alpha=0.3, animated=True)
+        self.ax_eff.add_patch(self.fill_saving)
+        self.ax_eff.set_xlim(0, self.history_len - 1)
+        self.ax_eff.set_ylim(-10, 100)
+
+        for ax in (self.ax_power, self.ax_eff):
+            ax.grid(True, alpha=0.2)
+            ax.tick_params(colors='white')
+
+        # Statik arka plan her tam çizimde (ilk gösterim, yeniden boyutlandırma) yakalanır
+        self.backgrounds = {}
+        for canvas in (self.canvas_power, self.canvas_eff):
+            canvas.mpl_connect('draw_event', lambda event, c=canvas: self.capture_background(c))
+
+    def capture_background(self, canvas):
+        # draw_event paintEvent içinde gelir: burada blit() repaint'i yeniden girer.
+        # Animasyonlu sanatçılar boya döngüsü bittikten sonra çizilir.
+        self.backgrounds[canvas] = canvas.copy_from_bbox(canvas.figure.bbox)
+        QTimer.singleShot(0, lambda: self.blit(canvas))
+
+    def blit(self, canvas):
+        background = self.backgrounds.get(canvas)
+        if background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(background)
+        for artist in canvas.figure.axes[0].get_children():
+            if artist.get_animated():
+                canvas.figure.draw_artist(artist)
+        canvas.blit(canvas.figure.bbox)
 
     def create_core_card(self, index):
         frame = QFrame()
-        frame.setStyleSheet("background-color: #1f2335; border-radius: 8px; border: 1px solid #2f354b;")
+        frame.setObjectName("core_card")
         layout = QVBoxLayout(frame)
         
         top_row = QHBoxLayout()
@@ -306,6 +528,7 @@ class UltimateDashboard(QMainWindow):
         layout.addLayout(details)
         
         frame.layout_refs = {
+            'name': name_lbl,
             'type': type_lbl,
             'bar': bar,
             'freq': freq_val,
@@ -313,13 +536,76 @@ class UltimateDashboard(QMainWindow):
             'ipc': ipc_val,
             'frame': frame
         }
+        # Son çizilen değerler: yalnızca değişen widget'lara dokunulur
+        frame.last_state = {}
+        frame.styled_widgets = [frame] + frame.findChildren(QWidget)
         return frame
 
     def start_worker(self):
-        self.worker = DataWorker(self.model, self.scaler)
-        self.worker.data_signal.connect(self.update_dashboard)
+        if self.attach is not None:
+            self.worker = SubscriberWorker(self.attach)
+        else:
+            self.worker = DataWorker(None, None, Telemetry.create(TELEMETRY_MODE))
+            engine = self.worker.engine
+            engine.policy = StandardOSPolicy()
+            engine.power = load_power_model(POWER_MODEL)
+            if self.record_trace:
+                engine.recorder = TraceWriter(self.record_trace, rate_hz=SAMPLE_RATE_HZ)
+            if self.metrics_port or self.metrics_json:
+                from metrics import SchedulerMetrics, start_exporters
+                engine.metrics = SchedulerMetrics()
+                self.exporters = start_exporters(engine.metrics, self.metrics_port, self.metrics_json)
+        self.pending_data = None
+        self.reported_timing = None
+        self.last_overrun_log = 0.0
+        self.last_render = 0.0
+        self.coalesced = 0
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.timeout.connect(self.render_pending)
+        self.worker.data_signal.connect(self.on_data)
         self.worker.start()
 
+    def install_policy(self, model, scaler):
+        """
+        Yüklenen modeli çalışan motora bağlar. Çıkarım iş parçacığı her an step()
+        içinde olabilir; StandardOSPolicy en son değiştirilir, böylece model
+        hazır olmadan hiçbir karar ona düşmez.
+        """
+        engine = self.worker.engine
+        policy = None
+        if TEMPORAL_POLICY:
+            engine.temporal = TemporalState()
+        elif DECISION_MODE == 'table' and os.path.exists(TABLE_PATH):
+            policy = DecisionTable.load(TABLE_PATH)
+        elif DECISION_MODE == 'cache':
+            policy = LRUDecisionCache(engine.predict_exact, maxsize=DECISION_CACHE_SIZE)
+        engine.scaler = scaler
+        engine.model = model
+        engine.policy = policy
+
+    def on_data(self, data):
+        """Gelen paketi sakla; çizimi MAX_UI_FPS ile sınırla."""
+        if self.sweep is not None:
+            # Tarama birleştirilmeden önceki her paketi görür
+            if self.sweep.update(data):
+                if self.sweep.done:
+                    self.finish_sweep()
+                else:
+                    self.add_log(f"Load sweep: duty {self.sweep.level * 100:.0f}%")
+        if self.pending_data is not None:
+            self.coalesced += 1
+        self.pending_data = data
+        if not self.render_timer.isActive():
+            wait = self.last_render + 1.0 / MAX_UI_FPS - time.monotonic()
+            self.render_timer.start(max(0, int(wait * 1000)))
+
+    def render_pending(self):
+        data, self.pending_data = self.pending_data, None
+        if data is not None:
+            self.last_render = time.monotonic()
+            self.update_dashboard(data)
+
     def add_log(self, message):
         """Logları sağ alttaki ekrana yazar"""
         timestamp = time.strftime("%H:%M:%S")
@@ -327,86 +613,234 @@ class UltimateDashboard(QMainWindow):
         # Otomatik aşağı kaydır
         self.log_area.verticalScrollBar().setValue(self.log_area.verticalScrollBar().maximum())
 
+    def update_core_card(self, card, core_data):
+        widgets = card.layout_refs
+        last = card.last_state
+        state = {
+            'load': int(core_data['load']),
+            'freq': f"{core_data['freq_val']:.1f} GHz",
+            'temp': f"{int(core_data['temp'])}°C",
+            'ipc': f"{core_data['ipc']:.2f}",
+            'type': "P" if core_data['is_p'] else "E",
+            # Filo görünümünde (fleet.py aggregate) her kart bir host'tur
+            'label': core_data.get('label'),
+        }
+
+        if state['label'] != last.get('label') and state['label'] is not None:
+            widgets['name'].setText(state['label'])
+        if state['load'] != last.get('load'):
+            widgets['bar'].setValue(state['load'])
+        for key in ('freq', 'temp', 'ipc'):
+            if state[key] != last.get(key):
+                widgets[key].setText(state[key])
+
+        if state['type'] != last.get('type'):
+            widgets['type'].setText(f"{state['type']}-CORE")
+            card.setProperty("coreType", state['type'])
+            # Stil yeniden ayrıştırılmaz; önceden derlenmiş kurallar yeniden uygulanır
+            for w in card.styled_widgets:
+                w.style().unpolish(w)
+                w.style().polish(w)
+
+        card.last_state = state
+
+    def resize_core_grid(self, count):
+        """Abone modunda kart sayısı yerel CPU sayısına değil gelen pakete uyar."""
+        for i in range(len(self.core_widgets), count):
+            widget = self.create_core_card(i)
+            self.core_grid.addWidget(widget, i // 4, i % 4)
+            self.core_widgets.append(widget)
+        for i, widget in enumerate(self.core_widgets):
+            widget.setVisible(i < count)
+        self.visible_cards = count
+
     def update_dashboard(self, data):
+        if len(data['cores']) != self.visible_cards:
+            self.resize_core_grid(len(data['cores']))
         # Core Update
-        for i, core_data in enumerate(data['cores']):
-            widgets = self.core_widgets[i].layout_refs
-            
-            widgets['bar'].setValue(int(core_data['load']))
-            widgets['freq'].setText(f"{core_data['freq_val']:.1f} GHz")
-            widgets['temp'].setText(f"{int(core_data['temp'])}°C")
-            widgets['ipc'].setText(f"{core_data['ipc']:.2f}")
-            
-            if core_data['is_p']:
-                widgets['type'].setText("P-CORE")
-                widgets['type'].setStyleSheet("color: #f7768e; background-color: #2a1b1b; padding: 2px;")
-                widgets['frame'].setStyleSheet("background-color: #2a1b1b; border: 1px solid #f7768e; border-radius: 8px;")
-                widgets['bar'].setStyleSheet("QProgressBar::chunk { background-color: #f7768e; }")
-            else:
-                widgets['type'].setText("E-CORE")
-                widgets['type'].setStyleSheet("color: #9ece6a; background-color: #1b2a1b; padding: 2px;")
-                widgets['frame'].setStyleSheet("background-color: #1b2a1b; border: 1px solid #9ece6a; border-radius: 8px;")
-                widgets['bar'].setStyleSheet("QProgressBar::chunk { background-color: #9ece6a; }")
+        for core_widget, core_data in zip(self.core_widgets, data['cores']):
+            self.update_core_card(core_widget, core_data)
 
         self.ram_bar.setValue(int(data['ram_percent']))
         self.ram_lbl.setText(f"{data['ram_used']:.1f} GB / {data['ram_total']:.1f} GB")
         self.lcd_power.display(int(data['power_ai']))
 
-        self.update_graphs(data['power_ai'], data['power_std'])
-        
-        # Sadece kritik olaylarda log bas (Çok hızlı akmasın)
-        if data['power_ai'] > 120 and (int(time.time()) % 2 == 0): 
-            self.add_log(f"HIGH LOAD! Power Spike: {int(data['power_ai'])}W - Tuning Frequencies...")
-
-    def update_graphs(self, ai_pow, std_pow):
-        self.history_ai.append(ai_pow)
-        self.history_std.append(std_pow)
-        self.history_ai.pop(0)
-        self.history_std.pop(0)
-        
+        energy_ai, energy_std = data.get('energy_ai_j'), data.get('energy_std_j')
+        if energy_std:
+            self.energy_lbl.setText(f"ENERGY: AI {format_joules(energy_ai)} / STD {format_joules(energy_std)}")
+        self.update_graphs(data['power_ai'], data['power_std'], energy_ai, energy_std)
+        if self.awaiting_decision and not data.get('warming_up'):
+            self.on_first_decision()
+        if 'timing' in data:
+            self.check_overruns(data['timing'])
+
+    def check_overruns(self, timing):
+        """Zamanlayıcı sayaçları son uyarıdan beri arttıysa (kaçan periyot, düşen paket) log bas."""
+        if self.reported_timing is None:
+            self.reported_timing = timing
+            return
+        now = time.monotonic()
+        if now - self.last_overrun_log < OVERRUN_LOG_INTERVAL_S:
+            return
+        missed = timing['overruns'] - self.reported_timing['overruns']
+        dropped = timing['dropped_packets'] - self.reported_timing['dropped_packets']
+        if missed <= 0 and dropped <= 0:
+            return
+        self.reported_timing = timing
+        self.last_overrun_log = now
+        message = f"Tick overrun: {missed} missed period(s), {dropped} dropped packet(s)"
+        stages = timing.get('stages_ms')
+        if stages:
+            # 'step' diğer çıkarım aşamalarının toplamıdır
+            slowest = max((k for k in stages if k != 'step'), key=stages.get)
+            message += f" - slowest stage: {slowest} {stages[slowest]:.1f} ms"
+        self.add_log(message)
+
+    def update_graphs(self, ai_pow, std_pow, energy_ai=None, energy_std=None):
+        start = time.perf_counter()
+        self.history_ai.push(ai_pow)
+        self.history_std.push(std_pow)
+
+        # Tasarruf, oturum boyunca integre edilen enerjiden (J); anlık güç oranı boşta
+        # (yük ~0) gürültülüdür. Enerji alanı olmayan paketlerde anlık orana düşülür.
         saving = 0
-        if std_pow > 0:
+        if energy_std:
+            saving = ((energy_std - energy_ai) / energy_std) * 100
+        elif std_pow > 0:
             saving = ((std_pow - ai_pow) / std_pow) * 100
-        self.history_saving.append(saving)
-        self.history_saving.pop(0)
-
-        self.ax_power.clear()
-        self.ax_power.plot(self.history_std, color='#f7768e', linestyle='--', label='Standard OS')
-        self.ax_power.plot(self.history_ai, color='#9ece6a', label='AI-Driven')
-        self.ax_power.legend(loc='upper left', fontsize=8)
-        self.ax_power.grid(True, alpha=0.2)
-        self.ax_power.tick_params(colors='white')
-        self.canvas_power.draw()
-        
-        self.ax_eff.clear()
-        self.ax_eff.plot(self.history_saving, color='#7dcfff', label='Energy Savings (%)')
-        self.ax_eff.fill_between(range(50), self.history_saving, color='#7dcfff', alpha=0.3)
-        self.ax_eff.set_ylim(-10, 100)
-        self.ax_eff.grid(True, alpha=0.2)
-        self.ax_eff.tick_params(colors='white')
-        self.canvas_eff.draw()
-
-    def toggle_stress(self):
-        if self.btn_stress.text() == "🔥 START STRESS TEST":
-            self.worker.start_stress()
+        self.history_saving.push(saving)
+        if not self.graphs_ready:
+            return
+
+        ai, std, savings = self.history_ai.values(), self.history_std.values(), self.history_saving.values()
+        self.line_ai.set_ydata(ai)
+        self.line_std.set_ydata(std)
+        self.line_saving.set_ydata(savings)
+        self.fill_xy[1:-1, 1] = savings
+        self.fill_saving.set_xy(self.fill_xy)
+
+        # Y ekseni yalnızca veri sığmadığında ya da çok küçüldüğünde yeniden ölçeklenir (tam çizim)
+        peak = max(ai.max(), std.max(), 1.0)
+        ymax = self.ax_power.get_ylim()[1]
+        if peak > ymax or peak < ymax * 0.4:
+            self.ax_power.set_ylim(0, peak * 1.25)
+            self.canvas_power.draw_idle()
+        else:
+            self.blit(self.canvas_power)
+        self.blit(self.canvas_eff)
+
+        frame_ms = (time.perf_counter() - start) * 1000
+        self.frame_times.push(frame_ms)
+        now = time.monotonic()
+        if frame_ms > FRAME_BUDGET_MS and now - self.last_frame_log >= FRAME_LOG_INTERVAL_S:
+            self.last_frame_log = now
+            self.add_log(f"Graph frame {frame_ms:.1f} ms exceeds {FRAME_BUDGET_MS:.0f} ms budget")
+
+    def set_stress_button(self, running):
+        if running:
             self.btn_stress.setText("⏹ STOP STRESS TEST")
             self.btn_stress.setObjectName("stop_btn")
             self.btn_stress.setStyleSheet("background-color: #f7768e; color: white;")
-            self.add_log("WARNING: USER INITIATED STRESS TEST. CPU LOAD 100%")
         else:
-            self.worker.stop_stress()
             self.btn_stress.setText("🔥 START STRESS TEST")
             self.btn_stress.setObjectName("")
             self.btn_stress.setStyleSheet("background-color: #7aa2f7; color: #1a1b26;")
+
+    def toggle_stress(self):
+        if self.sweep is not None:
+            self.finish_sweep(aborted=True)
+            if self.sweep_owns_pool:
+                return  # taramanın havuzu finish_sweep'te durduruldu
+        if self.worker.stress_pool is None:
+            try:
+                self.worker.start_stress(self.load_slider.value() / 100)
+            except MemoryError as e:
+                self.add_log(f"Stress test not started: {e}")
+                return
+            self.set_stress_button(True)
+            self.add_log(f"WARNING: USER INITIATED STRESS TEST. CPU LOAD {self.load_slider.value()}%")
+        else:
+            self.worker.stop_stress()
+            self.set_stress_button(False)
             self.add_log("Stress test terminated. Returning to IDLE state.")
 
+    def on_load_changed(self, value):
+        self.load_lbl.setText(f"LOAD {value}%")
+        if self.sweep is None:
+            self.worker.set_stress_duty(value / 100)
+
+    def toggle_sweep(self):
+        """Yükü 0 -> %100 adımlarla tarar; adım başına politika tepkisi loglanır ve dosyaya yazılır."""
+        if self.sweep is not None:
+            self.finish_sweep(aborted=True)
+            return
+        self.sweep_owns_pool = self.worker.stress_pool is None
+        try:
+            self.worker.start_stress(0.0)
+        except MemoryError as e:
+            self.add_log(f"Load sweep not started: {e}")
+            return
+        self.set_stress_button(True)
+        self.sweep = LoadSweep(self.worker.stress_pool)
+        self.sweep.start()
+        self.btn_sweep.setText("⏹ STOP LOAD SWEEP")
+        self.add_log(f"Load sweep started: {len(self.sweep.levels)} levels x {self.sweep.step_s:.0f} s")
+
+    def finish_sweep(self, aborted=False):
+        sweep, self.sweep = self.sweep, None
+        if sweep.results:
+            for line in sweep.report():
+                self.add_log(line)
+            with open(SWEEP_RESULTS_PATH, 'w') as f:
+                json.dump({'profile': STRESS_PROFILE, 'complete': not aborted, 'steps': sweep.results}, f, indent=1)
+        self.add_log(f"Load sweep {'aborted' if aborted else 'finished'}; results in '{SWEEP_RESULTS_PATH}'.")
+        self.btn_sweep.setText("📈 LOAD SWEEP 0→100%")
+        if self.sweep_owns_pool:
+            self.worker.stop_stress()
+            self.set_stress_button(False)
+        else:
+            self.worker.set_stress_duty(self.load_slider.value() / 100)
+
     def closeEvent(self, event):
         self.worker.stop()
+        self.warmup.wait()
+        for exporter in self.exporters:
+            exporter.close()
         event.accept()
 
 if __name__ == "__main__":
     multiprocessing.freeze_support()
-    app = QApplication(sys.argv)
-    window = UltimateDashboard()
+    parser = argparse.ArgumentParser(description="AI-OS Scheduler dashboard")
+    parser.add_argument('--history', type=int, default=HISTORY_LEN, help="graph history length in ticks")
+    parser.add_argument('--attach', default=None, metavar='HOST:PORT|unix:PATH',
+                        help="subscribe to a running scheduler_daemon.py instead of scheduling locally")
+    parser.add_argument('--record-trace', default=None, metavar='DIR',
+                        help="record per-tick telemetry to a binary trace (replay: workload_trace.py replay DIR)")
+    parser.add_argument('--stress-profile', choices=PROFILES, default=STRESS_PROFILE,
+                        help="load profile of the stress test button (see workload_gen.py)")
+    parser.add_argument('--stress-load', type=float, default=STRESS_LOAD,
+                        help="initial stress duty cycle 0-1 (adjustable at runtime with the slider)")
+    parser.add_argument('--metrics-port', type=int, default=0, metavar='PORT',
+                        help="serve per-stage histograms on http://127.0.0.1:PORT/metrics (Prometheus) and /metrics.json")
+    parser.add_argument('--metrics-json', default=None, metavar='PATH',
+                        help="dump the metrics snapshot to PATH every few seconds")
+    parser.add_argument('--temporal', action='store_true',
+                        help="window-feature policy (advanced_temporal_weights.npz) with per-core EWMA state")
+    parser.add_argument('--model-variant', default=MODEL_VARIANT, metavar='VARIANT',
+                        help="weights variant from quantize_model.py: fp32, fp16, int8, distill-HxW")
+    parser.add_argument('--power-model', default=POWER_MODEL, metavar='PATH',
+                        help="calibrated power tables from power_model.py calibrate (default tables if missing)")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="print time to first frame / first AI decision as JSON and exit")
+    args, qt_args = parser.parse_known_args()
+    STRESS_PROFILE = args.stress_profile
+    STRESS_LOAD = args.stress_load
+    TEMPORAL_POLICY = TEMPORAL_POLICY or args.temporal
+    MODEL_VARIANT = args.model_variant
+    POWER_MODEL = args.power_model
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = UltimateDashboard(attach=args.attach, history_len=args.history, record_trace=args.record_trace,
+                               metrics_port=args.metrics_port, metrics_json=args.metrics_json,
+                               startup_report=args.startup_report)
     window.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- AYARLAR ---
+STAGES = ['sample', 'features', 'inference', 'power', 'step', 'emit']
+N_BUCKETS = 24            # 1 µs ... 2^22 µs (~4.2 s), üstü +Inf
+DUMP_INTERVAL_S = 5.0
+
+
+# --- HİSTOGRAM ---
+class Histogram:
+    """
+    2'nin kuvvetleri sınırlı süre histogramı (µs cinsinden).
+
+    observe() yalnızca bir int.bit_length() ve liste artırımıdır; kilit ya da
+    NumPy çağrısı yoktur. Kova i, (2^(i-1), 2^i] µs aralığını sayar.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (N_BUCKETS + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.last = 0.0
+
+    def observe(self, seconds):
+        us = int(seconds * 1e6)
+        self.counts[min(us.bit_length(), N_BUCKETS)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.last = seconds
+
+    @staticmethod
+    def bound(i):
+        """Kova i'nin üst sınırı (saniye); son kova +Inf."""
+        return float('inf') if i >= N_BUCKETS else (1 << i) * 1e-6
+
+    def quantile(self, q):
+        """Kova üst sınırından kestirilen q-yüzdeliği (saniye)."""
+        if not self.count:
+            return 0.0
+        target, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return self.bound(min(i, N_BUCKETS - 1))
+        return self.bound(N_BUCKETS - 1)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.sum / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.quantile(0.5) * 1000,
+            'p99_ms': self.quantile(0.99) * 1000,
+            'last_ms': self.last * 1000,
+        }
+
+
+# --- METRİK KAYDI ---
+class SchedulerMetrics:
+    """
+    Sıcak yol metrikleri: aşama başına süre histogramları ve karar sayaçları.
+
+    SchedulerEngine ve SchedulerPipeline bunu opsiyonel 'metrics' özniteliği
+    olarak taşır; None ise ölçüm kodu hiç çalışmaz (yalnızca bir None testi).
+    Aşamalar lap() ile zincirlenir: t = m.now(); ...; t = m.lap('features', t).
+    """
+
+    def __init__(self):
+        self.stages = {name: Histogram() for name in STAGES}
+        self.ticks = 0
+        self.decisions = {'P': 0, 'E': 0}
+        self.freq_decisions = [0, 0, 0]
+        self.gauges = []  # dict döndüren çağrılabilirler (ör. pipeline.timing)
+        self.started = time.time()
+
+    now = staticmethod(time.perf_counter)
+
+    def lap(self, stage, start):
+        end = time.perf_counter()
+        self.stages[stage].observe(end - start)
+        return end
+
+    def count_decisions(self, n_p, n_total, freq_counts):
+        self.ticks += 1
+        self.decisions['P'] += n_p
+        self.decisions['E'] += n_total - n_p
+        for i, c in enumerate(freq_counts):
+            self.freq_decisions[i] += int(c)
+
+    def add_gauges(self, fn):
+        self.gauges.append(fn)
+
+    def gauge_values(self):
+        values = {}
+        for fn in self.gauges:
+            values.update(fn())
+        return values
+
+    def last_ms(self):
+        """Her aşamanın son ölçümü (ms); GUI'nin aşım uyarısında kullanılır."""
+        return {name: h.last * 1000 for name, h in self.stages.items() if h.count}
+
+    def snapshot(self):
+        return {
+            'timestamp': time.time(),
+            'uptime_s': time.time() - self.started,
+            'ticks': self.ticks,
+            'decisions': dict(self.decisions),
+            'freq_decisions': list(self.freq_decisions),
+            'stages': {name: h.summary() for name, h in self.stages.items()},
+            'gauges': self.gauge_values(),
+        }
+
+    def prometheus(self):
+        """Prometheus metin biçimi (0.0.4)."""
+        lines = [
+            '# HELP scheduler_stage_seconds Scheduler loop stage duration.',
+            '# TYPE scheduler_stage_seconds histogram',
+        ]
+        for name, h in self.stages.items():
+            cumulative = 0
+            for i, c in enumerate(h.counts):
+                cumulative += c
+                le = '+Inf' if i >= N_BUCKETS else f'{Histogram.bound(i):.6g}'
+                lines.append(f'scheduler_stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'scheduler_stage_seconds_sum{{stage="{name}"}} {h.sum:.9g}')
+            lines.append(f'scheduler_stage_seconds_count{{stage="{name}"}} {h.count}')
+        lines += ['# TYPE scheduler_ticks_total counter', f'scheduler_ticks_total {self.ticks}',
+                  '# TYPE scheduler_decisions_total counter']
+        for core, c in self.decisions.items():
+            lines.append(f'scheduler_decisions_total{{core="{core}"}} {c}')
+        lines.append('# TYPE scheduler_freq_decisions_total counter')
+        for i, c in enumerate(self.freq_decisions):
+            lines.append(f'scheduler_freq_decisions_total{{freq_idx="{i}"}} {c}')
+        for key, value in self.gauge_values().items():
+            if isinstance(value, (int, float)):
+                lines += [f'# TYPE scheduler_{key} gauge', f'scheduler_{key} {value}']
+        return '\n'.join(lines) + '\n'
+
+
+# --- DIŞA AKTARMA ---
+class MetricsServer:
+    """127.0.0.1 üzerinde GET /metrics (Prometheus metni) ve GET /metrics.json."""
+
+    def __init__(self, metrics, port, host='127.0.0.1'):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, ctype = metrics.prometheus().encode(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, ctype = json.dumps(metrics.snapshot()).encode(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class JsonDumper:
+    """snapshot()'u periyodik olarak dosyaya yazar (geçici dosya + os.replace, yarım dosya okunmaz)."""
+
+    def __init__(self, metrics, path, interval=DUMP_INTERVAL_S):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+
+    def dump(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.metrics.snapshot(), f)
+        os.replace(tmp, self.path)
+
+    def loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.dump()
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.dump()
+
+
+def start_exporters(metrics, port=None, json_path=None):
+    """İstenen dışa aktarıcıları başlatır; kapatılacak nesnelerin listesini döndürür."""
+    exporters = []
+    if port:
+        exporters.append(MetricsServer(metrics, port))
+    if json_path:
+        exporters.append(JsonDumper(metrics, json_path))
+    return exporters
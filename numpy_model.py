@@ -0,0 +1,76 @@
+import os
+import numpy as np
+
+# --- AYARLAR ---
+WEIGHTS_PATH = 'advanced_scheduler_weights.npz'
+WEIGHT_NAMES = ['w1', 'b1', 'w2', 'b2', 'w_core', 'b_core', 'w_freq', 'b_freq']
+
+
+def relu(x):
+    return np.maximum(x, 0.0)
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def softmax(x):
+    e = np.exp(x - x.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
+class NumpySchedulerModel:
+    """
+    TensorFlow gerektirmeyen çıkarım motoru.
+
+    StandardScaler ilk Dense katmanına, BatchNormalization ikinci Dense
+    katmanına katlanmış ağırlıklarla çalışır; bu yüzden girdi olarak
+    ölçeklenmemiş (ham) özellikler alır: cpu_load, ipc, cache_miss, temp.
+    Çıktılar Keras modeliyle aynı biçimdedir: (n, 1) core, (n, 3) freq.
+    """
+
+    def __init__(self, w1, b1, w2, b2, w_core, b_core, w_freq, b_freq):
+        self.w1 = w1
+        self.b1 = b1
+        self.w2 = w2
+        self.b2 = b2
+        # İki çıkış başı tek matris çarpımında hesaplanır
+        self.w_heads = np.concatenate([w_core, w_freq], axis=1)
+        self.b_heads = np.concatenate([b_core, b_freq])
+
+    def hidden(self, features):
+        x = np.asarray(features, dtype=self.w1.dtype)
+        h = relu(x @ self.w1 + self.b1)
+        return relu(h @ self.w2 + self.b2)
+
+    def predict_on_batch(self, features):
+        logits = self.hidden(features) @ self.w_heads + self.b_heads
+        p_core = sigmoid(logits[:, :1])
+        p_freq = softmax(logits[:, 1:])
+        return p_core, p_freq
+
+    def predict(self, features, verbose=0):
+        return self.predict_on_batch(features)
+
+
+def variant_path(variant, base=WEIGHTS_PATH):
+    """'fp32' -> base; diğerleri (fp16, int8, distill-16x8...) -> base_<variant>.npz (quantize_model.py)."""
+    if variant in (None, 'fp32'):
+        return base
+    root, ext = os.path.splitext(base)
+    return f"{root}_{variant}{ext}"
+
+
+def read_weight(w, name):
+    """
+    float16 ağırlıklar float32'ye yükseltilir; int8 ağırlıklar (name_q + name_scale,
+    çıkış sütunu başına ölçek) yüklemede bir kez float32'ye açılır.
+    """
+    if name in w.files:
+        return w[name].astype(np.float32)
+    return w[name + '_q'].astype(np.float32) * w[name + '_scale'].astype(np.float32)
+
+
+def load_numpy_model(path=WEIGHTS_PATH):
+    with np.load(path) as w:
+        return NumpySchedulerModel(*[read_weight(w, name) for name in WEIGHT_NAMES])
@@ -0,0 +1,210 @@
+import threading
+import time
+import numpy as np
+
+# --- AYARLAR ---
+DEFAULT_RATE_HZ = 10.0
+STATS_WINDOW = 1024  # istatistikler için son N tick
+
+
+class LatestSlot:
+    """
+    Tek elemanlı posta kutusu: put() tüketilmemiş değerin üzerine yazar.
+
+    Aşağı akış aşaması yavaşsa eski örnekler kuyrukta birikmez; yalnızca en
+    yenisi işlenir (birleştirme). put() üzerine yazdıysa True döndürür.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.value = None
+        self.full = False
+
+    def put(self, value):
+        with self.cond:
+            overwritten = self.full
+            self.value = value
+            self.full = True
+            self.cond.notify()
+            return overwritten
+
+    def get(self, timeout=None):
+        with self.cond:
+            if not self.full:
+                self.cond.wait(timeout)
+            if not self.full:
+                return None
+            self.full = False
+            value, self.value = self.value, None
+            return value
+
+
+class TickClock:
+    """
+    Monotonik saate bağlı sabit periyotlu zamanlayıcı.
+
+    Her uyanışta sapmayı (jitter = gerçek uyanış - hedef) kaydeder. Bir ya da
+    daha fazla periyot kaçırılırsa bunlar 'overrun' sayılır ve takvim
+    gecikmeyi biriktirmek yerine bir sonraki sınıra atlar.
+    """
+
+    def __init__(self, rate_hz, stop_event):
+        self.period = 1.0 / rate_hz
+        self.stop = stop_event
+        self.deadline = time.monotonic() + self.period
+        self.jitter = np.zeros(STATS_WINDOW)
+        self.ticks = 0
+        self.overruns = 0
+
+    def wait(self):
+        """Bir sonraki sınıra kadar bekler; durdurulduysa False döndürür."""
+        if self.stop.wait(max(0.0, self.deadline - time.monotonic())):
+            return False
+        now = time.monotonic()
+        self.jitter[self.ticks % STATS_WINDOW] = now - self.deadline
+        self.ticks += 1
+        self.deadline += self.period
+        if now >= self.deadline:
+            missed = int((now - self.deadline) / self.period) + 1
+            self.overruns += missed
+            self.deadline += missed * self.period
+        return True
+
+
+class SchedulerPipeline:
+    """
+    Örnekleme, çıkarım ve yayın birbirinden ayrı iş parçacıklarında çalışır.
+
+    sampler  : TickClock hızında Telemetry.snapshot() (bloklamaz)
+    inference: en yeni örneği alır, önceki tüketilen örnekle farkından CPU
+               kullanımını hesaplar ve engine.step() ile paketi üretir
+    publish  : en yeni paketi tüm abonelere iletir
+
+    Yavaş çıkarım periyodu uzatmaz; aradaki örnekler birleştirilir. Yavaş bir
+    abone de çıkarımı bekletmez; aradaki paketler düşürülür.
+    """
+
+    def __init__(self, engine, rate_hz=DEFAULT_RATE_HZ, subscribers=()):
+        self.engine = engine
+        self.rate_hz = rate_hz
+        self.subscribers = list(subscribers)
+        self.samples = LatestSlot()
+        self.packets = LatestSlot()
+        self.stop_event = threading.Event()
+        self.clock = TickClock(rate_hz, self.stop_event)
+        self.threads = []
+        if engine.metrics is not None:
+            engine.metrics.add_gauges(self.timing)
+
+        self.coalesced_samples = 0
+        self.dropped_packets = 0
+        self.inferences = 0
+        self.infer_ms = np.zeros(STATS_WINDOW)
+        self.infer_cpu_ms = np.zeros(STATS_WINDOW)
+        self.latency_ms = np.zeros(STATS_WINDOW)
+        self.published = 0
+
+    def subscribe(self, fn):
+        self.subscribers.append(fn)
+
+    def start(self):
+        self.clock.deadline = time.monotonic() + self.clock.period
+        self.prev_snapshot = self.engine.telemetry.snapshot()
+        for target in (self.sample_loop, self.infer_loop, self.publish_loop):
+            thread = threading.Thread(target=target, name=target.__name__, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def wait(self, timeout=None):
+        return self.stop_event.wait(timeout)
+
+    def sample_loop(self):
+        telemetry = self.engine.telemetry
+        metrics = self.engine.metrics
+        while self.clock.wait():
+            if metrics is not None:
+                t = metrics.now()
+            snapshot = telemetry.snapshot()
+            if metrics is not None:
+                metrics.lap('sample', t)
+            if self.samples.put((time.monotonic(), snapshot)):
+                self.coalesced_samples += 1
+
+    def infer_loop(self):
+        telemetry = self.engine.telemetry
+        while not self.stop_event.is_set():
+            item = self.samples.get(timeout=0.1)
+            if item is None:
+                continue
+            sampled_at, snapshot = item
+            start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                cpu_percents = telemetry.cpu_percents(self.prev_snapshot, snapshot)
+                packet = self.engine.step(cpu_percents, snapshot[1])
+            except Exception as e:
+                print(f"Pipeline Error: {e}")
+                continue
+            self.prev_snapshot = snapshot
+
+            i = self.inferences % STATS_WINDOW
+            self.infer_ms[i] = (time.perf_counter() - start) * 1000
+            self.infer_cpu_ms[i] = (time.thread_time() - cpu_start) * 1000
+            self.inferences += 1
+            if self.packets.put((sampled_at, packet)):
+                self.dropped_packets += 1
+
+    def publish_loop(self):
+        metrics = self.engine.metrics
+        while not self.stop_event.is_set():
+            item = self.packets.get(timeout=0.1)
+            if item is None:
+                continue
+            sampled_at, packet = item
+            packet['timing'] = self.timing()
+            if metrics is not None:
+                packet['timing']['stages_ms'] = metrics.last_ms()
+                t = metrics.now()
+            for fn in self.subscribers:
+                try:
+                    fn(packet)
+                except Exception as e:
+                    print(f"Subscriber Error: {e}")
+            if metrics is not None:
+                metrics.lap('emit', t)
+            self.latency_ms[self.published % STATS_WINDOW] = (time.monotonic() - sampled_at) * 1000
+            self.published += 1
+
+    def timing(self):
+        """Pakete eklenen hafif sayaçlar."""
+        return {
+            'ticks': self.clock.ticks,
+            'overruns': self.clock.overruns,
+            'coalesced_samples': self.coalesced_samples,
+            'dropped_packets': self.dropped_packets,
+        }
+
+    def stats(self):
+        """Son STATS_WINDOW tick üzerinden sapma / gecikme dağılımları (ms)."""
+        def dist(values, count):
+            v = values[:min(count, STATS_WINDOW)]
+            if not len(v):
+                return {'mean': 0.0, 'p99': 0.0, 'max': 0.0}
+            return {'mean': float(v.mean()), 'p99': float(np.percentile(v, 99)), 'max': float(v.max())}
+
+        stats = self.timing()
+        stats.update({
+            'rate_hz': self.rate_hz,
+            'inferences': self.inferences,
+            'published': self.published,
+            'jitter_ms': dist(self.clock.jitter * 1000, self.clock.ticks),
+            'inference_ms': dist(self.infer_ms, self.inferences),
+            'inference_cpu_ms': dist(self.infer_cpu_ms, self.inferences),
+            'sample_to_publish_ms': dist(self.latency_ms, self.published),
+        })
+        return stats
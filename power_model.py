@@ -0,0 +1,377 @@
+import argparse
+import glob
+import json
+import os
+import time
+import numpy as np
+
+from telemetry import close_fds, open_sysfs, read_sysfs_int
+
+# --- AYARLAR ---
+POWER_MODEL_PATH = 'power_model.json'
+POWERCAP_ROOT = '/sys/class/powercap'
+VOLTAGE = [0.8, 1.0, 1.2]               # freq_idx başına (V)
+FREQ_GHZ = [[1.2, 1.8, 2.4],            # E çekirdek, freq_idx başına
+            [1.8, 3.0, 4.2]]            # P çekirdek
+STD_LOAD_THRESHOLD = 40.0               # 'standart OS': yük > %40 ise P çekirdek, en yüksek frekans
+MAX_STEP_S = 5.0                        # enerji integralinde tek adımın en uzun süresi (uyku / duraklama)
+CALIBRATION_RATE_HZ = 10
+
+
+# --- GÜÇ MODELİ ---
+class PowerModel:
+    """
+    Çekirdek başına güç, tüm çekirdekler için tek NumPy işlemi:
+
+        P = idle[tip] + load / 100 * dyn[tip, freq_idx]     (tip: 0 = E, 1 = P)
+
+    dyn, %100 yükteki dinamik güçtür (W). Varsayılan tablolar önceki
+    estimate_power formülünü birebir verir (dyn ∝ VOLTAGE, idle = 0);
+    calibrate ile RAPL paket gücünden idle, dyn ve paket sabiti 'base'
+    (uncore) yeniden kestirilir. base çekirdeklere dağıtılmaz.
+    """
+
+    def __init__(self, dyn=None, idle=None, base=0.0, freq=FREQ_GHZ, source='default', observed=None):
+        if dyn is None:
+            dyn = np.outer([8.0, 20.0], VOLTAGE)  # load * 0.1 * (0.8 | 2.0) * V
+        self.dyn = np.asarray(dyn, dtype=np.float64)
+        self.idle = np.zeros(2) if idle is None else np.asarray(idle, dtype=np.float64)
+        self.base = float(base)
+        self.freq = np.asarray(freq, dtype=np.float64)
+        self.source = source
+        # Kalibrasyonda doğrudan ölçülen dyn hücreleri; diğerleri ölçeklenmiş varsayılanlardır
+        self.observed = np.ones(self.dyn.shape, dtype=bool) if observed is None else np.asarray(observed, dtype=bool)
+
+    @property
+    def partial(self):
+        return not self.observed.all()
+
+    def power(self, cpu_load, is_p_core, freq_idx):
+        """Her şekildeki (çekirdek, tick x çekirdek, ...) dizi için çekirdek başına W."""
+        kind = np.asarray(is_p_core, dtype=np.intp)
+        return self.idle[kind] + np.asarray(cpu_load) * 0.01 * self.dyn[kind, freq_idx]
+
+    def estimate(self, cpu_load, is_p_core, freq_idx):
+        """(AI politikası W, standart OS W, frekans GHz) çekirdek başına."""
+        cpu_load = np.asarray(cpu_load)
+        p_ai = self.power(cpu_load, is_p_core, freq_idx)
+        p_std = self.power(cpu_load, cpu_load > STD_LOAD_THRESHOLD, len(VOLTAGE) - 1)
+        frequency = self.freq[np.asarray(is_p_core, dtype=np.intp), freq_idx]
+        return p_ai, p_std, frequency
+
+    # --- KALİBRASYON ---
+    def design(self, loads, is_p, freq_idx):
+        """
+        Paket gücü parametrelerde doğrusaldır; tick başına regresörler:
+        [1, E sayısı, P sayısı, (tip, freq_idx) başına toplam yük / 100].
+        """
+        kind = np.asarray(is_p, dtype=np.intp)
+        cell = kind * self.dyn.shape[1] + np.asarray(freq_idx)
+        u = np.asarray(loads, dtype=np.float64) * 0.01
+        n_cells = self.dyn.size
+        X = np.zeros((len(u), 3 + n_cells))
+        X[:, 0] = 1.0
+        X[:, 1] = (kind == 0).sum(axis=1)
+        X[:, 2] = (kind == 1).sum(axis=1)
+        rows = np.repeat(np.arange(len(u)), u.shape[1])
+        np.add.at(X, (rows, 3 + cell.ravel()), u.ravel())
+        return X
+
+    def params(self):
+        return np.concatenate(([self.base], self.idle, self.dyn.ravel()))
+
+    def fit(self, loads, is_p, freq_idx, watts):
+        """
+        En küçük kareler; negatif katsayılar 0'a kırpılır. Sabit kalan sütunlar
+        mevcut değerlerini korur. Örneklerde hiç görülmeyen (tip, freq_idx)
+        hücreleri, görülen hücrelerin yerleştirilmiş / mevcut oranıyla (aynı tip
+        varsa onun, yoksa tüm görülenlerin medyanı) ölçeklenir: tablo içinde
+        tutarlı kalır (ör. üst frekans ortadakinden ucuz olmaz) ve p_std'nin
+        kullandığı hücreler AI'ınkilerle aynı ölçekte olur. Sonuç 'observed'
+        maskesini taşır.
+        """
+        X = self.design(loads, is_p, freq_idx)
+        theta = self.params()
+        active = X.any(axis=0)
+        active[1:3] &= X[:, 1:3].std(axis=0) > 0  # çekirdek sayısı sabitse idle, base'den ayrılamaz
+        if active[1] and active[2] and np.ptp(X[:, 1] + X[:, 2]) == 0:
+            # E + P sayısı sabit: yalnızca idle farkı ayrılabilir; E idle sabit tutulur, kalanı base'e
+            active[1] = False
+        residual = np.asarray(watts, dtype=np.float64) - X[:, ~active] @ theta[~active]
+        theta[active] = np.maximum(np.linalg.lstsq(X[:, active], residual, rcond=None)[0], 0.0)
+        rms = float(np.sqrt(np.mean((X @ theta - watts) ** 2)))
+
+        dyn = theta[3:].reshape(self.dyn.shape)
+        observed = active[3:].reshape(self.dyn.shape)
+        ratio = np.divide(dyn, self.dyn, out=np.ones_like(dyn), where=self.dyn > 0)
+        if observed.any():
+            overall = np.median(ratio[observed])
+            for t in range(dyn.shape[0]):
+                scale = np.median(ratio[t, observed[t]]) if observed[t].any() else overall
+                dyn[t, ~observed[t]] = self.dyn[t, ~observed[t]] * scale
+        fitted = PowerModel(dyn, theta[1:3], theta[0], self.freq, 'rapl', observed)
+        return fitted, rms
+
+    # --- DOSYA ---
+    def to_dict(self):
+        return {'source': self.source, 'base_w': self.base, 'idle_w': self.idle.tolist(),
+                'dyn_w': self.dyn.tolist(), 'freq_ghz': self.freq.tolist(),
+                'partial': self.partial, 'observed': self.observed.tolist()}
+
+    def save(self, path=POWER_MODEL_PATH):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path=POWER_MODEL_PATH):
+        with open(path) as f:
+            d = json.load(f)
+        return cls(d['dyn_w'], d['idle_w'], d['base_w'], d['freq_ghz'], d.get('source', path), d.get('observed'))
+
+
+DEFAULT_MODEL = PowerModel()
+
+
+def load_power_model(path=POWER_MODEL_PATH):
+    """Kalibrasyon dosyası varsa onu, yoksa varsayılan tabloları döndürür."""
+    if path and os.path.exists(path):
+        return PowerModel.load(path)
+    return PowerModel()
+
+
+# --- ENERJİ SAYACI ---
+class EnergyMeter:
+    """
+    Oturum boyunca çekirdek ve politika başına kümülatif joule.
+
+    add() her tick çağrılır; güç, önceki çağrıdan bu yana geçen süreyle
+    çarpılır (örnek yükler de o aralığın ortalamasıdır). Çekirdek sayısı
+    değişirse sayaçlar sıfırdan başlar.
+    """
+
+    def __init__(self):
+        self.ai = np.zeros(0)
+        self.std = np.zeros(0)
+        self.last = None
+        self.seconds = 0.0
+
+    def add(self, p_ai, p_std, now=None):
+        now = time.monotonic() if now is None else now
+        if len(p_ai) != len(self.ai):
+            self.ai = np.zeros(len(p_ai))
+            self.std = np.zeros(len(p_ai))
+            self.last = None
+        dt = 0.0 if self.last is None else min(now - self.last, MAX_STEP_S)
+        self.last = now
+        self.ai += p_ai * dt
+        self.std += p_std * dt
+        self.seconds += dt
+
+    @property
+    def total_ai(self):
+        return float(self.ai.sum())
+
+    @property
+    def total_std(self):
+        return float(self.std.sum())
+
+    def snapshot(self):
+        return {
+            'seconds': self.seconds,
+            'energy_ai_j': self.total_ai,
+            'energy_std_j': self.total_std,
+            'core_energy_ai_j': self.ai.tolist(),
+            'core_energy_std_j': self.std.tolist(),
+        }
+
+
+# --- RAPL ---
+class RaplReader:
+    """
+    /sys/class/powercap/intel-rapl:N/energy_uj paket sayaçlarından ortalama güç (W).
+
+    root aynı düzende herhangi bir dizin olabilir (dosya tabanlı yedek; bkz.
+    FakeRapl). Sayaç max_energy_range_uj'de sarar; fark buna göre düzeltilir.
+    energy_uj çoğu çekirdekte yalnızca root tarafından okunabilir.
+    """
+
+    def __init__(self, root=POWERCAP_ROOT):
+        zones = sorted(z for z in glob.glob(os.path.join(root, 'intel-rapl:*')) if z.count(':') == 1)
+        self.fds = open_sysfs(os.path.join(z, 'energy_uj') for z in zones)
+        if not zones or any(fd is None for fd in self.fds):
+            close_fds(self.fds)
+            raise OSError(f"no readable RAPL package zones under {root}")
+        self.ranges = []
+        for z in zones:
+            with open(os.path.join(z, 'max_energy_range_uj')) as f:
+                self.ranges.append(int(f.read()))
+        self.prev = None
+
+    def read(self):
+        return [read_sysfs_int(fd) for fd in self.fds]
+
+    def watts(self):
+        """Son çağrıdan bu yana ortalama paket gücü; ilk çağrıda None."""
+        now, energy = time.monotonic(), self.read()
+        prev, self.prev = self.prev, (now, energy)
+        if prev is None or now <= prev[0]:
+            return None
+        joules = sum((e - p) % r for e, p, r in zip(energy, prev[1], self.ranges)) / 1e6
+        return joules / (now - prev[0])
+
+    def close(self):
+        close_fds(self.fds)
+
+
+class FakeRapl:
+    """
+    RAPL'ı olmayan makinede kalibrasyonu uçtan uca denemek için powercap düzeninde
+    sahte bir paket: advance(), gizli 'gerçek' modelin gücünü (+ gürültü) energy_uj'ye ekler.
+    """
+
+    def __init__(self, root, truth, noise_w=0.5, max_range_uj=2 ** 32, seed=0):
+        self.zone = os.path.join(root, 'intel-rapl:0')
+        os.makedirs(self.zone, exist_ok=True)
+        self.truth = truth
+        self.noise_w = noise_w
+        self.max_range = max_range_uj
+        self.energy = max_range_uj - 10 ** 6  # sarma yolu da denenir
+        self.rng = np.random.default_rng(seed)
+        for name, value in (('name', 'package-0'), ('max_energy_range_uj', max_range_uj)):
+            with open(os.path.join(self.zone, name), 'w') as f:
+                f.write(f'{value}\n')
+        self.write()
+
+    def write(self):
+        with open(os.path.join(self.zone, 'energy_uj'), 'w') as f:
+            f.write(f'{int(self.energy)}\n')
+
+    def advance(self, loads, is_p, freq_idx, dt):
+        watts = self.truth.base + self.truth.power(loads, is_p, freq_idx).sum() + self.rng.normal(0, self.noise_w)
+        self.energy = (self.energy + max(watts, 0.0) * dt * 1e6) % self.max_range
+        self.write()
+
+
+# --- KALİBRASYON DÖNGÜSÜ ---
+def hardware_state(n, p_cpus, telemetry, model):
+    """
+    Regresörler gerçek donanım durumudur, politika kararları değil: çekirdek
+    tipi detect_core_sets'ten, freq_idx ölçülen frekansa en yakın tablo
+    değerinden (cpufreq yoksa en yüksek frekans varsayılır).
+    """
+    is_p = np.array([cpu in p_cpus for cpu in range(n)])
+    cur = telemetry.last_freq
+    if cur is None or len(cur) != n or np.isnan(cur).all():
+        return is_p, np.full(n, model.freq.shape[1] - 1)
+    table = model.freq[is_p.astype(np.intp)]
+    freq_idx = np.abs(table - np.nan_to_num(cur, nan=np.inf)[:, None]).argmin(axis=1)
+    return is_p, freq_idx
+
+
+def collect(rapl, duration, rate_hz=CALIBRATION_RATE_HZ, model=DEFAULT_MODEL, fake=None, sweep=None):
+    """duration saniye boyunca (yükler, tip, freq_idx, paket W) örnekleri toplar."""
+    from actuation import detect_core_sets
+    from telemetry import Telemetry
+
+    telemetry = Telemetry.create('auto')
+    p_cpus, _ = detect_core_sets()
+    period = 1.0 / rate_hz
+    telemetry.sample()
+    rapl.watts()
+    samples = ([], [], [], [])
+    end = time.monotonic() + duration
+    last = time.monotonic()
+    while time.monotonic() < end:
+        time.sleep(period)
+        cpu_percents, ram = telemetry.sample()
+        telemetry.features(cpu_percents, ram.percent)  # last_freq güncellenir
+        loads = np.asarray(cpu_percents, dtype=np.float64)
+        is_p, freq_idx = hardware_state(len(loads), p_cpus, telemetry, model)
+        now = time.monotonic()
+        if fake is not None:
+            fake.advance(loads, is_p, freq_idx, now - last)
+        last = now
+        watts = rapl.watts()
+        if sweep is not None:
+            sweep.update()
+        if watts is None:
+            continue
+        for column, value in zip(samples, (loads, is_p, freq_idx, watts)):
+            column.append(value)
+    telemetry.close()
+    return [np.array(column) for column in samples]
+
+
+def print_model(model):
+    print(f"  source {model.source}, package base {model.base:.2f} W, idle/core E {model.idle[0]:.2f} W, P {model.idle[1]:.2f} W")
+    print(f"  {'':8s}" + ''.join(f"{'idx ' + str(i):>9s}" for i in range(model.dyn.shape[1])) + "   (W at 100% load)")
+    for name, row, seen in zip(('E-core', 'P-core'), model.dyn, model.observed):
+        print(f"  {name:8s}" + ''.join(f"{w:8.2f}{' ' if s else '*'}" for w, s in zip(row, seen)))
+    if model.partial:
+        print("  * not observed during calibration: default scaled by the fitted/default ratio of observed cells")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-core power model: RAPL calibration and inspection.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    cal = sub.add_parser('calibrate', help="fit the power tables to RAPL package power")
+    cal.add_argument('--duration', type=float, default=60.0, help="seconds of samples")
+    cal.add_argument('--rate', type=float, default=CALIBRATION_RATE_HZ, help="samples per second")
+    cal.add_argument('--rapl-root', default=POWERCAP_ROOT, help="powercap directory (real or a file-based stand-in)")
+    cal.add_argument('--fake-rapl', default=None, metavar='DIR',
+                     help="create a simulated RAPL package in DIR and calibrate against it (no hardware needed)")
+    cal.add_argument('--sweep', action='store_true', help="run a 0..100%% workload sweep for varied load (workload_gen.py)")
+    cal.add_argument('--out', default=POWER_MODEL_PATH)
+
+    show = sub.add_parser('show', help="print the active power tables")
+    show.add_argument('--model', default=POWER_MODEL_PATH)
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        print_model(load_power_model(args.model))
+        return
+
+    fake = truth = None
+    if args.fake_rapl:
+        # Gizli 'gerçek' model: varsayılan tablolardan farklı, kalibrasyon bunu geri bulmalı
+        truth = PowerModel(DEFAULT_MODEL.dyn * 0.6, [0.3, 0.8], 6.0, source='fake-rapl truth')
+        fake = FakeRapl(args.fake_rapl, truth)
+        args.rapl_root = args.fake_rapl
+    try:
+        rapl = RaplReader(args.rapl_root)
+    except OSError as e:
+        parser.error(f"{e} (try --fake-rapl DIR, or run as root)")
+
+    pool = sweep = None
+    if args.sweep:
+        from workload_gen import LoadSweep, WorkloadPool
+        pool = WorkloadPool('compute', duty=0.0)
+        pool.start()
+        sweep = LoadSweep(pool, step_s=args.duration / 11)
+        sweep.start()
+    print(f"Sampling RAPL for {args.duration:.0f} s...")
+    try:
+        loads, is_p, freq_idx, watts = collect(rapl, args.duration, args.rate, fake=fake, sweep=sweep)
+    finally:
+        if pool is not None:
+            pool.stop()
+        rapl.close()
+    if len(watts) < 10:
+        parser.error("too few samples; increase --duration")
+
+    model, rms = DEFAULT_MODEL.fit(loads, is_p, freq_idx, watts)
+    print(f"Fitted on {len(watts)} samples: package {watts.mean():.1f} W mean, residual RMS {rms:.2f} W")
+    print_model(model)
+    if model.partial:
+        print(f"WARNING: {int((~model.observed).sum())} of {model.observed.size} cells were extrapolated; "
+              f"savings that depend on them are estimates. Saved with partial=true.")
+    if truth is not None:
+        print("Simulated truth:")
+        print_model(truth)
+    model.save(args.out)
+    print(f"Saved to '{args.out}'.")
+
+
+if __name__ == "__main__":
+    main()
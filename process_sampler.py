@@ -0,0 +1,166 @@
+import argparse
+import time
+import psutil
+import numpy as np
+
+# --- AYARLAR ---
+TOP_N = 16             # sınıflandırılacak en çok CPU kullanan süreç sayısı
+BUDGET_MS = 5.0        # tick başına süreç okuma bütçesi
+ATTRS = ['name', 'cpu_times', 'memory_info', 'num_ctx_switches', 'cpu_num', 'create_time']
+
+
+class ProcessSampler:
+    """
+    Süreç başına CPU zamanı farkı, RSS ve bağlam değişimi örnekleyicisi.
+
+    - PID kümesi her tick'te psutil.pids() ile (tek listdir) güncellenir;
+      psutil.Process nesneleri PID başına bir kez oluşturulur ve saklanır.
+    - Her okuma Process.as_dict(ATTRS) ile oneshot önbelleğinde yapılır
+      (process_iter(attrs) ile aynı önceden getirme).
+    - Önceki tick'in ilk TOP_N süreci her tick okunur; geri kalanı BUDGET_MS
+      dolana kadar döner bir imleçle taranır. Binlerce süreçli makinelerde de
+      tick maliyeti sınırlı kalır; yüzdeler her PID'in kendi son okumasından
+      bu yana geçen süreyle hesaplandığı için atlanan PID'ler de doğru kalır.
+    - İki okuma arasında yeniden kullanılan PID (create_time değişti ya da
+      sayaç geriye gitti) yeni bir süreç sayılır: taban sıfırlanır, o tick
+      kayıt üretilmez (negatif yük yok).
+    """
+
+    def __init__(self, top_n=TOP_N, budget_ms=BUDGET_MS):
+        self.top_n = top_n
+        self.budget_s = budget_ms / 1000.0
+        self.procs = {}     # pid -> psutil.Process
+        self.prev = {}      # pid -> (zaman, cpu_time, ctx_switches, create_time)
+        self.records = {}   # pid -> son kayıt
+        self.order = []
+        self.cursor = 0
+        self.hot = []
+        self.last_scan = {'tracked': 0, 'scanned': 0, 'ms': 0.0}
+
+    def refresh_pids(self):
+        pids = set(psutil.pids())
+        known = self.procs.keys()
+        gone = known - pids
+        new = pids - known
+        for pid in gone:
+            del self.procs[pid]
+            self.prev.pop(pid, None)
+            self.records.pop(pid, None)
+        for pid in new:
+            try:
+                self.procs[pid] = psutil.Process(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        if gone or new:
+            self.order = sorted(self.procs)
+
+    def read(self, pid, now):
+        proc = self.procs.get(pid)
+        if proc is None:
+            return
+        try:
+            info = proc.as_dict(ATTRS)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return
+        if info['cpu_times'] is None:  # erişim reddedildi
+            return
+        cpu_time = info['cpu_times'].user + info['cpu_times'].system
+        ctx = info['num_ctx_switches']
+        ctx_total = ctx.voluntary + ctx.involuntary if ctx is not None else 0
+
+        prev = self.prev.get(pid)
+        self.prev[pid] = (now, cpu_time, ctx_total, info['create_time'])
+        if prev is not None and (prev[3] != info['create_time'] or cpu_time < prev[1] or ctx_total < prev[2]):
+            # PID yeniden kullanıldı: eski sayaçlarla fark alınmaz, yeni süreç için nesne yenilenir
+            self.records.pop(pid, None)
+            try:
+                self.procs[pid] = psutil.Process(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+            return
+        if prev is None or now <= prev[0]:
+            return
+        dt = now - prev[0]
+        self.records[pid] = {
+            'pid': pid,
+            'name': info['name'],
+            'load': (cpu_time - prev[1]) / dt * 100.0,
+            'rss_mb': info['memory_info'].rss / (1024**2) if info['memory_info'] is not None else 0.0,
+            'ctx_per_s': (ctx_total - prev[2]) / dt,
+            'cpu': info['cpu_num'] if info['cpu_num'] is not None else 0,
+        }
+
+    def sample(self):
+        """En çok CPU kullanan top_n sürecin kayıtları (yük sırasıyla)."""
+        start = time.perf_counter()
+        deadline = start + self.budget_s
+        self.refresh_pids()
+
+        now = time.monotonic()
+        hot = set(self.hot)
+        for pid in self.hot:
+            self.read(pid, now)
+        scanned = len(hot)
+        n = len(self.order)
+        for _ in range(n):
+            if time.perf_counter() >= deadline:
+                break
+            pid = self.order[self.cursor % n]
+            self.cursor += 1
+            if pid not in hot:
+                self.read(pid, time.monotonic())
+                scanned += 1
+
+        top = sorted(self.records.values(), key=lambda r: r['load'], reverse=True)[:self.top_n]
+        self.hot = [r['pid'] for r in top]
+        self.last_scan = {
+            'tracked': len(self.procs),
+            'scanned': scanned,
+            'ms': (time.perf_counter() - start) * 1000,
+        }
+        return top
+
+
+def full_scan():
+    """Karşılaştırma için: her tick tüm süreçleri process_iter(attrs) ile okur."""
+    return [p.info for p in psutil.process_iter(ATTRS)]
+
+
+def benchmark(ticks, top_n, budget_ms, interval):
+    sampler = ProcessSampler(top_n, budget_ms)
+    sampler.sample()
+    costs, scanned = [], []
+    for _ in range(ticks):
+        time.sleep(interval)
+        sampler.sample()
+        costs.append(sampler.last_scan['ms'])
+        scanned.append(sampler.last_scan['scanned'])
+
+    full = []
+    for _ in range(min(ticks, 20)):
+        start = time.perf_counter()
+        full_scan()
+        full.append((time.perf_counter() - start) * 1000)
+
+    costs = np.array(costs)
+    print(f"Tracked processes: {sampler.last_scan['tracked']}")
+    print(f"ProcessSampler (budget {budget_ms} ms): mean {costs.mean():.2f} ms, p99 {np.percentile(costs, 99):.2f} ms, "
+          f"{np.mean(scanned):.0f} processes read per tick")
+    print(f"process_iter full scan:            mean {np.mean(full):.2f} ms")
+    print(f"Top {top_n} by CPU:")
+    for r in sampler.sample():
+        print(f"  {r['pid']:>7} {r['name'][:24]:24s} {r['load']:6.1f}%  {r['rss_mb']:8.1f} MB  {r['ctx_per_s']:8.0f} ctx/s  cpu{r['cpu']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-process sampler: per-tick cost vs. a full process_iter scan.")
+    parser.add_argument('--ticks', type=int, default=50)
+    parser.add_argument('--top', type=int, default=TOP_N)
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    parser.add_argument('--interval', type=float, default=0.1)
+    args = parser.parse_args()
+    benchmark(args.ticks, args.top, args.budget_ms, args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+import numpy as np
+
+from benchmark_suite import measure
+from numpy_model import WEIGHT_NAMES, WEIGHTS_PATH, load_numpy_model, variant_path
+from temporal import TEMPORAL_WEIGHTS_PATH
+
+# --- AYARLAR ---
+DATA_PATH = 'advanced_os_data.csv'
+TARGETS = ['target_core', 'target_freq']
+DISTILL_SIZES = ['16x8', '8x8']
+DISTILL_SAMPLES = 200_000
+BATCH_SIZES = [1, 64, 4096]
+HOLDOUT = 0.2            # --eval-data yoksa --data'nın değerlendirmeye ayrılan payı (damıtmada görülmez)
+SPLIT_SEED = 0
+
+
+# --- NİCEMLEME ---
+def quantize_fp16(weights):
+    return {name: w.astype(np.float16) for name, w in weights.items()}
+
+
+def quantize_int8(weights):
+    """
+    Simetrik, çıkış sütunu başına int8: W ≈ W_q * scale, W_q ∈ [-127, 127].
+
+    Yalnızca ağırlık matrisleri nicemlenir; bias'lar (birkaç düzine sayı) float32 kalır.
+    """
+    out = {}
+    for name, w in weights.items():
+        if w.ndim == 2:
+            scale = np.abs(w).max(axis=0) / 127.0
+            scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+            out[name + '_q'] = np.round(w / scale).astype(np.int8)
+            out[name + '_scale'] = scale
+        else:
+            out[name] = w.astype(np.float32)
+    return out
+
+
+# --- DAMITMA (KÜÇÜK MİMARİLER) ---
+def distill_inputs(X, n, seed=0):
+    """Öğretmen etiketleri için girdi: veri satırları + verinin sütun aralığında düzgün örnekler."""
+    rng = np.random.default_rng(seed)
+    lo, hi = X.min(axis=0), X.max(axis=0)
+    return np.vstack([X, rng.uniform(lo, hi, size=(n, X.shape[1]))])
+
+
+def distill(teacher, X, hidden, epochs=20, batch_size=256, seed=0):
+    """
+    Öğretmenin (fp32 NumPy modeli) olasılıklarını taklit eden Dense(h1)-Dense(h2)
+    öğrencisi. Girdi standardizasyonu ilk katmana katlanır; çıktı .npz anahtarları
+    NumpySchedulerModel ile aynıdır.
+    """
+    import tensorflow as tf
+    from tensorflow.keras.layers import Dense, Input
+    from tensorflow.keras.models import Model
+
+    tf.random.set_seed(seed)
+    p_core, p_freq = teacher.predict_on_batch(X)
+    mean, std = X.mean(axis=0), X.std(axis=0) + 1e-9
+    Xs = ((X - mean) / std).astype(np.float32)
+
+    inputs = Input(shape=(X.shape[1],))
+    h = Dense(hidden[0], activation='relu', name='d1')(inputs)
+    h = Dense(hidden[1], activation='relu', name='d2')(h)
+    core = Dense(1, activation='sigmoid', name='core_output')(h)
+    freq = Dense(3, activation='softmax', name='freq_output')(h)
+    student = Model(inputs, [core, freq])
+    student.compile(optimizer='adam',
+                    loss={'core_output': 'binary_crossentropy', 'freq_output': 'categorical_crossentropy'},
+                    loss_weights={'core_output': 1.0, 'freq_output': 0.5})
+    student.fit(Xs, {'core_output': p_core.astype(np.float32), 'freq_output': p_freq.astype(np.float32)},
+                epochs=epochs, batch_size=batch_size, verbose=0)
+
+    w1, b1 = student.get_layer('d1').get_weights()
+    w2, b2 = student.get_layer('d2').get_weights()
+    w_core, b_core = student.get_layer('core_output').get_weights()
+    w_freq, b_freq = student.get_layer('freq_output').get_weights()
+    # (x - mean) / std @ W1 + b1  ==  x @ (W1 / std) + (b1 - (mean / std) @ W1)
+    return {
+        'w1': (w1 / std[:, None]).astype(np.float32), 'b1': (b1 - (mean / std) @ w1).astype(np.float32),
+        'w2': w2, 'b2': b2, 'w_core': w_core, 'b_core': b_core, 'w_freq': w_freq, 'b_freq': b_freq,
+    }
+
+
+# --- DEĞERLENDİRME ---
+def latency_us(model, X, batch):
+    """predict_on_batch başına median süre (µs), benchmark_suite.measure ile."""
+    x = X[:batch] if len(X) >= batch else np.resize(X, (batch, X.shape[1]))
+    return measure(lambda: model.predict_on_batch(x))['median_us']
+
+
+def evaluate(paths, X, y_core, y_freq, batch_sizes=BATCH_SIZES):
+    """Kural etiketlerine göre doğruluk, fp32 ile karar uyumu, batch gecikmesi ve boyut."""
+    reference = None
+    rows = []
+    for variant, path in paths.items():
+        model = load_numpy_model(path)
+        p_core, p_freq = model.predict_on_batch(X)
+        core, freq = p_core[:, 0] > 0.5, np.argmax(p_freq, axis=1)
+        if reference is None:
+            reference = (core, freq)
+        with np.load(path) as w:
+            stored = sum(w[k].nbytes for k in w.files)
+        rows.append({
+            'variant': variant,
+            'params': sum(getattr(model, k).size for k in ('w1', 'b1', 'w2', 'b2', 'w_heads', 'b_heads')),
+            'weight_bytes': stored,
+            'file_bytes': os.path.getsize(path),
+            'core_acc': float(np.mean(core == y_core)),
+            'freq_acc': float(np.mean(freq == y_freq)),
+            'agree_fp32': float(np.mean((core == reference[0]) & (freq == reference[1]))),
+            'latency_us': {str(b): latency_us(model, X, b) for b in batch_sizes},
+        })
+    return rows
+
+
+def print_report(rows, n_rows, source):
+    print(f"Evaluation on {n_rows} rule-labeled rows of {source}:")
+    lat_head = ''.join(f"{'b=' + str(b) + ' µs':>11s}" for b in rows[0]['latency_us'])
+    print(f"  {'variant':14s} {'params':>7s} {'weights':>9s} {'file':>9s} {'core acc':>9s} {'freq acc':>9s} {'=fp32':>8s}{lat_head}")
+    for r in rows:
+        lat = ''.join(f"{v:11.1f}" for v in r['latency_us'].values())
+        print(f"  {r['variant']:14s} {r['params']:7d} {r['weight_bytes'] / 1024:7.1f}KB {r['file_bytes'] / 1024:7.1f}KB "
+              f"{r['core_acc'] * 100:8.2f}% {r['freq_acc'] * 100:8.2f}% {r['agree_fp32'] * 100:7.2f}%{lat}")
+
+
+def split_holdout(n, fraction=HOLDOUT, seed=SPLIT_SEED):
+    """(eğitim, değerlendirme) satır indeksleri; aynı n ve seed ile her çalıştırmada aynı bölünme."""
+    order = np.random.default_rng(seed).permutation(n)
+    n_eval = max(1, int(round(n * fraction)))
+    return np.sort(order[n_eval:]), np.sort(order[:n_eval])
+
+
+def load_labeled(data_path):
+    import pandas as pd
+    df = pd.read_csv(data_path)
+    X = df[[c for c in df.columns if c not in TARGETS]].to_numpy(dtype=np.float64)
+    return X, df['target_core'].to_numpy(), df['target_freq'].to_numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantized / distilled variants of the scheduler network and an evaluation harness.")
+    parser.add_argument('--temporal', action='store_true', help="use the window-feature model (advanced_temporal_weights.npz)")
+    parser.add_argument('--base', default=None, help="fp32 folded weights (export_numpy_model.py output)")
+    parser.add_argument('--data', default=DATA_PATH, help="rule-labeled CSV (generating-cpu-data.py) for distillation")
+    parser.add_argument('--eval-data', default=None, metavar='CSV',
+                        help="separate rule-labeled CSV for evaluation (default: hold out part of --data)")
+    parser.add_argument('--holdout', type=float, default=HOLDOUT,
+                        help="share of --data rows held out for evaluation when --eval-data is not given")
+    parser.add_argument('--variants', default='fp16,int8', help="quantized variants to export: fp16, int8")
+    parser.add_argument('--distill', default=','.join(DISTILL_SIZES), help="student sizes H1xH2, '' to skip")
+    parser.add_argument('--distill-samples', type=int, default=DISTILL_SAMPLES)
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--eval-only', action='store_true', help="evaluate existing variant files without exporting")
+    parser.add_argument('--out', default=None, metavar='PATH', help="write the evaluation as JSON")
+    args = parser.parse_args()
+    base = args.base or (TEMPORAL_WEIGHTS_PATH if args.temporal else WEIGHTS_PATH)
+
+    X, y_core, y_freq = load_labeled(args.data)
+    if args.eval_data:
+        X_eval, y_core, y_freq = load_labeled(args.eval_data)
+        source = f"'{args.eval_data}'"
+    else:
+        # Öğrenciler değerlendirme satırlarını görmemeli: aksi halde doğruluk eğitim kümesi doğruluğudur
+        if not 0 < args.holdout < 1:
+            parser.error("--holdout must be between 0 and 1 (or pass --eval-data)")
+        train, test = split_holdout(len(X), args.holdout)
+        X_eval, y_core, y_freq = X[test], y_core[test], y_freq[test]
+        X = X[train]
+        source = f"'{args.data}' held out from distillation ({args.holdout:.0%})"
+    with np.load(base) as w:
+        fp32 = {name: w[name] for name in WEIGHT_NAMES}
+
+    variants = [v for v in args.variants.split(',') if v]
+    variants += [f'distill-{size}' for size in args.distill.split(',') if size]
+    if not args.eval_only:
+        teacher = load_numpy_model(base)
+        for variant in variants:
+            if variant == 'fp16':
+                weights = quantize_fp16(fp32)
+            elif variant == 'int8':
+                weights = quantize_int8(fp32)
+            elif variant.startswith('distill-'):
+                hidden = [int(h) for h in variant[len('distill-'):].split('x')]
+                print(f"Distilling {variant} from '{base}'...")
+                weights = distill(teacher, distill_inputs(X, args.distill_samples), hidden, epochs=args.epochs)  # yalnızca eğitim satırları
+            else:
+                parser.error(f"unknown variant: {variant}")
+            np.savez(variant_path(variant, base), **weights)
+            print(f"  {variant:14s} -> '{variant_path(variant, base)}'")
+
+    paths = {'fp32': base}
+    paths.update({v: variant_path(v, base) for v in variants if os.path.exists(variant_path(v, base))})
+    rows = evaluate(paths, X_eval, y_core, y_freq)
+    print_report(rows, len(X_eval), source)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'data': args.data, 'eval_data': args.eval_data, 'holdout': None if args.eval_data else args.holdout,
+                       'rows': len(X_eval), 'variants': rows}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import os
+import time
+import numpy as np
+
+from numpy_model import WEIGHTS_PATH, load_numpy_model, variant_path
+from power_model import DEFAULT_MODEL, STD_LOAD_THRESHOLD, EnergyMeter, PowerModel
+from telemetry import Telemetry, build_features
+from temporal import TEMPORAL_MODEL_PATH, TEMPORAL_SCALER_PATH, TEMPORAL_WEIGHTS_PATH, steady_state
+
+# --- AYARLAR ---
+MODEL_PATH = 'advanced_scheduler_model.h5'
+SCALER_PATH = 'advanced_scaler.pkl'
+
+
+# --- MODEL YÜKLEME ---
+def load_policy_model(temporal=False, variant='fp32', cache=True):
+    """
+    (model, scaler) döndürür. Katlanmış NumPy ağırlıkları varsa TensorFlow hiç
+    yüklenmez (scaler=None); yoksa Keras modeline ve scaler'a düşülür.
+    temporal=True: pencere özellikli model (7 girdi, SchedulerEngine.temporal ile).
+    variant: 'fp32' ya da quantize_model.py çıktısı ('fp16', 'int8', 'distill-16x8', ...);
+    fp32 dışındaki varyantların Keras karşılığı yoktur.
+    cache=True: Keras yoluna düşülürse katlanmış ağırlıklar bir sonraki açılış için yazılır.
+    """
+    weights, model_path, scaler_path = WEIGHTS_PATH, MODEL_PATH, SCALER_PATH
+    if temporal:
+        weights, model_path, scaler_path = TEMPORAL_WEIGHTS_PATH, TEMPORAL_MODEL_PATH, TEMPORAL_SCALER_PATH
+    if variant not in (None, 'fp32'):
+        weights = variant_path(variant, weights)
+        if not os.path.exists(weights):
+            raise FileNotFoundError(f"model variant '{variant}' not found: {weights} (run quantize_model.py)")
+    if os.path.exists(weights):
+        return load_numpy_model(weights), None
+    import tensorflow as tf
+    import joblib
+    model, scaler = tf.keras.models.load_model(model_path), joblib.load(scaler_path)
+    if cache:
+        cache_folded_weights(model, scaler, weights)
+    return model, scaler
+
+
+def cache_folded_weights(model, scaler, weights):
+    """Keras yolu bir kez yüklendiğinde katlanmış .npz yazılır; sonraki açılışlar TensorFlow'suz."""
+    from export_numpy_model import fold_weights
+    try:
+        np.savez(weights, **fold_weights(model, scaler))
+        print(f"Folded weights cached to '{weights}'; next start skips TensorFlow.")
+    except (ValueError, OSError) as e:
+        # Katlanamayan mimari (farklı katman adları) ya da yazılamayan dizin: Keras ile devam
+        print(f"Weights not cached: {e}")
+
+
+# --- ÖZELLİK / GÜÇ HESABI (VEKTÖREL) ---
+def estimate_power(cpu_load, is_p_core, freq_idx, model=DEFAULT_MODEL):
+    """Çekirdek başına AI / standart OS güç tahmini (Watt) ve frekans (GHz); tablolar power_model.PowerModel'de."""
+    return model.estimate(cpu_load, is_p_core, freq_idx)
+
+
+class StandardOSPolicy:
+    """
+    estimate_power'daki 'standart OS' varsayımı: yük > %40 ise P çekirdek, en
+    yüksek frekans. Model arka planda yüklenirken kullanılır (tasarruf = %0).
+    """
+
+    def decide(self, features):
+        n = len(features)
+        return features[:, 0] > STD_LOAD_THRESHOLD, np.full(n, 2)
+
+
+# --- ZAMANLAYICI ÇEKİRDEĞİ (GUI'DEN BAĞIMSIZ) ---
+class SchedulerEngine:
+    """
+    Örnekleme -> özellik -> çıkarım -> güç hesabı döngüsünün tek bir adımı.
+
+    Qt'ye bağımlı değildir; hem DataWorker (GUI) hem de scheduler_daemon.py
+    (headless) aynı motoru kullanır.
+    """
+
+    def __init__(self, model, scaler=None, policy=None, telemetry=None, tasks=None):
+        self.model = model
+        self.scaler = scaler
+        self.policy = policy  # DecisionTable / LRUDecisionCache (opsiyonel)
+        # Varsayılan: yalnızca sentetik ipc/cache_miss/temp formülleri
+        self.telemetry = telemetry if telemetry is not None else Telemetry()
+        self.tasks = tasks  # ProcessSampler (opsiyonel, süreç başına mod)
+        self.recorder = None  # workload_trace.TraceWriter (opsiyonel)
+        self.metrics = None  # metrics.SchedulerMetrics (opsiyonel)
+        self.temporal = None  # temporal.TemporalState (opsiyonel, pencere özellikli model)
+        self.power = PowerModel()  # power_model.load_power_model ile kalibre tablolar bağlanabilir
+        self.energy = EnergyMeter()  # oturum boyunca çekirdek / politika başına joule
+
+    def predict_batch(self, features):
+        if self.policy is not None:
+            return self.policy.decide(features)
+        return self.predict_exact(features)
+
+    def predict_exact(self, features):
+        """Tek ölçekleme + tek ileri geçiş; çekirdek sayısından bağımsız tek çağrı."""
+        # NumPy motorunda scaler ağırlıklara katlanmıştır (scaler=None)
+        scaled = self.scaler.transform(features) if self.scaler is not None else features
+        p_core, p_freq = self.model.predict_on_batch(scaled)
+        is_p_core = np.asarray(p_core)[:, 0] > 0.5
+        freq_idx = np.argmax(np.asarray(p_freq), axis=1)
+        return is_p_core, freq_idx
+
+    def task_features(self, records, cpu_features, ram_percent):
+        """
+        Süreç başına özellikler: cpu_load sürecin kendi CPU zamanı farkından;
+        temp (ve donanım sayaçları varsa ipc/cache_miss) sürecin son çalıştığı CPU'dan.
+        """
+        load = np.minimum([r['load'] for r in records], 100.0)
+        features = build_features(load, ram_percent)
+        cpus = np.minimum([r['cpu'] for r in records], len(cpu_features) - 1)
+        features[:, 3] = cpu_features[cpus, 3]
+        if self.telemetry.perf is not None or self.telemetry.replay is not None:
+            features[:, 1:3] = cpu_features[cpus, 1:3]
+        return features
+
+    def sample(self, interval=None):
+        """interval=None: son çağrıdan bu yana ortalama (bloklamaz)."""
+        return self.telemetry.sample(interval)
+
+    def step(self, cpu_percents, ram):
+        metrics = self.metrics
+        # Adım başında okunur: model adım ortasında bağlanırsa paket yine ısınma sayılır
+        warming_up = self.model is None
+        if metrics is not None:
+            t = t0 = metrics.now()
+        features = self.telemetry.features(cpu_percents, ram.percent)
+        if self.recorder is not None:
+            self.recorder.append(time.time(), features, ram.percent)
+        records = self.tasks.sample() if self.tasks is not None else []
+        if metrics is not None:
+            t = metrics.lap('features', t)
+        # Pencere özellikleri çekirdek başına O(1) güncellenir; çıkarım yine tek toplu çağrı
+        model_input = self.temporal.update(features) if self.temporal is not None else features
+        if records:
+            # Çekirdekler ve süreçler tek bir toplu çıkarım çağrısında
+            n = len(features)
+            task_input = self.task_features(records, features, ram.percent)
+            if self.temporal is not None:
+                task_input = steady_state(task_input)
+            is_p_all, freq_all = self.predict_batch(np.vstack((model_input, task_input)))
+            is_p_core, freq_idx = is_p_all[:n], freq_all[:n]
+            is_p_task, freq_task = is_p_all[n:], freq_all[n:]
+        else:
+            is_p_core, freq_idx = self.predict_batch(model_input)
+            is_p_task, freq_task = np.zeros(0, dtype=bool), np.zeros(0, dtype=int)
+        if metrics is not None:
+            t = metrics.lap('inference', t)
+        p_ai, p_std, frequency = self.power.estimate(features[:, 0], is_p_core, freq_idx)
+        self.energy.add(p_ai, p_std)
+        core_energy = self.energy.ai.tolist()
+
+        core_data = [
+            {
+                'load': float(features[i, 0]),
+                'temp': float(features[i, 3]),
+                'is_p': bool(is_p_core[i]),
+                'freq_val': float(frequency[i]),
+                'freq_idx': int(freq_idx[i]),
+                'ipc': float(features[i, 1]),
+                'energy_j': core_energy[i]
+            }
+            for i in range(len(features))
+        ]
+        cur_freq = self.telemetry.last_freq
+        if cur_freq is not None:
+            # Donanımdan okunan gerçek frekans (GHz), modelin hedef frekansından ayrı
+            for core, freq in zip(core_data, cur_freq.tolist()):
+                core['cur_freq'] = None if np.isnan(freq) else freq
+
+        packet = {
+            'timestamp': time.time(),
+            'cores': core_data,
+            'ram_percent': ram.percent,
+            'ram_used': ram.used / (1024**3),
+            'ram_total': ram.total / (1024**3),
+            'power_ai': float(p_ai.sum()),
+            'power_std': float(p_std.sum()),
+            'energy_ai_j': self.energy.total_ai,
+            'energy_std_j': self.energy.total_std
+        }
+        if warming_up:
+            # Model henüz yüklenmedi: kararlar StandardOSPolicy'den
+            packet['warming_up'] = True
+        if self.tasks is not None:
+            packet['tasks'] = [
+                dict(record, is_p=is_p, freq_idx=idx)
+                for record, is_p, idx in zip(records, is_p_task.tolist(), freq_task.tolist())
+            ]
+            packet['task_scan'] = self.tasks.last_scan
+        if metrics is not None:
+            metrics.lap('power', t)
+            metrics.lap('step', t0)
+            metrics.count_decisions(int(is_p_core.sum()), len(is_p_core), np.bincount(freq_idx, minlength=3))
+        return packet
+
+    def tick(self, interval=None):
+        return self.step(*self.sample(interval))
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+from actuation import Actuator, parse_cpu_list
+from decision_cache import TABLE_PATH, DecisionTable, LRUDecisionCache
+from fleet import BATCH_SIZE, FleetAgent
+from metrics import SchedulerMetrics, start_exporters
+from pipeline import DEFAULT_RATE_HZ, SchedulerPipeline
+from power_model import POWER_MODEL_PATH, load_power_model
+from process_sampler import BUDGET_MS, ProcessSampler
+from scheduler_core import SchedulerEngine, load_policy_model
+from telemetry import SYSFS_ROOT, Telemetry
+from temporal import TemporalState
+from workload_trace import TraceWriter
+
+
+# --- YAYINCI (JSONL SOKET) ---
+class Broadcaster:
+    """
+    Her tick'in JSON satırını bağlı tüm abonelere (ör. main_dashboard.py --attach) gönderir.
+
+    Adres 'HOST:PORT' ya da 'unix:/yol/soket' biçimindedir. Yavaş ya da
+    kopmuş aboneler düşürülür; zamanlayıcı döngüsü hiçbir aboneyi beklemez.
+    """
+
+    def __init__(self, address):
+        if address.startswith('unix:'):
+            self.path = address[len('unix:'):]
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server.bind(self.path)
+        else:
+            self.path = None
+            host, port = address.rsplit(':', 1)
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind((host, int(port)))
+        self.server.listen()
+        self.clients = []
+        self.lock = threading.Lock()
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+
+    def accept_loop(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            conn.settimeout(0.05)
+            with self.lock:
+                self.clients.append(conn)
+
+    def publish(self, data):
+        with self.lock:
+            for conn in list(self.clients):
+                try:
+                    conn.sendall(data)
+                except OSError:
+                    conn.close()
+                    self.clients.remove(conn)
+
+    def close(self):
+        self.server.close()
+        with self.lock:
+            for conn in self.clients:
+                conn.close()
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def build_engine(decision_mode, telemetry_mode='auto', tasks=0, task_budget_ms=BUDGET_MS, temporal=False, variant='fp32',
+                 sysfs_root=SYSFS_ROOT):
+    if temporal and decision_mode != 'exact':
+        # Tablo / LRU anahtarları 4 anlık özellik üzerinedir
+        raise ValueError("the temporal policy only supports --decision-mode exact")
+    model, scaler = load_policy_model(temporal, variant)
+    sampler = ProcessSampler(tasks, task_budget_ms) if tasks else None
+    engine = SchedulerEngine(model, scaler, telemetry=Telemetry.create(telemetry_mode, sysfs_root), tasks=sampler)
+    if temporal:
+        engine.temporal = TemporalState()
+    if decision_mode == 'table':
+        engine.policy = DecisionTable.load(TABLE_PATH)
+    elif decision_mode == 'cache':
+        engine.policy = LRUDecisionCache(engine.predict_exact)
+    return engine
+
+
+def run(engine, args):
+    sinks = []
+    if args.out == '-':
+        sinks.append(sys.stdout)
+    elif args.out:
+        sinks.append(open(args.out, 'a'))
+    broadcaster = Broadcaster(args.listen) if args.listen else None
+    if args.metrics_port or args.metrics_json:
+        engine.metrics = SchedulerMetrics()
+
+    pipeline = SchedulerPipeline(engine, rate_hz=args.rate)
+    if args.record_trace:
+        engine.recorder = TraceWriter(args.record_trace, rate_hz=args.rate)
+
+    def publish(packet):
+        line = json.dumps(packet) + '\n'
+        for sink in sinks:
+            sink.write(line)
+            sink.flush()
+        if broadcaster is not None:
+            broadcaster.publish(line.encode())
+        if args.ticks and pipeline.published + 1 >= args.ticks:
+            pipeline.stop_event.set()
+
+    pipeline.subscribe(publish)
+    actuator = None
+    if args.actuate != 'off':
+        actuator = Actuator(
+            p_cpus=parse_cpu_list(args.p_cpus) if args.p_cpus else None,
+            e_cpus=parse_cpu_list(args.e_cpus) if args.e_cpus else None,
+            sysfs_root=args.sysfs_root,
+            dry_run=args.actuate == 'dry-run',
+            governor=args.governor,
+        )
+        pipeline.subscribe(actuator.on_packet)
+    exporters = start_exporters(engine.metrics, args.metrics_port, args.metrics_json) if engine.metrics else []
+    agent = None
+    if args.fleet:
+        agent = FleetAgent(args.fleet, host=args.fleet_host, batch=args.fleet_batch)
+        pipeline.subscribe(agent.on_packet)
+    # SIGTERM döngüyü durdurur; ana iş parçacığı aşağıdaki finally'ye düşer ve
+    # actuator iş parçacıkları bittikten sonra restore edilir (yarışan yazım olmaz)
+    signal.signal(signal.SIGTERM, lambda *_: pipeline.stop_event.set())
+
+    cpu0, wall0 = time.process_time(), time.monotonic()
+    pipeline.start()
+    try:
+        pipeline.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            pipeline.stop()
+        finally:
+            if actuator is not None:
+                actuator.restore()
+        for exporter in exporters:
+            exporter.close()
+        if agent is not None:
+            agent.close()
+        if broadcaster is not None:
+            broadcaster.close()
+        for sink in sinks:
+            if sink is not sys.stdout:
+                sink.close()
+        if engine.recorder is not None:
+            engine.recorder.close()
+
+    # Tüm süreç (örnekleme + çıkarım + yayın) için CPU maliyeti
+    stats = pipeline.stats()
+    cpu_s, wall_s = time.process_time() - cpu0, time.monotonic() - wall0
+    stats['process_cpu_ms_per_tick'] = cpu_s * 1000 / max(stats['ticks'], 1)
+    stats['cpu_percent_of_one_core'] = cpu_s / wall_s * 100 if wall_s > 0 else 0.0
+    report = {'tick_stats': stats, 'energy': engine.energy.snapshot()}
+    if actuator is not None:
+        report['actuation'] = actuator.stats()
+    if agent is not None:
+        report['fleet'] = agent.stats()
+    if engine.metrics is not None:
+        report['stages'] = engine.metrics.snapshot()['stages']
+    print(json.dumps(report), file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless AI-OS scheduler loop (no GUI).")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_HZ, help="sampling ticks per second (e.g. 10-100)")
+    parser.add_argument('--ticks', type=int, default=0, help="stop after N ticks (0: run until SIGINT/SIGTERM)")
+    parser.add_argument('--out', default='-', help="JSONL output file, '-' for stdout, '' to disable")
+    parser.add_argument('--listen', default=None, metavar='HOST:PORT|unix:PATH',
+                        help="serve JSONL decisions to subscribers (e.g. main_dashboard.py --attach)")
+    parser.add_argument('--decision-mode', choices=['exact', 'cache', 'table'], default='exact')
+    parser.add_argument('--telemetry', default='auto', metavar='auto|synthetic|replay:PATH',
+                        help="source of ipc/cache_miss/temp (hardware counters fall back to synthetic formulas)")
+    parser.add_argument('--actuate', choices=['off', 'dry-run', 'apply'], default='off',
+                        help="apply decisions: sched_setaffinity for hot processes + cpufreq scaling_max_freq")
+    parser.add_argument('--p-cpus', default=None, metavar='LIST', help="P-core CPU list, e.g. 0-7 (default: detected)")
+    parser.add_argument('--e-cpus', default=None, metavar='LIST', help="E-core CPU list, e.g. 8-15 (default: detected)")
+    parser.add_argument('--sysfs-root', default='/sys', help="sysfs root for telemetry reads and cpufreq writes (a fake tree works without root)")
+    parser.add_argument('--governor', default=None, help="cpufreq governor to set once at startup (e.g. schedutil)")
+    parser.add_argument('--record-trace', default=None, metavar='DIR',
+                        help="record per-tick telemetry to a binary trace (replay: workload_trace.py replay DIR)")
+    parser.add_argument('--tasks', type=int, default=0, metavar='N',
+                        help="per-process mode: also classify the top N processes by CPU (0: per-CPU only)")
+    parser.add_argument('--task-budget-ms', type=float, default=BUDGET_MS,
+                        help="per-tick time budget for reading process stats")
+    parser.add_argument('--metrics-port', type=int, default=0, metavar='PORT',
+                        help="serve per-stage histograms on http://127.0.0.1:PORT/metrics (Prometheus) and /metrics.json")
+    parser.add_argument('--metrics-json', default=None, metavar='PATH',
+                        help="dump the metrics snapshot to PATH every few seconds")
+    parser.add_argument('--fleet', default=None, metavar='HOST:PORT|udp:HOST:PORT',
+                        help="stream packets to a fleet aggregator (fleet.py aggregate) in binary batches")
+    parser.add_argument('--fleet-host', default=None, help="host name reported to the aggregator (default: hostname)")
+    parser.add_argument('--fleet-batch', type=int, default=BATCH_SIZE, help="ticks per fleet frame")
+    parser.add_argument('--temporal', action='store_true',
+                        help="window-feature policy (advanced_temporal_weights.npz) with per-core EWMA state")
+    parser.add_argument('--model-variant', default='fp32', metavar='VARIANT',
+                        help="weights variant from quantize_model.py: fp32, fp16, int8, distill-HxW")
+    parser.add_argument('--power-model', default=POWER_MODEL_PATH, metavar='PATH',
+                        help="calibrated power tables from power_model.py calibrate (default tables if missing)")
+    args = parser.parse_args()
+
+    try:
+        engine = build_engine(args.decision_mode, args.telemetry, args.tasks, args.task_budget_ms, args.temporal,
+                              args.model_variant, args.sysfs_root)
+        engine.power = load_power_model(args.power_model)
+    except (ValueError, KeyError, FileNotFoundError) as e:
+        parser.error(str(e))
+    run(engine, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+import argparse
+import collections
+import ctypes
+import glob
+import json
+import os
+import platform
+import struct
+import time
+import psutil
+import numpy as np
+
+# --- AYARLAR ---
+SYSFS_ROOT = '/sys'
+
+# Replay dosyası / uzak kaynaklar için psutil.virtual_memory() yerine geçen kayıt
+RamInfo = collections.namedtuple('RamInfo', ['percent', 'used', 'total'])
+
+
+# --- SENTETİK ÖZELLİKLER (YEDEK) ---
+def build_features(cpu_percents, ram_percent):
+    """Tüm çekirdekler için (n_cores, 4) özellik matrisi: cpu_load, ipc, cache_miss, temp."""
+    cpu_load = np.asarray(cpu_percents, dtype=np.float64)
+    ipc = 0.5 + (cpu_load / 100.0) * 2.5
+    cache_miss = (ram_percent * 0.5) + (cpu_load * 0.3)
+    temp = 35 + (cpu_load * 0.55)
+    return np.column_stack((cpu_load, ipc, cache_miss, temp))
+
+
+def read_sysfs_int(fd):
+    """Açık tutulan bir sysfs dosyasını baştan okur (yeniden open() yok)."""
+    try:
+        return int(os.pread(fd, 32, 0))
+    except (OSError, ValueError):
+        return None
+
+
+def open_sysfs(paths):
+    fds = []
+    for path in paths:
+        try:
+            fds.append(os.open(path, os.O_RDONLY))
+        except OSError:
+            fds.append(None)
+    return fds
+
+
+def close_fds(fds):
+    for fd in fds:
+        if fd is not None:
+            os.close(fd)
+
+
+# --- CPU KULLANIMI (/proc/stat) ---
+class ProcStatSampler:
+    """
+    /proc/stat jiffy sayaçlarından CPU başına kullanım; bloklamaz.
+
+    read() ham (busy, total) sayaçlarını döndürür; iki anlık görüntü arasındaki
+    fark kullanım yüzdesini verir. Bu sayede ara örnekler atlansa bile
+    (birleştirme) tüketilen aralığın tamamı doğru ölçülür.
+    """
+
+    available = True
+
+    def __init__(self, path='/proc/stat'):
+        self.fd = os.open(path, os.O_RDONLY)
+        # cpuN satırları dosyanın başında; uzun 'intr' satırının tamamını okumaya gerek yok
+        self.read_size = psutil.cpu_count(logical=True) * 160 + 4096
+
+    def read(self):
+        busy, total = [], []
+        for line in os.pread(self.fd, self.read_size, 0).split(b'\n')[1:]:
+            if not line.startswith(b'cpu'):
+                break
+            # user nice system idle iowait irq softirq steal
+            fields = [int(x) for x in line.split()[1:9]]
+            t = sum(fields)
+            total.append(t)
+            busy.append(t - fields[3] - fields[4])
+        return np.array(busy, dtype=np.float64), np.array(total, dtype=np.float64)
+
+    @staticmethod
+    def percent(prev, cur):
+        d_busy = cur[0] - prev[0]
+        d_total = cur[1] - prev[1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(d_total > 0, np.round(d_busy / d_total * 100.0, 1), 0.0)
+
+    def close(self):
+        os.close(self.fd)
+
+
+# --- SICAKLIK ---
+class ThermalCollector:
+    """
+    Mantıksal CPU başına sıcaklık (°C).
+
+    Öncelik: hwmon coretemp/k10temp 'Core N' etiketleri (topology/core_id ile
+    eşlenir) -> paket sıcaklığı -> /sys/class/thermal bölgelerinin en sıcağı ->
+    psutil.sensors_temperatures(). Dosya tanımlayıcıları bir kez açılır.
+    """
+
+    def __init__(self, n_cpus, sysfs_root=SYSFS_ROOT):
+        self.n_cpus = n_cpus
+        self.fds = []
+        self.cpu_to_fd = None  # her CPU için self.fds indeksi
+        self.use_psutil = False
+
+        core_files, package_file = self.discover_hwmon(sysfs_root)
+        if core_files or package_file:
+            paths = []
+            self.cpu_to_fd = []
+            for cpu in range(n_cpus):
+                core_id = self.core_id(sysfs_root, cpu)
+                path = core_files.get(core_id, package_file)
+                if path is None:
+                    # 'Core N' eşleşmedi ve paket sensörü yok: read() sonuna eklenen NaN yuvası
+                    self.cpu_to_fd.append(-1)
+                    continue
+                if path not in paths:
+                    paths.append(path)
+                self.cpu_to_fd.append(paths.index(path))
+            self.fds = open_sysfs(paths)
+        else:
+            zones = sorted(glob.glob(os.path.join(sysfs_root, 'class/thermal/thermal_zone*/temp')))
+            self.fds = open_sysfs(zones)
+            self.use_psutil = not zones and bool(getattr(psutil, 'sensors_temperatures', dict)())
+        self.cpu_to_fd = np.array(self.cpu_to_fd) if self.cpu_to_fd is not None else None
+
+    @staticmethod
+    def discover_hwmon(sysfs_root):
+        core_files, package_file = {}, None
+        for hwmon in sorted(glob.glob(os.path.join(sysfs_root, 'class/hwmon/hwmon*'))):
+            try:
+                with open(os.path.join(hwmon, 'name')) as f:
+                    if f.read().strip() not in ('coretemp', 'k10temp', 'zenpower'):
+                        continue
+            except OSError:
+                continue
+            for label_path in glob.glob(os.path.join(hwmon, 'temp*_label')):
+                try:
+                    with open(label_path) as f:
+                        label = f.read().strip()
+                except OSError:
+                    continue
+                input_path = label_path.replace('_label', '_input')
+                if label.startswith('Core '):
+                    core_files[int(label.split()[1])] = input_path
+                elif label.startswith(('Package id', 'Tctl', 'Tdie')) and package_file is None:
+                    package_file = input_path
+        return core_files, package_file
+
+    @staticmethod
+    def core_id(sysfs_root, cpu):
+        try:
+            with open(os.path.join(sysfs_root, f'devices/system/cpu/cpu{cpu}/topology/core_id')) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    @property
+    def available(self):
+        return any(fd is not None for fd in self.fds) or self.use_psutil
+
+    def read(self):
+        if self.use_psutil:
+            readings = [t.current for entries in psutil.sensors_temperatures().values() for t in entries]
+            return np.full(self.n_cpus, max(readings)) if readings else None
+        values = [read_sysfs_int(fd) if fd is not None else None for fd in self.fds]
+        if all(v is None for v in values):
+            return None
+        milli = np.array([np.nan if v is None else v for v in values], dtype=np.float64) / 1000.0
+        if self.cpu_to_fd is not None:
+            # -1: sensörü olmayan CPU'lar NaN okur (Telemetry.features sentetik değere düşer)
+            return np.append(milli, np.nan)[self.cpu_to_fd]
+        return np.full(self.n_cpus, np.nanmax(milli))
+
+    def close(self):
+        close_fds(self.fds)
+
+
+# --- FREKANS ---
+class CpufreqCollector:
+    """Mantıksal CPU başına anlık frekans (GHz), cpufreq/scaling_cur_freq üzerinden."""
+
+    def __init__(self, n_cpus, sysfs_root=SYSFS_ROOT):
+        self.fds = open_sysfs(
+            os.path.join(sysfs_root, f'devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq')
+            for cpu in range(n_cpus)
+        )
+
+    @property
+    def available(self):
+        return any(fd is not None for fd in self.fds)
+
+    def read(self):
+        khz = [read_sysfs_int(fd) if fd is not None else None for fd in self.fds]
+        return np.array([np.nan if v is None else v / 1e6 for v in khz], dtype=np.float64)
+
+    def close(self):
+        close_fds(self.fds)
+
+
+# --- PERF SAYAÇLARI (IPC / CACHE MISS) ---
+PERF_TYPE_HARDWARE = 0
+PERF_COUNT_HW_CPU_CYCLES = 0
+PERF_COUNT_HW_INSTRUCTIONS = 1
+PERF_COUNT_HW_CACHE_REFERENCES = 2
+PERF_COUNT_HW_CACHE_MISSES = 3
+PERF_FORMAT_TOTAL_TIME_ENABLED = 1 << 0
+PERF_FORMAT_TOTAL_TIME_RUNNING = 1 << 1
+PERF_FLAG_FD_CLOEXEC = 1 << 3
+PERF_ATTR_SIZE = 128
+PERF_EVENT_OPEN_NR = {'x86_64': 298, 'aarch64': 241, 'i686': 336, 'armv7l': 364}
+
+
+class PerfCollector:
+    """
+    Linux perf olaylarından CPU başına IPC ve cache-miss oranı (%).
+
+    Her CPU için 4 sayaç (cycles, instructions, cache-references, cache-misses)
+    bir kez açılır; her tick yalnızca 24 baytlık read() yapılır. Çoğullama
+    (multiplexing) durumunda değerler time_enabled/time_running ile ölçeklenir.
+    İzin yoksa (perf_event_paranoid > 0, CAP_PERFMON yok) OSError fırlatır.
+    """
+
+    EVENTS = (PERF_COUNT_HW_CPU_CYCLES, PERF_COUNT_HW_INSTRUCTIONS,
+              PERF_COUNT_HW_CACHE_REFERENCES, PERF_COUNT_HW_CACHE_MISSES)
+    available = True
+
+    def __init__(self, n_cpus):
+        nr = PERF_EVENT_OPEN_NR.get(platform.machine())
+        if nr is None:
+            raise OSError(f"perf_event_open not supported on {platform.machine()}")
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fds = []
+        try:
+            for cpu in range(n_cpus):
+                row = []
+                for event in self.EVENTS:
+                    attr = ctypes.create_string_buffer(PERF_ATTR_SIZE)
+                    # type, size, config, sample_period, sample_type, read_format, flags
+                    struct.pack_into('IIQQQQQ', attr, 0, PERF_TYPE_HARDWARE, PERF_ATTR_SIZE, event, 0, 0,
+                                     PERF_FORMAT_TOTAL_TIME_ENABLED | PERF_FORMAT_TOTAL_TIME_RUNNING, 0)
+                    fd = libc.syscall(nr, attr, -1, cpu, -1, PERF_FLAG_FD_CLOEXEC)
+                    if fd < 0:
+                        err = ctypes.get_errno()
+                        raise OSError(err, f"perf_event_open(cpu={cpu}): {os.strerror(err)}")
+                    row.append(fd)
+                self.fds.append(row)
+        except OSError:
+            self.close()
+            raise
+        self.last = self.read_counts()
+
+    def read_counts(self):
+        counts = np.empty((len(self.fds), len(self.EVENTS)), dtype=np.float64)
+        for i, row in enumerate(self.fds):
+            for j, fd in enumerate(row):
+                value, enabled, running = struct.unpack('QQQ', os.read(fd, 24))
+                counts[i, j] = value * (enabled / running) if running else 0.0
+        return counts
+
+    def read(self):
+        counts = self.read_counts()
+        delta = counts - self.last
+        self.last = counts
+        cycles, instructions, refs, misses = delta.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ipc = np.where(cycles > 0, instructions / cycles, np.nan)
+            miss = np.where(refs > 0, misses / refs * 100.0, np.nan)
+        return ipc, miss
+
+    def close(self):
+        for row in self.fds:
+            close_fds(row)
+        self.fds = []
+
+
+# --- REPLAY (perf izni olmadan test) ---
+class ReplayCollector:
+    """
+    JSONL replay dosyasından örnek okur (telemetry.py --record ile üretilir).
+
+    Her satır: {"cpu_percents": [...], "ram": [percent, used, total],
+    "ipc": [...]|null, "cache_miss": [...]|null, "temp": [...]|null, "freq": [...]|null}
+    Dosya sonunda başa sarar.
+    """
+
+    available = True
+
+    def __init__(self, path):
+        with open(path) as f:
+            self.records = [json.loads(line) for line in f if line.strip()]
+        if not self.records:
+            raise ValueError(f"Empty replay file: {path}")
+        self.index = 0
+        self.current = self.records[0]
+
+    def sample(self):
+        self.current = self.records[self.index]
+        self.index = (self.index + 1) % len(self.records)
+        return self.current['cpu_percents'], RamInfo(*self.current['ram'])
+
+    def column(self, name):
+        values = self.current.get(name)
+        return None if values is None else np.asarray(values, dtype=np.float64)
+
+    def close(self):
+        pass
+
+
+# --- BİRLEŞİK TELEMETRİ ---
+class Telemetry:
+    """
+    Özellik matrisini gerçek sinyallerle doldurur; bulunamayan ya da geçersiz
+    (NaN) her değer için scheduler_core.build_features sentetik formülleri kullanılır.
+    """
+
+    def __init__(self, thermal=None, cpufreq=None, perf=None, replay=None, procstat=None):
+        self.procstat = procstat
+        self.thermal = thermal
+        self.cpufreq = cpufreq
+        self.perf = perf
+        self.replay = replay
+        self.last_freq = None
+
+    @classmethod
+    def create(cls, mode='auto', sysfs_root=SYSFS_ROOT):
+        """mode: 'synthetic', 'auto' (mevcut donanım sayaçları) veya 'replay:DOSYA'."""
+        if mode == 'synthetic':
+            return cls()
+        if mode.startswith('replay:'):
+            return cls(replay=ReplayCollector(mode[len('replay:'):]))
+        n_cpus = psutil.cpu_count(logical=True)
+        thermal = ThermalCollector(n_cpus, sysfs_root)
+        cpufreq = CpufreqCollector(n_cpus, sysfs_root)
+        try:
+            perf = PerfCollector(n_cpus)
+        except OSError:
+            perf = None
+        try:
+            procstat = ProcStatSampler()
+        except OSError:
+            procstat = None
+        return cls(
+            thermal=thermal if thermal.available else None,
+            cpufreq=cpufreq if cpufreq.available else None,
+            perf=perf,
+            procstat=procstat,
+        )
+
+    def describe(self):
+        names = [name for name in ('procstat', 'thermal', 'cpufreq', 'perf', 'replay') if getattr(self, name) is not None]
+        return ', '.join(names) or 'synthetic'
+
+    def sample(self, interval=None):
+        if self.replay is not None:
+            return self.replay.sample()
+        return psutil.cpu_percent(interval=interval, percpu=True), psutil.virtual_memory()
+
+    def snapshot(self):
+        """
+        Bloklamayan ham örnek: (cpu sayaçları ya da yüzdeleri, ram).
+
+        cpu_percents(önceki, şimdiki) ile yüzdeye çevrilir. /proc/stat yoksa
+        psutil.cpu_percent(interval=None) kullanılır (son çağrıdan beri ortalama).
+        """
+        if self.replay is not None:
+            return self.replay.sample()
+        if self.procstat is not None:
+            return self.procstat.read(), psutil.virtual_memory()
+        return psutil.cpu_percent(interval=None, percpu=True), psutil.virtual_memory()
+
+    def cpu_percents(self, prev, snap):
+        if self.replay is None and self.procstat is not None:
+            return ProcStatSampler.percent(prev[0], snap[0])
+        return snap[0]
+
+    def features(self, cpu_percents, ram_percent):
+        features = build_features(cpu_percents, ram_percent)
+        columns = {}
+        if self.replay is not None:
+            columns = {1: self.replay.column('ipc'), 2: self.replay.column('cache_miss'), 3: self.replay.column('temp')}
+            self.last_freq = self.replay.column('freq')
+        else:
+            if self.perf is not None:
+                columns[1], columns[2] = self.perf.read()
+            if self.thermal is not None:
+                columns[3] = self.thermal.read()
+            if self.cpufreq is not None:
+                self.last_freq = self.cpufreq.read()
+        for col, values in columns.items():
+            if values is not None and len(values) == len(features):
+                features[:, col] = np.where(np.isnan(values), features[:, col], values)
+        return features
+
+    def close(self):
+        for collector in (self.procstat, self.thermal, self.cpufreq, self.perf, self.replay):
+            if collector is not None:
+                collector.close()
+
+
+# --- BENCHMARK / KAYIT ---
+def benchmark(telemetry, ticks):
+    """Toplayıcı başına tick örnekleme maliyeti (µs)."""
+    n_cpus = psutil.cpu_count(logical=True)
+    psutil.cpu_percent(interval=None, percpu=True)
+    stages = {
+        'psutil.cpu_percent': lambda: psutil.cpu_percent(interval=None, percpu=True),
+        'psutil.virtual_memory': psutil.virtual_memory,
+        'synthetic features': lambda: build_features(np.zeros(n_cpus), 0.0),
+    }
+    for name in ('procstat', 'thermal', 'cpufreq', 'perf'):
+        collector = getattr(telemetry, name)
+        if collector is not None:
+            stages[name] = collector.read
+    stages['Telemetry.features (total)'] = lambda: telemetry.features(np.zeros(n_cpus), 0.0)
+
+    print(f"Sampling cost per tick ({n_cpus} CPUs, {ticks} ticks, sources: {telemetry.describe()}):")
+    for name, fn in stages.items():
+        fn()
+        start = time.perf_counter()
+        for _ in range(ticks):
+            fn()
+        print(f"  {name:28s} {(time.perf_counter() - start) / ticks * 1e6:9.1f} µs")
+
+
+def record(telemetry, path, ticks, interval):
+    """Canlı telemetriyi ReplayCollector'ın okuyabileceği JSONL dosyasına kaydeder."""
+    def as_list(values):
+        return None if values is None else [None if np.isnan(v) else float(v) for v in values]
+
+    telemetry.sample(None)
+    with open(path, 'w') as f:
+        for _ in range(ticks):
+            time.sleep(interval)
+            cpu_percents, ram = telemetry.sample(None)
+            ipc, miss = telemetry.perf.read() if telemetry.perf is not None else (None, None)
+            temp = telemetry.thermal.read() if telemetry.thermal is not None else None
+            freq = telemetry.cpufreq.read() if telemetry.cpufreq is not None else None
+            f.write(json.dumps({
+                'cpu_percents': cpu_percents, 'ram': [ram.percent, ram.used, ram.total],
+                'ipc': as_list(ipc), 'cache_miss': as_list(miss), 'temp': as_list(temp), 'freq': as_list(freq),
+            }) + '\n')
+    print(f"Recorded {ticks} samples to '{path}'.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hardware telemetry collectors: benchmark and replay recording.")
+    parser.add_argument('--mode', default='auto', help="auto | synthetic | replay:PATH")
+    parser.add_argument('--sysfs-root', default=SYSFS_ROOT, help="alternate sysfs tree (e.g. a fake one for testing)")
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--record', default=None, metavar='PATH', help="record a replay file instead of benchmarking")
+    parser.add_argument('--interval', type=float, default=0.5, help="seconds between recorded samples")
+    args = parser.parse_args()
+
+    telemetry = Telemetry.create(args.mode, args.sysfs_root)
+    try:
+        if args.record:
+            record(telemetry, args.record, args.ticks, args.interval)
+        else:
+            benchmark(telemetry, args.ticks)
+    finally:
+        telemetry.close()
+
+
+if __name__ == "__main__":
+    main()
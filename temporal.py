@@ -0,0 +1,53 @@
+import numpy as np
+
+# --- AYARLAR ---
+TEMPORAL_WEIGHTS_PATH = 'advanced_temporal_weights.npz'
+TEMPORAL_MODEL_PATH = 'advanced_temporal_model.h5'
+TEMPORAL_SCALER_PATH = 'advanced_temporal_scaler.pkl'
+TEMPORAL_FEATURES = ['ewma_load', 'load_slope', 'temp_trend']
+WINDOW_TICKS = 8  # EWMA etkin pencere uzunluğu (tick); alpha = 2 / (W + 1)
+
+
+class TemporalState:
+    """
+    Çekirdek başına kayan pencere özellikleri, tick başına O(1) güncelleme.
+
+    Pencere yeniden kurulmaz; her özellik üstel ağırlıklı hareketli ortalamadır:
+      ewma_load  : yükün EWMA'sı
+      load_slope : tick başına yük farkının EWMA'sı (%/tick)
+      temp_trend : tick başına sıcaklık farkının EWMA'sı (°C/tick)
+    Aynı sınıf generating-cpu-data.py'de dizileri işlerken de kullanılır; eğitim
+    ve çalışma anı özellikleri birebir aynı formülden gelir. Birimler tick
+    başına olduğundan model, eğitildiği örnekleme hızında çalıştırılmalıdır.
+    """
+
+    def __init__(self, window=WINDOW_TICKS):
+        self.alpha = 2.0 / (window + 1)
+        self.prev_load = None
+
+    def reset(self, features):
+        load = np.array(features[:, 0], dtype=np.float64)
+        self.ewma = load.copy()
+        self.slope = np.zeros_like(load)
+        self.trend = np.zeros_like(load)
+        self.prev_load = load
+        self.prev_temp = np.array(features[:, 3], dtype=np.float64)
+
+    def update(self, features):
+        """(n, 4) anlık özellikler -> (n, 7) model girdisi; çekirdek sayısı değişirse durum sıfırlanır."""
+        if self.prev_load is None or len(features) != len(self.prev_load):
+            self.reset(features)
+        load, temp = features[:, 0], features[:, 3]
+        a = self.alpha
+        self.ewma += a * (load - self.ewma)
+        self.slope += a * ((load - self.prev_load) - self.slope)
+        self.trend += a * ((temp - self.prev_temp) - self.trend)
+        self.prev_load[:] = load
+        self.prev_temp[:] = temp
+        return np.column_stack((features, self.ewma, self.slope, self.trend))
+
+
+def steady_state(features):
+    """Geçmişi olmayan satırlar (ör. süreçler) için: ewma = anlık yük, eğimler sıfır."""
+    zeros = np.zeros(len(features))
+    return np.column_stack((features, features[:, 0], zeros, zeros))
@@ -1,3 +1,5 @@
+import argparse
+import os
 import pandas as pd
 import numpy as np
 import tensorflow as tf
@@ -8,62 +10,217 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import joblib
 
-# 1. Load Data
-df = pd.read_csv('advanced_os_data.csv')
-
-X = df[['cpu_load', 'ipc', 'cache_miss', 'temp']].values
-y_core = df['target_core'].values
-y_freq = df['target_freq'].values
-
-# One-hot encode frequency (0, 1, 2)
-y_freq_encoded = to_categorical(y_freq, num_classes=3)
-
-# 2. Preprocessing
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
-
-X_train, X_test, y_core_train, y_core_test, y_freq_train, y_freq_test = train_test_split(
-    X_scaled, y_core, y_freq_encoded, test_size=0.2, random_state=42
-)
-
-# 3. Build Advanced Model (Functional API)
-input_layer = Input(shape=(4,))
-
-# Shared Layers (Feature Extraction)
-x = Dense(64, activation='relu')(input_layer)
-x = BatchNormalization()(x)
-x = Dropout(0.2)(x)
-x = Dense(32, activation='relu')(x)
-
-# Head 1: Core Prediction (Binary Classification)
-core_output = Dense(1, activation='sigmoid', name='core_output')(x)
-
-# Head 2: Frequency Prediction (Multi-class Classification)
-freq_output = Dense(3, activation='softmax', name='freq_output')(x)
-
-# Combine
-model = Model(inputs=input_layer, outputs=[core_output, freq_output])
-
-# Compile
-model.compile(
-    optimizer='adam',
-    loss={'core_output': 'binary_crossentropy', 'freq_output': 'categorical_crossentropy'},
-    loss_weights={'core_output': 1.0, 'freq_output': 0.5}, # Prioritize core selection
-    metrics={'core_output': 'accuracy', 'freq_output': 'accuracy'}
-)
-
-# 4. Train
-print("Training Advanced Multi-Task Model...")
-history = model.fit(
-    X_train, 
-    {'core_output': y_core_train, 'freq_output': y_freq_train},
-    validation_data=(X_test, {'core_output': y_core_test, 'freq_output': y_freq_test}),
-    epochs=30,
-    batch_size=32,
-    verbose=1
-)
-
-# 5. Save
-model.save('advanced_scheduler_model.h5')
-joblib.dump(scaler, 'advanced_scaler.pkl')
-print("Advanced model saved successfully.")
\ No newline at end of file
+from dataset_shards import META_FILE, TARGETS, ShardWriter, read_meta, shard_paths, load_shard
+from temporal import TEMPORAL_MODEL_PATH, TEMPORAL_SCALER_PATH
+
+DATA_PATH = 'advanced_os_data.csv'
+CACHE_DIR = '.cache'
+MODEL_PATH = 'advanced_scheduler_model.h5'
+SCALER_PATH = 'advanced_scaler.pkl'
+TEMPORAL_DATA_PATH = 'advanced_os_seq_data.csv'
+
+
+def build_model(n_features=4):
+    input_layer = Input(shape=(n_features,))
+
+    # Shared Layers (Feature Extraction)
+    x = Dense(64, activation='relu')(input_layer)
+    x = BatchNormalization()(x)
+    x = Dropout(0.2)(x)
+    x = Dense(32, activation='relu')(x)
+
+    # Head 1: Core Prediction (Binary Classification)
+    core_output = Dense(1, activation='sigmoid', name='core_output')(x)
+
+    # Head 2: Frequency Prediction (Multi-class Classification)
+    freq_output = Dense(3, activation='softmax', name='freq_output')(x)
+
+    # Combine
+    model = Model(inputs=input_layer, outputs=[core_output, freq_output])
+
+    # Compile
+    model.compile(
+        optimizer='adam',
+        loss={'core_output': 'binary_crossentropy', 'freq_output': 'categorical_crossentropy'},
+        loss_weights={'core_output': 1.0, 'freq_output': 0.5}, # Prioritize core selection
+        metrics={'core_output': 'accuracy', 'freq_output': 'accuracy'}
+    )
+    return model
+
+
+def train_in_memory(args):
+    # 1. Load Data
+    df = pd.read_csv(args.data)
+
+    # Hedefler dışındaki tüm sütunlar girdi: 4 anlık özellik ya da + pencere özellikleri (--temporal)
+    features = [c for c in df.columns if c not in TARGETS]
+    X = df[features].values
+    y_core = df['target_core'].values
+    y_freq = df['target_freq'].values
+
+    # One-hot encode frequency (0, 1, 2)
+    y_freq_encoded = to_categorical(y_freq, num_classes=3)
+
+    # 2. Preprocessing
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+
+    X_train, X_test, y_core_train, y_core_test, y_freq_train, y_freq_test = train_test_split(
+        X_scaled, y_core, y_freq_encoded, test_size=0.2, random_state=42
+    )
+
+    # 3. Build Advanced Model (Functional API)
+    model = build_model(len(features))
+
+    # 4. Train
+    print("Training Advanced Multi-Task Model...")
+    model.fit(
+        X_train,
+        {'core_output': y_core_train, 'freq_output': y_freq_train},
+        validation_data=(X_test, {'core_output': y_core_test, 'freq_output': y_freq_test}),
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        verbose=1
+    )
+    return model, scaler
+
+
+# --- STREAMING (OUT-OF-CORE) TRAINING ---
+
+def cached_shards(csv_path, chunk_size):
+    """
+    Convert the CSV into npy shards once and reuse them on later runs.
+
+    The cache key is the CSV's size and mtime, so editing the CSV invalidates it.
+    The CSV itself is read in chunks, so conversion memory is bounded too.
+    """
+    st = os.stat(csv_path)
+    key = f"{os.path.splitext(os.path.basename(csv_path))[0]}-{st.st_size}-{int(st.st_mtime)}"
+    out_dir = os.path.join(CACHE_DIR, key)
+    if os.path.exists(os.path.join(out_dir, 'meta.json')):
+        print(f"Using cached binary shards in '{out_dir}'.")
+        return out_dir
+
+    print(f"Converting '{csv_path}' to binary shards in '{out_dir}'...")
+    writer = ShardWriter(out_dir, columns=pd.read_csv(csv_path, nrows=0).columns)
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+        writer.write(chunk[writer.columns].values)
+    writer.close(source=csv_path)
+    return out_dir
+
+
+def validation_mask(shard_index, rows, val_split, seed):
+    """Deterministic per-shard train/validation split (same rows every epoch)."""
+    return np.random.default_rng([seed, shard_index]).random(rows) < val_split
+
+
+def fit_scaler_incremental(paths, block_rows, n_features):
+    """Compute StandardScaler statistics with partial_fit, one block at a time."""
+    scaler = StandardScaler()
+    for path in paths:
+        shard = load_shard(path)
+        for start in range(0, len(shard), block_rows):
+            scaler.partial_fit(np.asarray(shard[start:start + block_rows, :n_features], dtype=np.float64))
+    return scaler
+
+
+def make_dataset(paths, scaler, args, validation):
+    n_features = len(scaler.mean_)
+    mean = scaler.mean_.astype(np.float32)
+    scale = scaler.scale_.astype(np.float32)
+    eye = np.eye(3, dtype=np.float32)
+
+    def generator():
+        order = np.arange(len(paths))
+        if not validation:
+            np.random.shuffle(order)
+        for i in order:
+            shard = load_shard(paths[i])
+            mask = validation_mask(i, len(shard), args.val_split, args.seed)
+            rows = np.flatnonzero(mask if validation else ~mask)
+            if not validation:
+                np.random.shuffle(rows)
+            # Only one block of the (memory-mapped) shard is materialized at a time
+            for start in range(0, len(rows), args.block_rows):
+                block = np.asarray(shard[np.sort(rows[start:start + args.block_rows])])
+                if not validation:
+                    np.random.shuffle(block)
+                X = (block[:, :n_features] - mean) / scale
+                y_core = block[:, n_features:n_features + 1]
+                y_freq = eye[block[:, n_features + 1].astype(np.int64)]
+                for b in range(0, len(block), args.batch_size):
+                    batch = slice(b, b + args.batch_size)
+                    yield X[batch], {'core_output': y_core[batch], 'freq_output': y_freq[batch]}
+
+    signature = (
+        tf.TensorSpec(shape=(None, n_features), dtype=tf.float32),
+        {
+            'core_output': tf.TensorSpec(shape=(None, 1), dtype=tf.float32),
+            'freq_output': tf.TensorSpec(shape=(None, 3), dtype=tf.float32),
+        },
+    )
+    ds = tf.data.Dataset.from_generator(generator, output_signature=signature)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def train_streaming(args):
+    shard_dir = args.shards or cached_shards(args.data, args.block_rows)
+    paths = shard_paths(shard_dir)
+    if not paths:
+        raise FileNotFoundError(f"no shards (meta.json, shard-*.npy / shard-*.parquet) in '{shard_dir}'")
+    if os.path.exists(os.path.join(shard_dir, META_FILE)):
+        meta = read_meta(shard_dir)
+        n_features = len(meta['columns']) - len(TARGETS)
+        print(f"Streaming {meta['rows']} rows from {len(paths)} shards.")
+    else:
+        # meta.json yok: genişlik ilk parçadan (temporal veri 4'ten fazla özellik taşır)
+        n_features = load_shard(paths[0]).shape[1] - len(TARGETS)
+        print(f"Streaming {len(paths)} shards without {META_FILE} ({n_features} features from the first shard).")
+
+    # Pass 1: scaler statistics; Pass 2+: one tf.data pipeline per epoch
+    scaler = fit_scaler_incremental(paths, args.block_rows, n_features)
+    model = build_model(n_features)
+
+    print("Training Advanced Multi-Task Model (streaming)...")
+    model.fit(
+        make_dataset(paths, scaler, args, validation=False),
+        validation_data=make_dataset(paths, scaler, args, validation=True),
+        epochs=args.epochs,
+        verbose=1
+    )
+    return model, scaler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the P/E core scheduler model.")
+    parser.add_argument('--data', default=None, help=f"training CSV (default: {DATA_PATH}, or {TEMPORAL_DATA_PATH} with --temporal)")
+    parser.add_argument('--temporal', action='store_true',
+                        help="train the window-feature model (data from generating-cpu-data.py --temporal)")
+    parser.add_argument('--stream', action='store_true',
+                        help="out-of-core training from binary shards (CSV is converted and cached once)")
+    parser.add_argument('--shards', default=None, help="train from an existing shard directory (implies --stream)")
+    parser.add_argument('--epochs', type=int, default=30)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--block-rows', type=int, default=65536, help="rows materialized at once when streaming")
+    parser.add_argument('--val-split', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--model-out', default=None)
+    parser.add_argument('--scaler-out', default=None)
+    args = parser.parse_args()
+    args.data = args.data or (TEMPORAL_DATA_PATH if args.temporal else DATA_PATH)
+    args.model_out = args.model_out or (TEMPORAL_MODEL_PATH if args.temporal else MODEL_PATH)
+    args.scaler_out = args.scaler_out or (TEMPORAL_SCALER_PATH if args.temporal else SCALER_PATH)
+
+    if args.stream or args.shards:
+        model, scaler = train_streaming(args)
+    else:
+        model, scaler = train_in_memory(args)
+
+    # 5. Save
+    model.save(args.model_out)
+    joblib.dump(scaler, args.scaler_out)
+    print("Advanced model saved successfully.")
+
+
+if __name__ == "__main__":
+    main()
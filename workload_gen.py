@@ -0,0 +1,381 @@
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import psutil
+
+# --- AYARLAR ---
+PROFILES = ['compute', 'memory', 'bursty', 'mixed']
+DUTY_PERIOD_S = 0.1      # compute/memory için görev döngüsü periyodu
+BURST_PERIOD_S = 2.0     # bursty: açık + kapalı süre
+BURST_DUTY = 0.3         # bursty: varsayılan açık oranı
+BUFFER_MB = 256          # memory: işçi başına en büyük tampon; son seviye önbellekten büyük olmalı
+MEMORY_SHARE = 0.5       # memory: tüm işçilerin tamponları toplamda kullanılabilir RAM'in en fazla bu payı
+MIN_BUFFER_MB = 32       # memory: paya bölününce bundan küçük kalırsa havuz başlatılmaz
+EXIT_NO_MEMORY = 3       # tamponu ayıramayan işçinin çıkış kodu (yeniden başlatılmaz)
+STRIDE_BYTES = 4160      # memory: sayfa + önbellek satırı; donanım ön getirmesini zayıflatır
+MIXED_CYCLE = ['compute', 'memory', 'bursty']
+STOP_POLL_S = 0.05         # boşta bekleyen işçi durdurma bayrağını bu aralıkla okur
+SUPERVISE_INTERVAL_S = 0.5  # çöken işçiler bu aralıkla yeniden başlatılır
+MAX_RESTARTS = 5            # işçi başına; üstünde işçi ölü bırakılır (ör. sürekli MemoryError)
+SWEEP_LEVELS = [i / 10 for i in range(11)]  # 0 ... %100 görev oranı
+SWEEP_STEP_S = 3.0
+SWEEP_SETTLE_S = 1.0        # her adımın başı geçiş sayılır, istatistiğe katılmaz
+
+
+# --- ÇEKİRDEKLER ---
+def compute_kernel(n=20000):
+    """Bellek trafiği olmayan kayan nokta döngüsü (yüksek IPC)."""
+    x = 1.0001
+    for _ in range(n):
+        x = x * 1.0000001 + 0.0000001
+    return x
+
+
+class MemoryKernel:
+    """
+    Büyük tampon üzerinde adımlı okuma: her erişim ayrı bir önbellek satırına
+    düşer. Ofset her geçişte bir satır kaydırılır; zamanla tüm satırlar dolaşılır.
+    """
+
+    def __init__(self, buffer_mb=BUFFER_MB, stride_bytes=STRIDE_BYTES):
+        import numpy as np
+        self.buf = np.ones(buffer_mb * 1024 * 1024 // 8, dtype=np.int64)
+        self.step = max(1, stride_bytes // 8)
+        self.offset = 0
+
+    def __call__(self):
+        total = int(self.buf[self.offset::self.step].sum())
+        self.offset = (self.offset + 8) % self.step
+        return total
+
+
+def set_parent_death_signal(sig=signal.SIGKILL):
+    """Linux: üst süreç ölünce çekirdek bu sürece sig gönderir (GUI çökerse yetim işçi kalmaz)."""
+    if not sys.platform.startswith('linux'):
+        return False
+    import ctypes
+    PR_SET_PDEATHSIG = 1
+    return ctypes.CDLL(None, use_errno=True).prctl(PR_SET_PDEATHSIG, int(sig)) == 0
+
+
+def default_duty(profile, duty=None):
+    if duty is not None:
+        return duty
+    return BURST_DUTY if profile == 'bursty' else 1.0
+
+
+def default_period(profile, period=None):
+    if period is not None:
+        return period
+    return BURST_PERIOD_S if profile == 'bursty' else DUTY_PERIOD_S
+
+
+def worker(index, profile, stop, counts, duties, period, cpu, buffer_mb, stride_bytes, parent_pid):
+    """
+    Tek işçi süreci: stop.value ayarlanana kadar profilin çekirdeğini görev
+    döngüsüyle çalıştırır. Görev oranı her periyotta paylaşılan duties[index]'ten
+    okunur; yük yeniden başlatmadan değişir.
+
+    Kontrol bloğunda kilit yoktur (RawValue / RawArray): öldürülen bir işçi
+    multiprocessing.Event'in iç kilidini tutarken ölürse diğer işçiler ve
+    stop() kilitlenirdi.
+
+    Üst süreç ölürse işçi kendini sonlandırır: Linux'ta PR_SET_PDEATHSIG (anında),
+    her yerde periyot başına getppid() bekçisi (üst süreç değiştiyse yetim kalmıştır).
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C'yi üst süreç yönetir
+    set_parent_death_signal()
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu})
+
+    try:
+        kernel = MemoryKernel(buffer_mb, stride_bytes) if profile == 'memory' else compute_kernel
+    except MemoryError:
+        os._exit(EXIT_NO_MEMORY)
+
+    ops = 0
+    while not stop.value and os.getppid() == parent_pid:
+        cycle_start = time.monotonic()
+        busy_until = cycle_start + duties[index] * period
+        while time.monotonic() < busy_until:
+            kernel()
+            ops += 1
+        counts[index] = ops
+        idle_until = cycle_start + period
+        while not stop.value:
+            idle = idle_until - time.monotonic()
+            if idle <= 0:
+                break
+            time.sleep(min(idle, STOP_POLL_S))
+    counts[index] = ops
+
+
+def memory_budget_mb(n_workers):
+    """'memory' işçisi başına tampon üst sınırı (MB): kullanılabilir RAM'in MEMORY_SHARE payı / işçi sayısı."""
+    return int(psutil.virtual_memory().available * MEMORY_SHARE / (1024 * 1024) / n_workers)
+
+
+class WorkloadPool:
+    """
+    Profil başına işçi süreçleri.
+
+    'mixed' profilinde işçi i, MIXED_CYCLE[i % 3] profilini çalıştırır.
+    pin verilirse işçi i, pin listesinin (i % len) numaralı CPU'suna sabitlenir.
+    duty / period None ise profilin varsayılanları kullanılır.
+
+    Kontrol bloğu paylaşılan bellektedir: işçi başına görev oranı (duties) ve
+    durdurma bayrağı (stop_flag). set_duty() çalışan işçilerin yükünü bir
+    periyot içinde değiştirir. Bir denetçi iş parçacığı beklenmedik şekilde
+    ölen işçileri yeniden başlatır; bellek yüzünden ölen (tamponu ayıramayan ya
+    da OOM killer'ın SIGKILL'lediği) 'memory' işçisi yeniden başlatılmaz, error
+    ayarlanır.
+
+    'memory' tamponları toplamda kullanılabilir RAM'in MEMORY_SHARE payını
+    aşmaz: buffer_mb işçi başına üst sınırdır. Pay MIN_BUFFER_MB'nin altına
+    düşerse havuz MemoryError ile hiç başlatılmaz.
+    """
+
+    def __init__(self, profile='compute', workers=None, duty=None, period=None, pin=None,
+                 buffer_mb=BUFFER_MB, stride_bytes=STRIDE_BYTES):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+        self.profile = profile
+        self.workers = workers or multiprocessing.cpu_count()
+        self.duty = duty
+        self.period = period
+        self.pin = sorted(pin) if pin else None
+        self.buffer_mb = buffer_mb
+        n_memory = sum(self.profile_of(i) == 'memory' for i in range(self.workers))
+        if n_memory:
+            self.buffer_mb = min(buffer_mb, memory_budget_mb(n_memory))
+            if self.buffer_mb < MIN_BUFFER_MB:
+                raise MemoryError(f"{n_memory} memory workers would get {self.buffer_mb} MB each "
+                                  f"(< {MIN_BUFFER_MB} MB) from {MEMORY_SHARE:.0%} of available RAM; "
+                                  f"use fewer workers")
+        self.stride_bytes = stride_bytes
+        self.error = None  # bellek yüzünden ölen işçinin açıklaması
+        self.stop_flag = multiprocessing.RawValue('b', 0)
+        self.counts = multiprocessing.RawArray('q', self.workers)
+        self.duties = multiprocessing.RawArray('d', [default_duty(self.profile_of(i), duty) for i in range(self.workers)])
+        self.processes = []
+        self.restarts = [0] * self.workers
+        self.supervisor = None
+        self.supervisor_stop = threading.Event()
+
+    def profile_of(self, index):
+        if self.profile == 'mixed':
+            return MIXED_CYCLE[index % len(MIXED_CYCLE)]
+        return self.profile
+
+    def spawn(self, index):
+        profile = self.profile_of(index)
+        cpu = self.pin[index % len(self.pin)] if self.pin else None
+        p = multiprocessing.Process(
+            target=worker,
+            args=(index, profile, self.stop_flag, self.counts, self.duties, default_period(profile, self.period),
+                  cpu, self.buffer_mb, self.stride_bytes, os.getpid()),
+            daemon=True,
+        )
+        p.start()
+        return p
+
+    def start(self):
+        self.stop_flag.value = 0
+        self.processes = [self.spawn(i) for i in range(self.workers)]
+        self.supervisor_stop.clear()
+        self.supervisor = threading.Thread(target=self.supervise, daemon=True)
+        self.supervisor.start()
+
+    def supervise(self):
+        # PR_SET_PDEATHSIG iş parçacığına bağlıdır: buradan başlatılan işçiler bu
+        # iş parçacığı bitince (yalnızca stop() içinde) sonlanır
+        while not self.supervisor_stop.wait(SUPERVISE_INTERVAL_S):
+            for i, p in enumerate(self.processes):
+                if p.exitcode is None or self.restarts[i] >= MAX_RESTARTS:
+                    continue
+                if self.profile_of(i) == 'memory' and p.exitcode in (EXIT_NO_MEMORY, -signal.SIGKILL):
+                    # Yeniden başlatmak aynı OOM'u tekrarlar: işçi ölü bırakılır
+                    self.restarts[i] = MAX_RESTARTS
+                    self.error = (f"memory worker {i} ({self.buffer_mb} MB buffer) died from memory pressure "
+                                  f"(exit code {p.exitcode}); lower --buffer-mb or --workers")
+                    print(f"workload {self.error}")
+                    continue
+                self.restarts[i] += 1
+                print(f"workload worker {i} exited with code {p.exitcode}; restarting")
+                self.processes[i] = self.spawn(i)
+
+    def set_duty(self, duty, index=None):
+        """Görev oranı (0-1), tüm işçiler ya da yalnızca işçi index için; bir periyot içinde etkili."""
+        duty = min(max(float(duty), 0.0), 1.0)
+        for i in (range(self.workers) if index is None else [index]):
+            self.duties[i] = duty
+
+    def stop(self, timeout=2.0):
+        """İşçilere durmalarını söyler; süresinde çıkmayanlar sonlandırılır."""
+        if self.supervisor is not None:
+            # Önce denetçi durur: yoksa çıkan işçiyi yeniden başlatabilir
+            self.supervisor_stop.set()
+            self.supervisor.join()
+            self.supervisor = None
+        self.stop_flag.value = 1
+        deadline = time.monotonic() + timeout
+        for p in self.processes:
+            p.join(max(0.0, deadline - time.monotonic()))
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        self.processes = []
+
+    @property
+    def running(self):
+        return bool(self.processes)
+
+
+# --- YÜK TARAMASI ---
+class LoadSweep:
+    """
+    Havuzun görev oranını levels boyunca adım adım değiştirir (işçiler yeniden
+    başlatılmaz) ve adım başına politika tepkisini toplar.
+
+    update(packet) her tick çağrılır; adım süresi dolunca sonraki seviyeye
+    geçer. packet (SchedulerEngine.step çıktısı) verilirse adımın ilk
+    settle_s saniyesinden sonraki tick'lerden ölçülen yük, P çekirdek oranı,
+    AI / standart güç ve tick başına P/E geçişi ortalanır.
+    """
+
+    def __init__(self, pool, levels=SWEEP_LEVELS, step_s=SWEEP_STEP_S, settle_s=SWEEP_SETTLE_S):
+        self.pool = pool
+        self.levels = list(levels)
+        self.step_s = step_s
+        self.settle_s = settle_s
+        self.index = -1
+        self.results = []
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    @property
+    def done(self):
+        return self.index >= len(self.levels)
+
+    def start(self):
+        self.index = -1
+        self.results = []
+        self.next_step()
+
+    def next_step(self):
+        self.index += 1
+        self.step_start = time.monotonic()
+        self.ticks = 0
+        self.sums = {'load': 0.0, 'p_share': 0.0, 'power_ai': 0.0, 'power_std': 0.0, 'flips': 0.0}
+        self.last_is_p = None
+        if not self.done:
+            self.pool.set_duty(self.level)
+
+    def update(self, packet=None):
+        """Adım geçişi olduysa True döndürür."""
+        if self.done:
+            return False
+        elapsed = time.monotonic() - self.step_start
+        if elapsed >= self.step_s:
+            self.results.append(self.summary())
+            self.next_step()
+            return True
+        if packet is not None and elapsed >= self.settle_s:
+            is_p = [core['is_p'] for core in packet['cores']]
+            n = max(len(is_p), 1)
+            s = self.sums
+            s['load'] += sum(core['load'] for core in packet['cores']) / n
+            s['p_share'] += sum(is_p) / n
+            s['power_ai'] += packet['power_ai']
+            s['power_std'] += packet['power_std']
+            if self.last_is_p is not None and len(self.last_is_p) == len(is_p):
+                s['flips'] += sum(a != b for a, b in zip(self.last_is_p, is_p))
+            self.last_is_p = is_p
+            self.ticks += 1
+        return False
+
+    def summary(self):
+        n = max(self.ticks, 1)
+        row = {'duty': self.level, 'ticks': self.ticks}
+        row.update({k: v / n for k, v in self.sums.items()})
+        row['savings'] = (1 - row['power_ai'] / row['power_std']) * 100 if row['power_std'] > 0 else 0.0
+        return row
+
+    def report(self):
+        lines = [f"{'duty':>5s} {'load%':>6s} {'P-share':>8s} {'AI W':>7s} {'std W':>7s} {'saving':>7s} {'flips/tick':>10s}"]
+        for r in self.results:
+            lines.append(f"{r['duty'] * 100:4.0f}% {r['load']:6.1f} {r['p_share'] * 100:7.1f}% {r['power_ai']:7.1f} "
+                         f"{r['power_std']:7.1f} {r['savings']:6.1f}% {r['flips']:10.2f}")
+        return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic workload generator (standard benchmark load).")
+    parser.add_argument('--profile', choices=PROFILES, default='compute',
+                        help="compute: FP loop; memory: strided reads over a large buffer; "
+                             "bursty: periodic on/off; mixed: compute/memory/bursty per worker")
+    parser.add_argument('--workers', type=int, default=0, help="worker processes (0: one per CPU)")
+    parser.add_argument('--duration', type=float, default=30.0, help="seconds (0: until Ctrl+C / SIGTERM)")
+    parser.add_argument('--pin', default=None, metavar='LIST',
+                        help="pin workers round-robin to these CPUs, e.g. 0-3 or 'all'")
+    parser.add_argument('--duty', type=float, default=None, help="busy fraction of each period (0-1)")
+    parser.add_argument('--period', type=float, default=None, help="duty-cycle period in seconds")
+    parser.add_argument('--buffer-mb', type=int, default=BUFFER_MB,
+                        help="memory profile: per-worker buffer maximum; all buffers together stay within "
+                             f"{MEMORY_SHARE * 100:.0f}%% of available RAM")
+    parser.add_argument('--stride', type=int, default=STRIDE_BYTES, help="memory profile stride in bytes")
+    parser.add_argument('--sweep', action='store_true',
+                        help="step the duty cycle 0%%..100%% without respawning workers (ignores --duration)")
+    parser.add_argument('--sweep-step', type=float, default=SWEEP_STEP_S, help="seconds per sweep level")
+    args = parser.parse_args()
+
+    from actuation import parse_cpu_list
+    if args.pin == 'all':
+        pin = set(range(multiprocessing.cpu_count()))
+    else:
+        pin = parse_cpu_list(args.pin) if args.pin else None
+    try:
+        pool = WorkloadPool(args.profile, args.workers or None, args.duty, args.period, pin,
+                            args.buffer_mb, args.stride)
+    except MemoryError as e:
+        parser.error(str(e))
+
+    stop = multiprocessing.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    print(f"Starting {pool.workers} '{args.profile}' workers"
+          f"{' for %.0f s' % args.duration if args.duration else ''}. Ctrl+C to stop.")
+    start = time.monotonic()
+    pool.start()
+    try:
+        if args.sweep:
+            sweep = LoadSweep(pool, step_s=args.sweep_step)
+            sweep.start()
+            print(f"  duty {sweep.level * 100:3.0f}%")
+            while not sweep.done and not pool.error and not stop.wait(0.1):
+                if sweep.update() and not sweep.done:
+                    print(f"  duty {sweep.level * 100:3.0f}%")
+        else:
+            end = start + args.duration if args.duration else None
+            while not pool.error and not stop.wait(0.1):
+                if end is not None and time.monotonic() >= end:
+                    break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+    elapsed = time.monotonic() - start
+    for i in range(pool.workers):
+        print(f"  worker {i} ({pool.profile_of(i)}): {pool.counts[i] / elapsed:10.1f} kernel calls/s")
+    if pool.error:
+        sys.exit(f"Stopped: {pool.error}")
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import time
+import numpy as np
+
+from dataset_shards import FEATURES, META_FILE
+from power_model import DEFAULT_MODEL, POWER_MODEL_PATH, load_power_model
+from telemetry import build_features
+
+# --- AYARLAR ---
+FEATURES_FILE = 'features.f32'   # (ticks, n_cpus, 4) float32
+TIMESTAMPS_FILE = 'timestamps.f64'
+RAM_FILE = 'ram.f32'
+CHUNK_TICKS = 8192               # simülasyonda tek seferde işlenen tick sayısı
+MAX_GAP_FACTOR = 10              # kayıt duraklamaları: medyan periyodun bu katından uzun aralıklar kırpılır
+
+
+class TraceWriter:
+    """
+    Tick başına özellik matrisini ham ikili dosyalara ekler.
+
+    Var olan bir izin dosyaları baştan yazılır (eski veriye eklenmez). meta.json
+    açılışta ve CPU sayısı belli olunca yazılır; kayıt yarıda kesilirse Trace
+    tick sayısını en kısa tam dosyadan çıkarır.
+    """
+
+    def __init__(self, out_dir, n_cpus=None, rate_hz=None):
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.n_cpus = n_cpus
+        self.rate_hz = rate_hz
+        self.ticks = 0
+        self.files = {
+            name: open(os.path.join(out_dir, name), 'wb')
+            for name in (FEATURES_FILE, TIMESTAMPS_FILE, RAM_FILE)
+        }
+        self.write_meta()
+
+    def write_meta(self):
+        meta = {'n_cpus': self.n_cpus, 'columns': FEATURES, 'rate_hz': self.rate_hz}
+        path = os.path.join(self.out_dir, META_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def check_cpus(self, n_cpus):
+        if self.n_cpus is None:
+            self.n_cpus = n_cpus
+            self.write_meta()
+        elif n_cpus != self.n_cpus:
+            raise ValueError(f"Trace has {self.n_cpus} CPUs, got {n_cpus}")
+
+    def append(self, timestamp, features, ram_percent):
+        features = np.asarray(features, dtype=np.float32)
+        self.check_cpus(len(features))
+        self.files[FEATURES_FILE].write(features.tobytes())
+        self.files[TIMESTAMPS_FILE].write(np.float64(timestamp).tobytes())
+        self.files[RAM_FILE].write(np.float32(ram_percent).tobytes())
+        self.ticks += 1
+
+    def extend(self, timestamps, features, ram_percent):
+        """Toplu ekleme: features (n, n_cpus, 4)."""
+        features = np.asarray(features, dtype=np.float32)
+        self.check_cpus(features.shape[1])
+        self.files[FEATURES_FILE].write(features.tobytes())
+        self.files[TIMESTAMPS_FILE].write(np.asarray(timestamps, dtype=np.float64).tobytes())
+        self.files[RAM_FILE].write(np.asarray(ram_percent, dtype=np.float32).tobytes())
+        self.ticks += len(features)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.write_meta()
+
+
+def open_memmap(path, dtype, shape):
+    """Salt okunur memmap; boş iz için (mmap sıfır uzunluğu eşleyemez) boş dizi."""
+    if shape[0] == 0:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=shape)
+
+
+class Trace:
+    """
+    Kaydedilmiş bir izi np.memmap dizileri olarak açar (diske dokunmadan dilimlenebilir).
+
+    Tick sayısı meta.json'dan değil, üç dosyanın en kısa tam uzunluğundan
+    çıkarılır; yarıda kesilmiş bir kaydın son yarım tick'i yok sayılır.
+    """
+
+    def __init__(self, trace_dir):
+        with open(os.path.join(trace_dir, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.n_cpus = self.meta['n_cpus'] or 0
+        paths = {name: os.path.join(trace_dir, name) for name in (FEATURES_FILE, TIMESTAMPS_FILE, RAM_FILE)}
+        tick_bytes = {FEATURES_FILE: 4 * self.n_cpus * len(FEATURES), TIMESTAMPS_FILE: 8, RAM_FILE: 4}
+        self.ticks = min(os.path.getsize(paths[name]) // size if size else 0 for name, size in tick_bytes.items())
+        self.timestamps = open_memmap(paths[TIMESTAMPS_FILE], np.float64, (self.ticks,))
+        self.features = open_memmap(paths[FEATURES_FILE], np.float32, (self.ticks, self.n_cpus, len(FEATURES)))
+        self.ram = open_memmap(paths[RAM_FILE], np.float32, (self.ticks,))
+
+    def tick_durations(self):
+        """Her tick'in temsil ettiği süre (s); kayıt boşlukları medyan periyodun MAX_GAP_FACTOR katıyla sınırlanır."""
+        if self.ticks < 2:
+            return np.full(self.ticks, 1.0 / (self.meta.get('rate_hz') or 1.0))
+        dt = np.diff(self.timestamps)
+        median = float(np.median(dt))
+        dt = np.clip(dt, 0.0, median * MAX_GAP_FACTOR)
+        return np.append(dt, median)
+
+
+def simulate(trace, decide, chunk_ticks=CHUNK_TICKS, power=DEFAULT_MODEL):
+    """
+    Politikayı ve güç modelini (power_model.PowerModel) izin tamamı üzerinde çalıştırır.
+
+    Her parça (chunk_ticks x n_cpus) satırı tek bir decide() çağrısıyla
+    sınıflandırılır; güç ve karar değişiklikleri tick x çekirdek dizileri
+    üzerinde vektörel hesaplanır.
+    """
+    dt = trace.tick_durations()
+    energy_ai = energy_std = 0.0
+    core_flips = freq_changes = 0
+    p_cores = 0
+    prev_is_p = prev_freq = None
+
+    for start in range(0, trace.ticks, chunk_ticks):
+        block = np.asarray(trace.features[start:start + chunk_ticks], dtype=np.float64)
+        n = len(block)
+        rows = block.reshape(-1, block.shape[2])
+        is_p, freq_idx = decide(rows)
+        is_p = np.asarray(is_p, dtype=bool).reshape(n, -1)
+        freq_idx = np.asarray(freq_idx).reshape(n, -1)
+
+        p_ai, p_std, _ = power.estimate(block[:, :, 0], is_p, freq_idx)
+        energy_ai += float(p_ai.sum(axis=1) @ dt[start:start + n])
+        energy_std += float(p_std.sum(axis=1) @ dt[start:start + n])
+        p_cores += int(is_p.sum())
+
+        # Karar değişiklikleri: önceki parçanın son tick'i ile birleştirilerek
+        if prev_is_p is not None:
+            is_p_seq = np.vstack((prev_is_p, is_p))
+            freq_seq = np.vstack((prev_freq, freq_idx))
+        else:
+            is_p_seq, freq_seq = is_p, freq_idx
+        core_flips += int((is_p_seq[1:] != is_p_seq[:-1]).sum())
+        freq_changes += int((freq_seq[1:] != freq_seq[:-1]).sum())
+        prev_is_p, prev_freq = is_p[-1:], freq_idx[-1:]
+
+    duration = float(dt.sum())
+    minutes = max(duration / 60.0, 1e-9)
+    return {
+        'ticks': trace.ticks,
+        'n_cpus': trace.n_cpus,
+        'duration_s': duration,
+        'energy_ai_j': energy_ai,
+        'energy_std_j': energy_std,
+        'savings_j': energy_std - energy_ai,
+        'savings_pct': (energy_std - energy_ai) / energy_std * 100 if energy_std > 0 else 0.0,
+        'p_core_share': p_cores / max(trace.ticks * trace.n_cpus, 1),
+        'core_flips': core_flips,
+        'freq_changes': freq_changes,
+        'changes_per_core_per_min': (core_flips + freq_changes) / max(trace.n_cpus, 1) / minutes,
+    }
+
+
+def synthesize(out_dir, hours, rate_hz, n_cpus, seed=42, chunk_ticks=CHUNK_TICKS):
+    """
+    Test için yapay iz: çekirdek başına ortalamaya dönen rastgele yürüyüş
+    yükü ve ara sıra patlamalar; ipc/cache_miss/temp sentetik formüllerden.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(hours * 3600 * rate_hz)
+    writer = TraceWriter(out_dir, n_cpus, rate_hz)
+    load = rng.uniform(5, 60, n_cpus)
+    ram = 50.0
+    t0 = time.time()
+    for start in range(0, total, chunk_ticks):
+        n = min(chunk_ticks, total - start)
+        loads = np.empty((n, n_cpus))
+        rams = np.empty(n)
+        for i in range(n):
+            burst = rng.random(n_cpus) < 0.002
+            load = np.where(burst, 100.0, load + 0.05 * (30.0 - load) + rng.normal(0, 4, n_cpus))
+            load = np.clip(load, 0.0, 100.0)
+            ram = float(np.clip(ram + rng.normal(0, 0.2), 20.0, 95.0))
+            loads[i] = load
+            rams[i] = ram
+        features = build_features(loads.ravel(), np.repeat(rams, n_cpus)).reshape(n, n_cpus, 4)
+        timestamps = t0 + (start + np.arange(n)) / rate_hz
+        writer.extend(timestamps, features, rams)
+    writer.close()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workload traces: offline policy + power replay.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('replay', help="simulate the policy over a recorded trace")
+    p.add_argument('trace')
+    p.add_argument('--decision-mode', choices=['exact', 'cache', 'table'], default='exact')
+    p.add_argument('--chunk-ticks', type=int, default=CHUNK_TICKS)
+    p.add_argument('--power-model', default=POWER_MODEL_PATH, help="calibrated power tables (power_model.py calibrate)")
+
+    p = sub.add_parser('info', help="print trace metadata")
+    p.add_argument('trace')
+
+    p = sub.add_parser('synth', help="write a synthetic trace")
+    p.add_argument('out')
+    p.add_argument('--hours', type=float, default=1.0)
+    p.add_argument('--rate', type=float, default=10.0)
+    p.add_argument('--cpus', type=int, default=16)
+    p.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.command == 'synth':
+        ticks = synthesize(args.out, args.hours, args.rate, args.cpus, args.seed)
+        print(f"Wrote {ticks} ticks x {args.cpus} CPUs to '{args.out}'.")
+        return
+
+    trace = Trace(args.trace)
+    if args.command == 'info':
+        print(json.dumps(dict(trace.meta, ticks=trace.ticks, duration_s=float(trace.tick_durations().sum())), indent=2))
+        return
+
+    from scheduler_daemon import build_engine
+    engine = build_engine(args.decision_mode, 'synthetic')
+    start = time.perf_counter()
+    report = simulate(trace, engine.predict_batch, args.chunk_ticks, load_power_model(args.power_model))
+    wall = time.perf_counter() - start
+    report['wall_s'] = wall
+    report['speedup_vs_realtime'] = report['duration_s'] / wall if wall > 0 else 0.0
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()